@@ -0,0 +1,72 @@
+"""
+Benchmark: cost of the per-request state objects.
+
+Compares the slotted EventContext/Message/UsageMetrics used on the hot
+path with their pydantic counterparts (velox.core.schema, equivalent to
+the models the pipeline used to build): construction time for a typical
+request (3 messages, context, provider usage + set_response, one fork)
+and retained memory per context.
+
+    python benchmarks/context_overhead.py --requests 50000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.getcwd())
+
+from velox.core.context import EventContext, Message, UsageMetrics
+from velox.core.schema import EventContextModel, MessageModel, UsageMetricsModel
+
+HISTORY = [("system", "You are helpful."), ("user", "Hi"), ("user", "Summarize the report.")]
+
+
+def build_slotted():
+    ctx = EventContext(messages=[Message(r, c) for r, c in HISTORY], model="bench")
+    ctx.set_response("ok", UsageMetrics(total_tokens=10, prompt_tokens=5, completion_tokens=5, cost_usd=0.0001))
+    ctx.fork()
+    return ctx
+
+
+def build_pydantic():
+    ctx = EventContextModel(messages=[MessageModel(role=r, content=c) for r, c in HISTORY], model="bench")
+    usage = UsageMetricsModel(total_tokens=10, prompt_tokens=5, completion_tokens=5, cost_usd=0.0001)
+    ctx.response_content = "ok"
+    ctx.metrics.total_tokens = usage.total_tokens
+    ctx.metrics.prompt_tokens = usage.prompt_tokens
+    ctx.metrics.completion_tokens = usage.completion_tokens
+    ctx.metrics.cost_usd += usage.cost_usd
+    ctx.model_copy(update={"messages": list(ctx.messages), "metadata": dict(ctx.metadata), "metrics": UsageMetricsModel()})
+    return ctx
+
+
+def time_per_call(builder, requests: int) -> float:
+    for _ in range(1000):
+        builder()
+    start = time.perf_counter()
+    for _ in range(requests):
+        builder()
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def bytes_per_context(builder, count: int = 10_000) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [builder() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del kept
+    return size / count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{'model':>10} | {'us/request':>10} | {'bytes/context':>13}")
+    for name, builder in (("pydantic", build_pydantic), ("slotted", build_slotted)):
+        print(f"{name:>10} | {time_per_call(builder, args.requests):>10.2f} | {bytes_per_context(builder):>13.0f}")
@@ -0,0 +1,56 @@
+"""
+Benchmark: cold import time of the public entry points.
+
+Each statement runs in a fresh interpreter (best of --runs), so the
+numbers are what a cold-starting worker pays before serving a request.
+Lazy loading means only the provider/layer modules actually used are
+imported; the last rows show the cost of pulling in the heavy SDKs.
+
+    python benchmarks/import_time.py --runs 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import velox",
+    "from velox.core import Velox",
+    "from velox.layers import CacheLayer, RetryLayer",
+    "from velox.providers import GroqProvider",
+    "from velox.core import Velox; from velox.layers import CacheLayer; from velox.providers import GroqProvider",
+    "from velox.layers import LoggerLayer",
+    "from velox.providers import OpenAIProvider",
+    "from velox.providers import GoogleGeminiProvider",
+]
+
+PROBE = (
+    "import time, warnings; warnings.simplefilter('ignore'); "
+    "t = time.perf_counter(); {stmt}; print(time.perf_counter() - t)"
+)
+
+
+def cold_import_ms(statement: str, runs: int) -> float:
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    best = float("inf")
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", PROBE.format(stmt=statement)],
+            capture_output=True, text=True, env=env
+        )
+        if proc.returncode != 0:
+            return float("nan")
+        best = min(best, float(proc.stdout.strip().splitlines()[-1]) * 1000)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'ms':>9} | statement")
+    for statement in STATEMENTS:
+        ms = cold_import_ms(statement, args.runs)
+        label = "not installed" if ms != ms else f"{ms:.1f}"
+        print(f"{label:>9} | {statement}")
@@ -0,0 +1,82 @@
+"""
+Microbenchmark: per-request overhead of the middleware chain.
+
+Compares the old strategy (rebuilding one closure per layer on every
+request) against the compiled chain now used by Pipeline.run, using
+MockProvider with its simulated latency removed and no-op layers.
+
+    python benchmarks/pipeline_overhead.py --requests 20000 --layers 0 1 5 10 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.getcwd())
+
+from velox.core.context import EventContext, Message
+from velox.core.pipeline import Pipeline
+from velox.layers.base import Layer
+from velox.providers.mock import MockProvider
+
+
+class PassThroughLayer(Layer):
+    async def process(self, ctx, next_call):
+        return await next_call(ctx)
+
+
+async def run_legacy(pipeline: Pipeline, ctx: EventContext) -> EventContext:
+    """The pre-compilation Pipeline.run: closures rebuilt per request."""
+    async def call_provider(c):
+        return await pipeline._provider.generate(c)
+
+    next_call = call_provider
+    for layer in reversed(pipeline._layers):
+        def make_bound_next(current_layer, current_next):
+            async def bound_next(c):
+                return await current_layer.process(c, current_next)
+            return bound_next
+        next_call = make_bound_next(layer, next_call)
+    return await next_call(ctx)
+
+
+async def measure(runner, pipeline: Pipeline, ctx: EventContext, requests: int) -> float:
+    """Return the mean time per request in microseconds."""
+    for _ in range(min(1000, requests)):
+        await runner(pipeline, ctx)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await runner(pipeline, ctx)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(requests: int, layer_counts):
+    ctx = EventContext(messages=[Message(role="user", content="ping")], model="bench")
+
+    async def compiled(pipeline, c):
+        return await pipeline.run(c)
+
+    print(f"{'layers':>6} | {'legacy us/req':>13} | {'compiled us/req':>15} | {'legacy us/layer':>15} | {'compiled us/layer':>17}")
+    base = {}
+    for n in layer_counts:
+        pipeline = Pipeline()
+        pipeline.set_provider(MockProvider(latency=0))
+        for _ in range(n):
+            pipeline.add_layer(PassThroughLayer())
+
+        legacy = await measure(run_legacy, pipeline, ctx, requests)
+        fast = await measure(compiled, pipeline, ctx, requests)
+        base.setdefault("legacy", legacy)
+        base.setdefault("compiled", fast)
+
+        per_layer = lambda t, key: (t - base[key]) / n if n else 0.0
+        print(f"{n:>6} | {legacy:>13.2f} | {fast:>15.2f} | {per_layer(legacy, 'legacy'):>15.3f} | {per_layer(fast, 'compiled'):>17.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--layers", type=int, nargs="+", default=[0, 1, 5, 10, 20])
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.layers))
@@ -23,5 +23,16 @@ setup(
     ],
     python_requires=">=3.9",
     install_requires=requirements,
+    extras_require={
+        "openai": ["openai>=1.0.0"],
+        "google": ["google-generativeai>=0.5.0"],
+        "rich": ["rich>=13.0.0"],
+        "semantic": ["numpy>=1.22"],
+        "tokens": ["tiktoken>=0.7"],
+        "all": ["openai>=1.0.0", "google-generativeai>=0.5.0", "rich>=13.0.0", "numpy>=1.22", "tiktoken>=0.7"],
+    },
     include_package_data=True,
+    entry_points={
+        "console_scripts": ["velox=velox.cli:main"],
+    },
 )
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from velox.core.batch import BatchRun
+from velox.core.context import EventContext
+
+
+async def run(item):
+    await asyncio.sleep(0)
+    return EventContext(model="mock", messages=[])
+
+
+async def collect(batch):
+    return [item async for item in batch]
+
+
+def failing_inputs(exc: BaseException, after: int = 3):
+    async def inputs():
+        for i in range(after):
+            yield i
+        raise exc
+    return inputs()
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_input_error_mid_stream_is_raised_after_the_items(ordered):
+    batch = BatchRun(run, failing_inputs(ValueError("bad input")), concurrency=4, ordered=ordered)
+    results = []
+
+    async def consume():
+        async for item in batch:
+            results.append(item)
+
+    with pytest.raises(ValueError, match="bad input"):
+        asyncio.run(asyncio.wait_for(consume(), timeout=2.0))
+    assert sorted(item.index for item in results) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_worker_killed_by_base_exception_does_not_hang(ordered):
+    batch = BatchRun(run, failing_inputs(GeneratorExit()), concurrency=4, ordered=ordered)
+    with pytest.raises(GeneratorExit):
+        asyncio.run(asyncio.wait_for(collect(batch), timeout=2.0))
+
+
+def test_ordered_results_keep_input_order():
+    batch = BatchRun(run, range(50), concurrency=8, ordered=True)
+    results = asyncio.run(collect(batch))
+    assert [item.index for item in results] == list(range(50))
+    assert batch.report.completed == 50
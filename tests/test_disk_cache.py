@@ -0,0 +1,53 @@
+import asyncio
+import sqlite3
+import time
+
+from velox.layers.caching import CacheLayer
+from velox.layers.disk_cache import SQLiteCache
+
+
+def test_evictions_count_deleted_rows(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    cache = SQLiteCache(path, max_entries=2, compact_every=10_000)
+    for i in range(6):
+        cache.set(f"k{i}", "v")
+    # Counted before another process pruned three rows behind our back
+    size = cache._size
+    counts = iter([(6, 6)])
+    monkeypatch.setattr(cache, "_size", lambda: next(counts, None) or size())
+    other = sqlite3.connect(path)
+    other.execute("DELETE FROM velox_cache WHERE key IN ('k0', 'k1', 'k2')")
+    other.commit()
+    other.close()
+
+    assert cache.compact() == 3
+    assert cache.stats["evictions"] == 3
+    cache.close()
+
+
+def test_aclose_runs_off_the_event_loop(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    layer = CacheLayer(backend=cache)
+
+    async def main():
+        await cache.aset("k", "v")
+        loop = asyncio.get_running_loop()
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        # A slow write still queued on the worker thread
+        cache._executor.submit(time.sleep, 0.2)
+        started = loop.time()
+        await layer.aclose()
+        ticker.cancel()
+        return loop.time() - started, ticks
+
+    elapsed, ticks = asyncio.run(main())
+    assert elapsed >= 0.15
+    assert ticks > 10
@@ -0,0 +1,24 @@
+import asyncio
+
+from velox.layers.rate_limit import RateLimiter
+
+
+def test_non_positive_limit_header_is_ignored():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=60_000)
+    limiter.calibrate({
+        "x-ratelimit-limit-requests": "0",
+        "x-ratelimit-limit-tokens": "garbage",
+        "anthropic-ratelimit-tokens-limit": "nan",
+    })
+    assert limiter.requests.rate == 10.0
+    assert limiter.tokens.rate == 1000.0
+
+    waited = asyncio.run(asyncio.wait_for(limiter.acquire(100), timeout=1.0))
+    assert waited < 1.0
+
+
+def test_zero_limit_does_not_create_a_bucket():
+    limiter = RateLimiter()
+    limiter.calibrate({"x-ratelimit-limit-requests": "0", "x-ratelimit-limit-tokens": "-5"})
+    assert limiter.requests is None
+    assert limiter.tokens is None
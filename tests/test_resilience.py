@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from velox.core.context import EventContext
+from velox.core.errors import CircuitOpenError
+from velox.layers.resilience import RetryLayer
+
+
+def request(provider=None):
+    ctx = EventContext(model="llama-3-70b", messages=[])
+    if provider is not None:
+        ctx.metadata["provider"] = provider
+    return ctx
+
+
+async def outage(ctx):
+    raise ConnectionError("provider down")
+
+
+async def healthy(ctx):
+    return ctx
+
+
+def test_breaker_is_per_provider_and_model():
+    layer = RetryLayer(max_retries=0, failure_threshold=2)
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await layer.process(request("groq"), outage)
+        with pytest.raises(CircuitOpenError, match="groq"):
+            await layer.process(request("groq"), healthy)
+        # Same model behind another provider is unaffected
+        return await layer.process(request("together"), healthy)
+
+    assert asyncio.run(main()).metadata["provider"] == "together"
+
+
+def test_breaker_falls_back_to_the_layer_provider():
+    layer = RetryLayer(max_retries=0, failure_threshold=1, provider="openai")
+
+    async def main():
+        with pytest.raises(ConnectionError):
+            await layer.process(request(), outage)
+        assert layer.breaker(request()).state == "open"
+        assert layer.breaker(request("azure")).state == "closed"
+
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+import random
+from pathlib import Path
+
+from velox.core.context import EventContext, Message
+from velox.core.text import WORD
+from velox.layers.semantic_router import SemanticRouterLayer
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def old_is_simple(text: str, threshold_chars: int = 50) -> bool:
+    """The heuristic SemanticRouterLayer used before it learned."""
+    if len(text) > threshold_chars:
+        return False
+    complex_keywords = ["explain", "analyze", "complex", "detailed", "step-by-step"]
+    return not any(kw in text.lower() for kw in complex_keywords)
+
+
+def vocabulary():
+    words = {"however", "follower", "clustered", "procedures", "hi", "fq"}
+    for path in [ROOT / "README.md", *sorted((ROOT / "velox").rglob("*.py"))]:
+        words.update(WORD.findall(path.read_text(encoding="utf-8")))
+    return sorted(words)
+
+
+def prompts():
+    words = vocabulary()
+    for word in words:
+        yield f"What is {word}?"
+        yield word
+    rng = random.Random(0)
+    for _ in range(20_000):
+        yield " ".join(rng.choice(words) for _ in range(rng.randint(1, 14)))
+
+
+def routed_tier(router: SemanticRouterLayer, text: str) -> int:
+    ctx = EventContext(model="gpt-4o", messages=[Message(role="user", content=text)])
+    return router.choose(router.featurize(ctx))[0]
+
+
+def test_prior_routes_like_the_old_heuristic():
+    router = SemanticRouterLayer()
+    mismatches = [
+        text for text in prompts()
+        if (routed_tier(router, text) == 0) != old_is_simple(text)
+    ]
+    assert mismatches == []
+
+
+def test_reported_collisions_go_to_the_cheap_tier():
+    router = SemanticRouterLayer()
+    for text in ("What is however?", "What is follower?", "What is clustered?", "What is procedures?", "hi fq"):
+        assert routed_tier(router, text) == 0, text
+
+
+def test_stats_is_a_dict_per_tier():
+    router = SemanticRouterLayer(tiers=["small", "medium", None])
+    assert set(router.stats) == {"small", "medium", "requested"}
+    assert router.stats["small"]["requests"] == 0
@@ -0,0 +1,4 @@
+import sys
+from velox.cli import main
+
+sys.exit(main())
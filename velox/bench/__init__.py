@@ -0,0 +1,11 @@
+from .synthetic import SyntheticProvider, SyntheticProviderError
+from .runner import run_benchmark, run_stack, measure_overhead, parse_stack
+
+__all__ = [
+    "SyntheticProvider",
+    "SyntheticProviderError",
+    "run_benchmark",
+    "run_stack",
+    "measure_overhead",
+    "parse_stack",
+]
@@ -0,0 +1,189 @@
+import platform
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from velox.core.context import EventContext, Message
+from velox.core.engine import Velox
+from velox.layers.base import Layer
+from velox.providers.base import BaseProvider
+
+def _layer_factories() -> Dict[str, Callable[[], Layer]]:
+    from velox.layers import (
+        CacheLayer, CoalescingLayer, CostOptimizerLayer, PIIGuardLayer,
+        RetryLayer, SemanticCacheLayer, SemanticRouterLayer,
+    )
+    return {
+        "cache": CacheLayer,
+        "semantic_cache": SemanticCacheLayer,
+        "coalesce": CoalescingLayer,
+        "pii": PIIGuardLayer,
+        "router": SemanticRouterLayer,
+        "cost": lambda: CostOptimizerLayer(max_cost_usd=float("inf")),
+        "retry": lambda: RetryLayer(base_delay=0.01, max_delay=0.1),
+    }
+
+
+LAYER_NAMES = ("cache", "semantic_cache", "coalesce", "pii", "router", "cost", "retry")
+
+
+def parse_stack(spec: str) -> List[str]:
+    """'pii,cache' -> ['pii', 'cache']; 'bare' or '' -> []"""
+    names = [n.strip() for n in spec.split(",") if n.strip() and n.strip() != "bare"]
+    unknown = [n for n in names if n not in LAYER_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown layer(s) {unknown}; choose from {', '.join(LAYER_NAMES)}")
+    return names
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def make_prompts(count: int, seed: int = 0) -> List[str]:
+    """Synthetic prompts; some carry an email/phone so PII redaction has work."""
+    r = random.Random(seed)
+    topics = ["billing", "refund", "shipping", "password reset", "api limits", "invoice", "upgrade plan"]
+    prompts = []
+    for i in range(count):
+        text = f"Question {i}: explain {r.choice(topics)} for account {r.randint(1000, 9999)}."
+        if i % 3 == 0:
+            text += f" Contact me at user{i}@example.com or 555-{r.randint(100, 999)}-{r.randint(1000, 9999)}."
+        prompts.append(text)
+    return prompts
+
+
+class _ZeroLatencyProvider(BaseProvider):
+    async def generate(self, ctx: EventContext) -> EventContext:
+        ctx.set_response(content="ok")
+        return ctx
+
+
+async def measure_overhead(layer_names: Sequence[str], prompts: Sequence[str], requests: int) -> Dict[str, Any]:
+    """
+    Per-layer self time (microseconds per request), measured sequentially
+    against a zero-latency provider so only Velox's own CPU cost remains.
+    """
+    factories = _layer_factories()
+    motor = Velox()
+    for name in layer_names:
+        motor.add(factories[name]())
+    motor.use(_ZeroLatencyProvider())
+    motor.trace(1.0)
+
+    self_ns = [0] * len(layer_names)
+    start = time.perf_counter()
+    for i in range(requests):
+        ctx = await motor.run([Message("user", prompts[i % len(prompts)])])
+        for span in ctx.spans:
+            if span.kind == "layer":
+                self_ns[span.depth] += span.self_ns
+    elapsed = time.perf_counter() - start
+
+    layers = {name: self_ns[i] / requests / 1000 for i, name in enumerate(layer_names)}
+    return {"total_us": elapsed / requests * 1e6, "layers_us": layers}
+
+
+async def run_stack(
+    layer_names: Sequence[str],
+    provider_factory: Callable[[], BaseProvider],
+    prompts: Sequence[str],
+    requests: int = 1000,
+    concurrency: int = 50,
+    overhead_requests: int = 2000,
+    track_memory: bool = False,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """Load-test one layer stack and return its JSON-ready results."""
+    factories = _layer_factories()
+    motor = Velox()
+    for name in layer_names:
+        motor.add(factories[name]())
+    motor.use(provider_factory())
+
+    r = random.Random(seed)
+    inputs = (prompts[r.randrange(len(prompts))] for _ in range(requests))
+
+    if track_memory:
+        tracemalloc.start()
+    batch = motor.run_many(inputs, concurrency=concurrency)
+    latencies = []
+    errors: Dict[str, int] = {}
+    async for item in batch:
+        if item.ok:
+            latencies.append(item.ctx.metrics.latency_ms)
+        else:
+            kind = type(item.error).__name__
+            errors[kind] = errors.get(kind, 0) + 1
+    peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+    if track_memory:
+        tracemalloc.stop()
+    await motor.aclose()
+
+    latencies.sort()
+    report = batch.report
+    return {
+        "name": ",".join(layer_names) or "bare",
+        "layers": list(layer_names),
+        "requests": requests,
+        "concurrency": concurrency,
+        "completed": report.completed,
+        "errors": errors,
+        "elapsed_s": report.elapsed_s,
+        "throughput_rps": report.throughput,
+        "latency_ms": {
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "total_tokens": report.total_tokens,
+        "total_cost_usd": report.total_cost_usd,
+        "overhead": await measure_overhead(layer_names, prompts, overhead_requests) if overhead_requests else None,
+        "memory_peak_bytes": peak,
+    }
+
+
+async def run_benchmark(
+    stacks: Sequence[Sequence[str]],
+    provider_factory: Callable[[], BaseProvider],
+    requests: int = 1000,
+    concurrency: int = 50,
+    unique_prompts: int = 200,
+    overhead_requests: int = 2000,
+    track_memory: bool = False,
+    provider_config: Optional[Dict[str, Any]] = None,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """Run every stack against the same workload and collect one JSON report."""
+    from velox import __version__
+
+    prompts = make_prompts(unique_prompts, seed)
+    results = []
+    for layer_names in stacks:
+        results.append(await run_stack(
+            layer_names, provider_factory, prompts,
+            requests=requests,
+            concurrency=concurrency,
+            overhead_requests=overhead_requests,
+            track_memory=track_memory,
+            seed=seed
+        ))
+
+    return {
+        "velox_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "config": {
+            "requests": requests,
+            "concurrency": concurrency,
+            "unique_prompts": unique_prompts,
+            "overhead_requests": overhead_requests,
+            "provider": provider_config or {},
+        },
+        "stacks": results,
+    }
@@ -0,0 +1,103 @@
+import asyncio
+import random
+from typing import AsyncIterator, Optional
+from velox.core.context import EventContext, UsageMetrics
+from velox.providers.base import BaseProvider
+
+class SyntheticProviderError(Exception):
+    """Error injected by SyntheticProvider (looks like a 503 to RetryLayer)."""
+    status_code = 503
+
+
+class SyntheticProvider(BaseProvider):
+    """
+    Configurable fake provider for load tests and benchmarks.
+
+    Latency is drawn per request from `distribution`:
+      - "constant":    always `latency_ms`
+      - "uniform":     between `latency_ms - jitter_ms` and `latency_ms + jitter_ms`
+      - "normal":      mean `latency_ms`, stddev `jitter_ms` (clipped at 0)
+      - "lognormal":   median `latency_ms`, `sigma` shape (long tail)
+      - "exponential": mean `latency_ms`
+    `error_rate` of the calls fail with SyntheticProviderError. Token counts
+    and cost are fixed per request; streaming splits the completion into
+    `chunks` pieces spread over the sampled latency.
+    """
+    def __init__(
+        self,
+        latency_ms: float = 50.0,
+        distribution: str = "lognormal",
+        jitter_ms: float = 10.0,
+        sigma: float = 0.5,
+        error_rate: float = 0.0,
+        prompt_tokens: int = 100,
+        completion_tokens: int = 200,
+        cost_per_1k_tokens: float = 0.002,
+        chunks: int = 20,
+        seed: Optional[int] = None
+    ):
+        if distribution not in ("constant", "uniform", "normal", "lognormal", "exponential"):
+            raise ValueError(f"Unknown latency distribution '{distribution}'")
+        self.latency_ms = latency_ms
+        self.distribution = distribution
+        self.jitter_ms = jitter_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.chunks = max(chunks, 1)
+        self._random = random.Random(seed)
+
+    def sample_latency(self) -> float:
+        """Seconds to wait for one request."""
+        r, mean = self._random, self.latency_ms
+        if self.distribution == "constant":
+            ms = mean
+        elif self.distribution == "uniform":
+            ms = r.uniform(mean - self.jitter_ms, mean + self.jitter_ms)
+        elif self.distribution == "normal":
+            ms = r.gauss(mean, self.jitter_ms)
+        elif self.distribution == "lognormal":
+            ms = mean * r.lognormvariate(0.0, self.sigma)
+        else:
+            ms = r.expovariate(1.0 / mean) if mean else 0.0
+        return max(ms, 0.0) / 1000
+
+    def _usage(self) -> UsageMetrics:
+        total = self.prompt_tokens + self.completion_tokens
+        return UsageMetrics(
+            total_tokens=total,
+            prompt_tokens=self.prompt_tokens,
+            completion_tokens=self.completion_tokens,
+            cost_usd=total * self.cost_per_1k_tokens / 1000
+        )
+
+    def _content(self, ctx: EventContext) -> str:
+        return f"synthetic answer to: {ctx.messages[-1].content[:40]}"
+
+    def _maybe_fail(self):
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise SyntheticProviderError("Synthetic provider error")
+
+    async def generate(self, ctx: EventContext) -> EventContext:
+        delay = self.sample_latency()
+        if delay:
+            await asyncio.sleep(delay)
+        self._maybe_fail()
+        ctx.set_response(content=self._content(ctx), usage=self._usage())
+        return ctx
+
+    async def stream(self, ctx: EventContext) -> AsyncIterator[str]:
+        step = self.sample_latency() / self.chunks
+        content = self._content(ctx)
+        size = -(-len(content) // self.chunks)
+        for i in range(self.chunks):
+            if step:
+                await asyncio.sleep(step)
+            if i == 0:
+                self._maybe_fail()
+            piece = content[i * size:(i + 1) * size]
+            if piece:
+                yield piece
+        ctx.set_response(content=content, usage=self._usage())
@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import json
+import sys
+from typing import List, Optional
+
+DEFAULT_STACKS = ["bare", "pii", "cache", "pii,router,cache,retry"]
+
+def _bench(args: argparse.Namespace) -> int:
+    from velox.bench import SyntheticProvider, parse_stack, run_benchmark
+
+    provider_config = {
+        "latency_ms": args.latency_ms,
+        "distribution": args.distribution,
+        "jitter_ms": args.jitter_ms,
+        "sigma": args.sigma,
+        "error_rate": args.error_rate,
+        "prompt_tokens": args.prompt_tokens,
+        "completion_tokens": args.completion_tokens,
+    }
+    try:
+        stacks = [parse_stack(spec) for spec in (args.stack or DEFAULT_STACKS)]
+    except ValueError as e:
+        print(f"velox bench: {e}", file=sys.stderr)
+        return 2
+
+    report = asyncio.run(run_benchmark(
+        stacks,
+        lambda: SyntheticProvider(seed=args.seed, **provider_config),
+        requests=args.requests,
+        concurrency=args.concurrency,
+        unique_prompts=args.unique_prompts,
+        overhead_requests=args.overhead_requests,
+        track_memory=args.memory,
+        provider_config=provider_config,
+        seed=args.seed
+    ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="velox", description="Velox-Core command line tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench = sub.add_parser("bench", help="Load-test pipeline stacks against a synthetic provider (JSON output)")
+    bench.add_argument("--stack", action="append", metavar="LAYERS",
+                       help="comma-separated layers, e.g. 'pii,cache' or 'bare'; repeat to compare stacks")
+    bench.add_argument("--requests", type=int, default=1000)
+    bench.add_argument("--concurrency", type=int, default=50)
+    bench.add_argument("--unique-prompts", type=int, default=200,
+                       help="size of the prompt pool (smaller pool = more cache hits)")
+    bench.add_argument("--overhead-requests", type=int, default=2000,
+                       help="sequential zero-latency requests used to measure per-layer overhead (0 to skip)")
+    bench.add_argument("--latency-ms", type=float, default=50.0)
+    bench.add_argument("--distribution", default="lognormal",
+                       choices=["constant", "uniform", "normal", "lognormal", "exponential"])
+    bench.add_argument("--jitter-ms", type=float, default=10.0)
+    bench.add_argument("--sigma", type=float, default=0.5)
+    bench.add_argument("--error-rate", type=float, default=0.0)
+    bench.add_argument("--prompt-tokens", type=int, default=100)
+    bench.add_argument("--completion-tokens", type=int, default=200)
+    bench.add_argument("--memory", action="store_true", help="track peak allocations with tracemalloc (slower)")
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--output", "-o", help="write the JSON report to this file")
+    bench.set_defaults(func=_bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
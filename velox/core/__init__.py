@@ -1,5 +1,27 @@
 from .context import EventContext, Message, UsageMetrics
 from .engine import Velox
 from .pipeline import Pipeline
+from .stream import StreamResponse
+from .batch import BatchItem, BatchReport, BatchRun
+from .tracing import Span, SpanExporter, FileSpanExporter
+from .metrics import MetricsRegistry, Histogram, MetricsSpanExporter, get_registry
+from .tokens import TokenCounter, TokenFamily, get_counter, set_counter
+from .events import EventBus, RequestEvent, RollingStats, get_bus
 
-__all__ = ["EventContext", "Message", "UsageMetrics", "Velox", "Pipeline"]
+# The pydantic schema is only needed for validation/serialization at the
+# API boundary; import it on first access to keep `import velox.core` light.
+_SCHEMA = ("EventContextModel", "MessageModel", "UsageMetricsModel")
+
+def __getattr__(name: str):
+    if name in _SCHEMA:
+        from . import schema
+        return getattr(schema, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ["EventContext", "Message", "UsageMetrics", "Velox", "Pipeline", "StreamResponse",
+           "BatchItem", "BatchReport", "BatchRun",
+           "EventContextModel", "MessageModel", "UsageMetricsModel",
+           "Span", "SpanExporter", "FileSpanExporter",
+           "MetricsRegistry", "Histogram", "MetricsSpanExporter", "get_registry",
+           "TokenCounter", "TokenFamily", "get_counter", "set_counter",
+           "EventBus", "RequestEvent", "RollingStats", "get_bus"]
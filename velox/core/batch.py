@@ -0,0 +1,202 @@
+from __future__ import annotations
+import asyncio
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+from velox.core.context import EventContext
+
+BatchInput = Union[Iterable[Any], AsyncIterable[Any]]
+
+class BatchItem:
+    """
+    Outcome of one input of a batch.
+    Exactly one of `ctx` (success) and `error` (failure) is set.
+    """
+    __slots__ = ("index", "input", "ctx", "error")
+
+    def __init__(self, index: int, input: Any, ctx: Optional[EventContext] = None, error: Optional[BaseException] = None):
+        self.index = index
+        self.input = input
+        self.ctx = ctx
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"BatchItem(index={self.index}, {status})"
+
+
+class BatchReport:
+    """
+    Aggregate throughput and cost of a batch.
+    `results` is filled (in input order) by Velox.map().
+    """
+    def __init__(self):
+        self.completed = 0
+        self.failed = 0
+        self.total_tokens = 0
+        self.total_cost_usd = 0.0
+        self.elapsed_s = 0.0
+        self.results: List[BatchItem] = []
+
+    @property
+    def total(self) -> int:
+        return self.completed + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Finished items per second."""
+        return self.total / self.elapsed_s if self.elapsed_s else 0.0
+
+    def record(self, item: BatchItem):
+        if item.ok:
+            self.completed += 1
+            self.total_tokens += item.ctx.metrics.total_tokens
+            self.total_cost_usd += item.ctx.metrics.cost_usd
+        else:
+            self.failed += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "elapsed_s": self.elapsed_s,
+            "throughput_per_s": self.throughput,
+            "total_tokens": self.total_tokens,
+            "total_cost_usd": self.total_cost_usd,
+        }
+
+    def __repr__(self) -> str:
+        return (f"BatchReport(completed={self.completed}, failed={self.failed}, "
+                f"throughput={self.throughput:.1f}/s, cost=${self.total_cost_usd:.6f})")
+
+
+class BatchRun:
+    """
+    Async iterator over the results of Velox.run_many().
+
+    At most `concurrency` inputs are in flight at once; inputs are pulled
+    lazily, so very large or unbounded (async) iterables are fine. Results
+    are yielded as they complete, or in input order with `ordered=True`.
+    In ordered mode no input is started more than `ordered_window`
+    (default 4 x concurrency) positions ahead of the next item to yield,
+    so a slow head item cannot make finished results pile up behind it.
+    A failing item is reported as a BatchItem with `error` set and never
+    aborts the batch; a worker killed by a BaseException (e.g. GeneratorExit
+    from the input iterable) aborts it with that exception. `report` holds
+    the aggregates once iteration ends.
+    """
+    def __init__(
+        self,
+        run: Callable[[Any], Awaitable[EventContext]],
+        inputs: BatchInput,
+        concurrency: int = 16,
+        ordered: bool = False,
+        ordered_window: Optional[int] = None
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self._run = run
+        self._inputs = inputs
+        self.concurrency = concurrency
+        self.ordered = ordered
+        # Never below concurrency, or workers could starve each other
+        self.ordered_window = max(ordered_window or concurrency * 4, concurrency)
+        self.report = BatchReport()
+
+    async def _source(self) -> AsyncIterator[Any]:
+        if hasattr(self._inputs, "__aiter__"):
+            async for item in self._inputs:
+                yield item
+        else:
+            for item in self._inputs:
+                yield item
+
+    def __aiter__(self) -> AsyncIterator[BatchItem]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[BatchItem]:
+        source = self._source().__aiter__()
+        source_lock = asyncio.Lock()
+        # Unbounded so the end-of-worker sentinel always fits; results are bounded by `slots`
+        queue: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self.concurrency * 2)
+        counter = iter(range(2**63))
+        done = object()
+        window_moved = asyncio.Condition()
+        issued = 0
+
+        source_errors: List[Exception] = []
+        crashed: List[BaseException] = []
+
+        def window_open() -> bool:
+            return issued - next_index < self.ordered_window
+
+        async def worker():
+            nonlocal issued
+            try:
+                while True:
+                    async with source_lock:
+                        if self.ordered and not window_open():
+                            async with window_moved:
+                                await window_moved.wait_for(window_open)
+                        try:
+                            item = await source.__anext__()
+                        except StopAsyncIteration:
+                            break
+                        except Exception as e:
+                            source_errors.append(e)
+                            break
+                        index = next(counter)
+                        issued = index + 1
+                    try:
+                        result = BatchItem(index, item, ctx=await self._run(item))
+                    except Exception as e:
+                        result = BatchItem(index, item, error=e)
+                    await slots.acquire()
+                    queue.put_nowait(result)
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                crashed.append(e)
+            finally:
+                # Always signalled, or the consumer would wait for this worker forever
+                queue.put_nowait(done)
+
+        start = time.perf_counter()
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        pending: Dict[int, BatchItem] = {}
+        next_index = 0
+        running = len(workers)
+        try:
+            while running:
+                result = await queue.get()
+                if result is done:
+                    if crashed:
+                        raise crashed[0]
+                    running -= 1
+                    continue
+                slots.release()
+                self.report.record(result)
+                self.report.elapsed_s = time.perf_counter() - start
+
+                if not self.ordered:
+                    yield result
+                    continue
+
+                pending[result.index] = result
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+                    async with window_moved:
+                        window_moved.notify_all()
+
+            # The input iterable itself failed: surface it after the items we could run
+            if source_errors:
+                raise source_errors[0]
+        finally:
+            for task in workers:
+                task.cancel()
+            self.report.elapsed_s = time.perf_counter() - start
@@ -1,40 +1,167 @@
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
 import time
+from velox.core.tokens import get_counter
 
-class UsageMetrics(BaseModel):
-    total_tokens: int = 0
-    prompt_tokens: int = 0
-    completion_tokens: int = 0
-    cost_usd: float = 0.0
-    latency_ms: float = 0.0
+# The hot-path state objects below are plain slotted classes: building and
+# mutating them costs a fraction of a pydantic model. Validation and
+# serialization happen at the API boundary (see velox.core.schema).
 
-class Message(BaseModel):
-    role: str
-    content: str
-    name: Optional[str] = None
+class UsageMetrics:
+    __slots__ = (
+        "total_tokens", "prompt_tokens", "completion_tokens", "cost_usd",
+        "latency_ms", "time_to_first_token_ms", "hedge_cost_usd",
+        "cached_prompt_tokens", "cache_write_tokens", "cache_savings_usd",
+    )
 
-class EventContext(BaseModel):
+    def __init__(
+        self,
+        total_tokens: int = 0,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cost_usd: float = 0.0,
+        latency_ms: float = 0.0,
+        time_to_first_token_ms: float = 0.0,
+        hedge_cost_usd: float = 0.0,
+        cached_prompt_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        cache_savings_usd: float = 0.0
+    ):
+        self.total_tokens = total_tokens
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.cost_usd = cost_usd
+        self.latency_ms = latency_ms
+        self.time_to_first_token_ms = time_to_first_token_ms
+        self.hedge_cost_usd = hedge_cost_usd
+        # Provider-side prompt caching: prompt tokens read from / written to
+        # the cache, and the cost difference versus an uncached prompt
+        self.cached_prompt_tokens = cached_prompt_tokens
+        self.cache_write_tokens = cache_write_tokens
+        self.cache_savings_usd = cache_savings_usd
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, UsageMetrics) and self.to_dict() == other.to_dict()
+
+    def __str__(self) -> str:
+        return " ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+
+    def __repr__(self) -> str:
+        return f"UsageMetrics({', '.join(f'{k}={v!r}' for k, v in self.to_dict().items())})"
+
+
+class Message:
+    __slots__ = ("role", "content", "name")
+
+    def __init__(self, role: str, content: str, name: Optional[str] = None):
+        self.role = role
+        self.content = content
+        self.name = name
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"role": self.role, "content": self.content, "name": self.name}
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, Message)
+            and self.role == other.role
+            and self.content == other.content
+            and self.name == other.name
+        )
+
+    def __repr__(self) -> str:
+        return f"Message(role={self.role!r}, content={self.content!r}, name={self.name!r})"
+
+
+class EventContext:
     """
     The state object that travels through the Velox pipeline.
     It holds the request, the accumulated metrics, and the final response.
     """
-    # 1. Input State
-    messages: List[Message]
-    model: str
-    temperature: float = 0.7
-    max_tokens: Optional[int] = None
-    
-    # 2. Metadata (for routing/logging)
-    session_id: str = Field(default_factory=lambda: str(time.time()))
-    metadata: Dict[str, Any] = Field(default_factory=dict)
-    
-    # 3. Output State (Populated by the Provider)
-    response_content: Optional[str] = None
-    
-    # 4. Telemetry
-    metrics: UsageMetrics = Field(default_factory=UsageMetrics)
-    start_time: float = Field(default_factory=time.time)
+    __slots__ = (
+        # 1. Input State
+        "messages", "model", "temperature", "max_tokens",
+        # 2. Metadata (for routing/logging)
+        "session_id", "metadata",
+        # 3. Output State (Populated by the Provider)
+        "response_content",
+        # 4. Telemetry
+        "metrics", "start_time", "spans",
+    )
+
+    def __init__(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        session_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        response_content: Optional[str] = None,
+        metrics: Optional[UsageMetrics] = None,
+        start_time: Optional[float] = None,
+        spans: Optional[List[Any]] = None
+    ):
+        now = time.time()
+        self.messages = messages
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.session_id = session_id if session_id is not None else str(now)
+        self.metadata = metadata if metadata is not None else {}
+        self.response_content = response_content
+        self.metrics = metrics if metrics is not None else UsageMetrics()
+        self.start_time = start_time if start_time is not None else now
+        # Per-layer timing (velox.core.tracing.Span), only for sampled requests
+        self.spans = spans
+
+    def fork(self, **changes) -> "EventContext":
+        """
+        Independent copy for a parallel call (hedge, shadow...).
+        Messages and metadata containers are copied, metrics start fresh.
+        """
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(
+            messages=list(self.messages),
+            metadata=dict(self.metadata),
+            metrics=UsageMetrics(),
+            response_content=None,
+            spans=None,
+        )
+        fields.update(changes)
+        return EventContext(**fields)
+
+    @property
+    def token_count(self) -> int:
+        """
+        Local count of the prompt tokens for `model` (velox.core.tokens),
+        including chat framing. Memoized per message, so cheap to re-read.
+        """
+        return get_counter().count_messages(self.messages, self.model)[0]
+
+    @property
+    def message_token_counts(self) -> List[int]:
+        """Local token count of each message's content."""
+        return get_counter().count_messages(self.messages, self.model)[1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["messages"] = [m.to_dict() for m in self.messages]
+        data["metadata"] = dict(self.metadata)
+        data["metrics"] = self.metrics.to_dict()
+        data["spans"] = [s.to_dict() for s in self.spans] if self.spans is not None else None
+        return data
+
+    def to_model(self):
+        """Validated pydantic view of this context (see velox.core.schema)."""
+        from velox.core.schema import EventContextModel
+        return EventContextModel.model_validate(self.to_dict())
+
+    def __repr__(self) -> str:
+        return (f"EventContext(model={self.model!r}, messages={len(self.messages)}, "
+                f"session_id={self.session_id!r}, response_content={self.response_content!r})")
 
     def set_response(self, content: str, usage: Optional[UsageMetrics] = None):
         self.response_content = content
@@ -44,3 +171,6 @@ class EventContext(BaseModel):
             self.metrics.prompt_tokens = usage.prompt_tokens
             self.metrics.completion_tokens = usage.completion_tokens
             self.metrics.cost_usd += usage.cost_usd
+            self.metrics.cached_prompt_tokens = usage.cached_prompt_tokens
+            self.metrics.cache_write_tokens = usage.cache_write_tokens
+            self.metrics.cache_savings_usd += usage.cache_savings_usd
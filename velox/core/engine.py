@@ -1,18 +1,45 @@
 from __future__ import annotations
 from typing import List, Optional, Dict, Any, TYPE_CHECKING
+from velox.core.batch import BatchInput, BatchReport, BatchRun
 from velox.core.context import EventContext, Message
+from velox.core.events import EventBus
 from velox.core.pipeline import Pipeline
+from velox.core.stream import StreamResponse
+from velox.core.tracing import SpanExporter
 
 if TYPE_CHECKING:
     from velox.layers.base import Layer
     from velox.providers.base import BaseProvider
 
+def _as_message(message: Any) -> Message:
+    if type(message) is Message:
+        return message
+    if isinstance(message, dict):
+        return Message(**message)
+    # pydantic MessageModel or any object with the same attributes
+    return Message(message.role, message.content, getattr(message, "name", None))
+
+
 class Velox:
     """
     The High-Performance Motor.
+
+    Requests travel as lightweight EventContext objects. Messages may be
+    given as Message objects, dicts or pydantic models; with
+    `validate=True` every request is checked through the pydantic schema
+    (velox.core.schema) before entering the pipeline.
     """
-    def __init__(self):
+    def __init__(self, validate: bool = False):
         self._pipeline = Pipeline()
+        self.validate = validate
+
+    @property
+    def events(self) -> EventBus:
+        """
+        Bus on which every request is published as a RequestEvent while it
+        has subscribers (dashboards, load-test reporters).
+        """
+        return self._pipeline.events
 
     def add(self, layer: Layer):
         """Add a middleware layer to the pipeline."""
@@ -24,6 +51,48 @@ class Velox:
         self._pipeline.set_provider(provider)
         return self
 
+    def trace(self, sample_rate: float = 1.0, exporter: Optional[SpanExporter] = None):
+        """
+        Record per-layer timing spans (ctx.spans) for a fraction of requests
+        and pass them to `exporter` (e.g. FileSpanExporter for OTLP/JSON).
+        """
+        self._pipeline.set_tracing(sample_rate, exporter)
+        return self
+
+    def freeze(self):
+        """
+        Lock the pipeline configuration.
+        The middleware chain is compiled now and further add()/use() calls raise.
+        """
+        self._pipeline.freeze()
+        return self
+
+    async def startup(self, warmup: bool = True):
+        """
+        Prepare the motor before serving traffic.
+        Opens provider connection pools (pre-connecting when `warmup` is set)
+        so the first requests don't pay DNS/TCP/TLS handshakes.
+        """
+        await self._pipeline.startup(warmup=warmup)
+        return self
+
+    async def aclose(self):
+        """Close provider connection pools and release layer resources."""
+        await self._pipeline.aclose()
+
+    async def __aenter__(self):
+        return await self.startup()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    def _context(self, messages: List[Any], model: str, **kwargs) -> EventContext:
+        if self.validate:
+            from velox.core.schema import EventContextModel
+            messages = [m.to_dict() if isinstance(m, Message) else m for m in messages]
+            return EventContextModel(messages=messages, model=model, **kwargs).to_context()
+        return EventContext(messages=[_as_message(m) for m in messages], model=model, **kwargs)
+
     async def run(
         self, 
         messages: List[Message], 
@@ -33,14 +102,64 @@ class Velox:
         """
         Run the motor.
         """
-        ctx = EventContext(
-            messages=messages,
-            model=model,
-            metadata=kwargs.get("metadata", {}),
-            **kwargs
-        )
+        ctx = self._context(messages, model, **kwargs)
         return await self._pipeline.run(ctx)
 
+    def stream(
+        self,
+        messages: List[Message],
+        model: str = "default",
+        **kwargs
+    ) -> StreamResponse:
+        """
+        Run the motor in streaming mode.
+        Iterate the result with `async for` to receive chunks as they arrive;
+        the final EventContext (content + metrics) is available as `.ctx`.
+        """
+        ctx = self._context(messages, model, **kwargs)
+        return StreamResponse(ctx, self._pipeline.stream(ctx))
+
+    def run_many(
+        self,
+        inputs: BatchInput,
+        concurrency: int = 16,
+        ordered: bool = False,
+        **kwargs
+    ) -> BatchRun:
+        """
+        Run many requests through the pipeline with bounded concurrency.
+
+        `inputs` is an iterable or async iterable whose items are either a
+        prompt string, a list of Messages, or a dict of `run()` arguments.
+        `kwargs` are shared defaults for every item (model, temperature...).
+        Iterate the result with `async for` to receive BatchItems as they
+        complete (or in input order with `ordered=True`); failures are
+        reported per item. Aggregates are available as `.report`.
+        """
+        async def run_one(item: Any) -> EventContext:
+            params = dict(kwargs)
+            if isinstance(item, str):
+                params["messages"] = [Message(role="user", content=item)]
+            elif isinstance(item, dict):
+                params.update(item)
+            else:
+                params["messages"] = item
+            # Never share one metadata dict between items
+            if "metadata" in params:
+                params["metadata"] = dict(params["metadata"])
+            return await self.run(**params)
+
+        return BatchRun(run_one, inputs, concurrency=concurrency, ordered=ordered)
+
+    async def map(self, inputs: BatchInput, concurrency: int = 16, **kwargs) -> BatchReport:
+        """
+        Run a whole batch and collect it.
+        Returns a BatchReport whose `results` are in input order.
+        """
+        batch = self.run_many(inputs, concurrency=concurrency, ordered=True, **kwargs)
+        batch.report.results = [item async for item in batch]
+        return batch.report
+
     async def prompt(self, text: str, **kwargs) -> str:
         """
         Legacy/Simple helper for single-turn prompts.
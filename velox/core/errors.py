@@ -0,0 +1,62 @@
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# 408 timeout, 409 conflict, 425 too early, 429 rate limited
+RETRYABLE_STATUS = {408, 409, 425, 429}
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit is open."""
+    pass
+
+
+class BudgetExceededError(Exception):
+    """Raised before the provider call when a request would exceed a cost budget."""
+    def __init__(self, scope: str, key: str, limit: float, committed: float, requested: float):
+        self.scope = scope
+        self.key = key
+        self.limit = limit
+        self.committed = committed
+        self.requested = requested
+        super().__init__(
+            f"Budget exceeded for {scope} {key}. Limit: ${limit}, "
+            f"committed: ${committed:.6f}, this request: ~${requested:.6f}"
+        )
+
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """HTTP status of a provider error (httpx and openai exceptions), if any."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Server errors (5xx), throttling/timeouts (408/429...) and network
+    failures are retryable; other 4xx are the caller's fault and are not.
+    Errors without an HTTP status are treated as transient.
+    """
+    if isinstance(exc, (CircuitOpenError, BudgetExceededError)):
+        return False
+    status = error_status(exc)
+    if status is None:
+        return True
+    return status >= 500 or status in RETRYABLE_STATUS
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta or HTTP date)."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
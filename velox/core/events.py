@@ -0,0 +1,223 @@
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from velox.core.metrics import Histogram
+
+
+class RequestEvent:
+    """
+    One pipeline event: `kind` is "start" when a request enters the
+    pipeline and "end" when it leaves (successfully or with `error`).
+    `time` is time.monotonic(); the result fields are only set on "end".
+    """
+    __slots__ = (
+        "kind", "model", "time", "latency_ms", "time_to_first_token_ms",
+        "prompt_tokens", "completion_tokens", "cost_usd", "cache_hit", "error",
+    )
+
+    def __init__(
+        self,
+        kind: str,
+        model: str,
+        time: float,
+        latency_ms: float = 0.0,
+        time_to_first_token_ms: float = 0.0,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cost_usd: float = 0.0,
+        cache_hit: bool = False,
+        error: Optional[str] = None
+    ):
+        self.kind = kind
+        self.model = model
+        self.time = time
+        self.latency_ms = latency_ms
+        self.time_to_first_token_ms = time_to_first_token_ms
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.cost_usd = cost_usd
+        self.cache_hit = cache_hit
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"RequestEvent({', '.join(f'{k}={v!r}' for k, v in self.to_dict().items())})"
+
+
+class Subscription:
+    """
+    A subscriber's bounded mailbox. When the consumer falls behind, the
+    oldest events are overwritten and counted in `dropped`; publishers
+    never wait.
+    """
+    def __init__(self, maxlen: int = 100_000):
+        self.maxlen = maxlen
+        self.events: Deque[RequestEvent] = deque(maxlen=maxlen)
+        self.dropped = 0
+
+    def put(self, event: RequestEvent):
+        events = self.events
+        if len(events) == self.maxlen:
+            self.dropped += 1
+        events.append(event)
+
+    def drain(self) -> List[RequestEvent]:
+        """Pop every pending event, oldest first."""
+        events = self.events
+        drained = []
+        try:
+            while True:
+                drained.append(events.popleft())
+        except IndexError:
+            return drained
+
+
+class EventBus:
+    """
+    Fan-out of pipeline events to in-process subscribers (dashboards,
+    load-test reporters).
+
+    Publishing is a plain append to each subscriber's bounded deque: no
+    lock, no await, no task switch, so it adds nothing measurable to the
+    request path. deque.append/popleft are atomic, and the subscriber
+    tuple is replaced (never mutated) on subscribe/unsubscribe, so
+    publishers and consumers may live in different threads. With no
+    subscribers the pipeline skips event creation entirely.
+    """
+    def __init__(self):
+        self.subscribers: Tuple[Subscription, ...] = ()
+
+    def subscribe(self, maxlen: int = 100_000) -> Subscription:
+        subscription = Subscription(maxlen)
+        self.subscribers = self.subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscribers = tuple(s for s in self.subscribers if s is not subscription)
+
+    def publish(self, event: RequestEvent):
+        for subscription in self.subscribers:
+            subscription.put(event)
+
+
+_bus = EventBus()
+
+def get_bus() -> EventBus:
+    """The process-wide default event bus (used by every Pipeline)."""
+    return _bus
+
+
+class _Second:
+    __slots__ = ("second", "requests", "errors", "cache_hits", "tokens", "cost_usd", "latency")
+
+    def __init__(self, second: int):
+        self.second = second
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.tokens = 0
+        self.cost_usd = 0.0
+        self.latency = Histogram()
+
+
+class RollingStats:
+    """
+    Aggregates RequestEvents over a sliding `window` (seconds) in
+    one-second buckets, each with its own latency Histogram, plus
+    lifetime totals. Feed it with `consume(subscription.drain())` and read
+    `snapshot()`; memory is bounded by the window, not by the traffic.
+    """
+    def __init__(self, window: int = 60):
+        self.window = window
+        self._seconds: Deque[_Second] = deque()
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.tokens = 0
+        self.cost_usd = 0.0
+        self.first_seen: Optional[float] = None
+        self.models: Dict[str, int] = {}
+
+    def _bucket(self, second: int) -> _Second:
+        seconds = self._seconds
+        if not seconds or seconds[-1].second < second:
+            seconds.append(_Second(second))
+            return seconds[-1]
+        # Late event (e.g. published from another thread): goes to its own
+        # second if still tracked, otherwise to the nearest tracked one
+        for bucket in reversed(seconds):
+            if bucket.second <= second:
+                return bucket
+        return seconds[0]
+
+    def consume(self, events: Iterable[RequestEvent]):
+        for event in events:
+            if self.first_seen is None:
+                self.first_seen = event.time
+            if event.kind == "start":
+                self.in_flight += 1
+                continue
+            self.in_flight = max(self.in_flight - 1, 0)
+            bucket = self._bucket(int(event.time))
+            bucket.requests += 1
+            self.requests += 1
+            self.models[event.model] = self.models.get(event.model, 0) + 1
+            if event.error is not None:
+                bucket.errors += 1
+                self.errors += 1
+                continue
+            bucket.latency.record(event.latency_ms)
+            tokens = event.prompt_tokens + event.completion_tokens
+            bucket.tokens += tokens
+            self.tokens += tokens
+            bucket.cost_usd += event.cost_usd
+            self.cost_usd += event.cost_usd
+            if event.cache_hit:
+                bucket.cache_hits += 1
+                self.cache_hits += 1
+
+    def _expire(self, now: float):
+        oldest = int(now) - self.window
+        seconds = self._seconds
+        while seconds and seconds[0].second <= oldest:
+            seconds.popleft()
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Rolling rates/percentiles over the window and lifetime totals."""
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        latency = Histogram()
+        requests = errors = cache_hits = tokens = 0
+        cost = 0.0
+        for bucket in self._seconds:
+            latency.merge(bucket.latency)
+            requests += bucket.requests
+            errors += bucket.errors
+            cache_hits += bucket.cache_hits
+            tokens += bucket.tokens
+            cost += bucket.cost_usd
+        span = min(self.window, now - self.first_seen) if self.first_seen is not None else 0.0
+        span = max(span, 1.0)
+        answered = requests - errors
+        return {
+            "window_s": self.window,
+            "in_flight": self.in_flight,
+            "rps": requests / span,
+            "tokens_per_s": tokens / span,
+            "error_rate": errors / requests if requests else 0.0,
+            "cache_hit_ratio": cache_hits / answered if answered else 0.0,
+            "p50_ms": latency.percentile(0.50),
+            "p90_ms": latency.percentile(0.90),
+            "p99_ms": latency.percentile(0.99),
+            "max_ms": latency.max,
+            "cost_usd_window": cost,
+            "requests_total": self.requests,
+            "errors_total": self.errors,
+            "cache_hits_total": self.cache_hits,
+            "tokens_total": self.tokens,
+            "cost_usd_total": self.cost_usd,
+        }
@@ -0,0 +1,283 @@
+import asyncio
+import math
+import os
+import tempfile
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from velox.core.tracing import Span, SpanExporter
+
+if TYPE_CHECKING:
+    from velox.core.context import EventContext
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_EXPORT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class Histogram:
+    """
+    Fixed-memory log-linear histogram (HDR style).
+
+    Values are quantized to `resolution`, then bucketed with `2**sub_bits`
+    linear sub-buckets per power of two, so every recorded value is kept
+    within a relative error of 2**-(sub_bits - 1) regardless of the range.
+    Memory is one int64 per bucket (~700 buckets by default) no matter how
+    many values are recorded; recording is O(1).
+    """
+    def __init__(self, resolution: float = 0.01, sub_bits: int = 5, max_shift: int = 40):
+        self.resolution = resolution
+        self.sub_bits = sub_bits
+        self._sub_count = 1 << sub_bits
+        self._half = self._sub_count >> 1
+        self._counts = array("q", [0] * (self._sub_count + max_shift * self._half))
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def _index(self, units: int) -> int:
+        bits = units.bit_length()
+        if bits <= self.sub_bits:
+            return units
+        shift = bits - self.sub_bits
+        mantissa = units >> shift
+        index = self._sub_count + (shift - 1) * self._half + (mantissa - self._half)
+        return min(index, len(self._counts) - 1)
+
+    def _bounds(self, index: int) -> Tuple[float, float]:
+        if index < self._sub_count:
+            low, high = index, index + 1
+        else:
+            shift = (index - self._sub_count) // self._half + 1
+            mantissa = (index - self._sub_count) % self._half + self._half
+            low, high = mantissa << shift, (mantissa + 1) << shift
+        return low * self.resolution, high * self.resolution
+
+    def record(self, value: float):
+        value = max(value, 0.0)
+        self._counts[self._index(int(value / self.resolution))] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram"):
+        """Add the values of `other` (same resolution and layout) into this histogram."""
+        counts = self._counts
+        for index, n in enumerate(other._counts):
+            if n:
+                counts[index] += n
+        self.count += other.count
+        self.sum += other.sum
+        if other.max > self.max:
+            self.max = other.max
+
+    def percentile(self, q: float) -> float:
+        """Approximate value at quantile q (0..1); bucket midpoint."""
+        if not self.count:
+            return 0.0
+        target = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= target:
+                low, high = self._bounds(index)
+                return min((low + high) / 2, self.max)
+        return self.max
+
+    def cumulative(self, boundaries: Sequence[float]) -> List[int]:
+        """Counts of values <= each boundary (bucket midpoints are compared)."""
+        result = [0] * len(boundaries)
+        for index, n in enumerate(self._counts):
+            if not n:
+                continue
+            low, high = self._bounds(index)
+            middle = (low + high) / 2
+            for i, bound in enumerate(boundaries):
+                if middle <= bound:
+                    result[i] += n
+        return result
+
+
+class _Family:
+    def __init__(self, name: str, kind: str, help: str, labels: Sequence[str]):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.labels = tuple(labels)
+        self.values: Dict[LabelValues, object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+
+class CounterFamily(_Family):
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(self._key(labels), 0.0)
+
+
+class GaugeFamily(_Family):
+    def set(self, value: float, **labels: str):
+        self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(self._key(labels), 0.0)
+
+
+class HistogramFamily(_Family):
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float]):
+        super().__init__(name, "histogram", help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels: str):
+        self.child(**labels).record(value)
+
+    def child(self, **labels: str) -> Histogram:
+        key = self._key(labels)
+        histogram = self.values.get(key)
+        if histogram is None:
+            histogram = self.values[key] = Histogram()
+        return histogram
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """
+    Process-wide store of counters, gauges and histograms keyed by labels.
+    Families are created on first use and live for the process lifetime;
+    `render()` produces the Prometheus text exposition format (0.0.4).
+    """
+    def __init__(self, prefix: str = "velox"):
+        self.prefix = prefix
+        self._families: Dict[str, _Family] = {}
+
+    def _family(self, cls, name: str, *args) -> _Family:
+        full = f"{self.prefix}_{name}" if self.prefix else name
+        family = self._families.get(full)
+        if family is None:
+            family = self._families[full] = cls(full, *args)
+        return family
+
+    def counter(self, name: str, help: str = "", labels: Sequence[str] = ()) -> CounterFamily:
+        return self._family(CounterFamily, name, "counter", help, labels)
+
+    def gauge(self, name: str, help: str = "", labels: Sequence[str] = ()) -> GaugeFamily:
+        return self._family(GaugeFamily, name, "gauge", help, labels)
+
+    def histogram(
+        self,
+        name: str,
+        help: str = "",
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_EXPORT_BUCKETS
+    ) -> HistogramFamily:
+        return self._family(HistogramFamily, name, help, labels, buckets)
+
+    def families(self) -> Iterable[_Family]:
+        return self._families.values()
+
+    def clear(self):
+        self._families.clear()
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family in self._families.values():
+            if family.help:
+                lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            if isinstance(family, HistogramFamily):
+                for key, histogram in family.values.items():
+                    counts = histogram.cumulative(family.buckets)
+                    for bound, n in zip(family.buckets, counts):
+                        lines.append(f"{family.name}_bucket{_labels(family.labels, key, ('le', _number(bound)))} {n}")
+                    lines.append(f"{family.name}_bucket{_labels(family.labels, key, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{family.name}_sum{_labels(family.labels, key)} {_number(histogram.sum)}")
+                    lines.append(f"{family.name}_count{_labels(family.labels, key)} {histogram.count}")
+            else:
+                for key, value in family.values.items():
+                    lines.append(f"{family.name}{_labels(family.labels, key)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """
+        Atomically write the exposition to `path`
+        (e.g. for the node_exporter textfile collector).
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".velox-metrics-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 9464) -> asyncio.AbstractServer:
+        """
+        Serve the exposition over HTTP on the running event loop
+        (any path). Close the returned server to stop it.
+        """
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            try:
+                while (await reader.readline()).strip():
+                    pass
+                body = self.render().encode("utf-8")
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                    + f"Content-Length: {len(body)}\r\n".encode()
+                    + b"Connection: close\r\n\r\n" + body
+                )
+                await writer.drain()
+            finally:
+                writer.close()
+
+        return await asyncio.start_server(handle, host, port)
+
+
+_registry = MetricsRegistry()
+
+def get_registry() -> MetricsRegistry:
+    """The process-wide default registry."""
+    return _registry
+
+
+class MetricsSpanExporter(SpanExporter):
+    """
+    Feeds the spans of sampled requests into per-layer self-time
+    histograms, so `Velox.trace(exporter=MetricsSpanExporter())` turns
+    tracing into aggregated layer metrics instead of raw span dumps.
+    """
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        registry = registry or get_registry()
+        self.layer_ms = registry.histogram(
+            "layer_self_ms", "Time spent inside each layer, excluding downstream (sampled)", ("layer", "model")
+        )
+
+    def export(self, ctx: "EventContext", spans: List[Span]):
+        for span in spans:
+            self.layer_ms.observe(span.self_ns / 1e6, layer=span.name, model=ctx.model)
@@ -1,51 +1,242 @@
 from __future__ import annotations
-from typing import List, Callable, Awaitable, TYPE_CHECKING
+import random
+import time
+from typing import List, Callable, Awaitable, AsyncIterator, Optional, TYPE_CHECKING
 from velox.core.context import EventContext
+from velox.core.events import EventBus, RequestEvent, get_bus
+from velox.core.tracing import Span, SpanExporter
 
 if TYPE_CHECKING:
     from velox.layers.base import Layer
     from velox.providers.base import BaseProvider
 
+NextCall = Callable[[EventContext], Awaitable[EventContext]]
+NextStream = Callable[[EventContext], AsyncIterator[str]]
+
 class Pipeline:
     """
     The heart of the Motor.
     Manages the chain of middleware layers and the final provider execution.
+
+    The chain is compiled once into a single callable and reused for every
+    request; it is rebuilt only when layers or the provider change.
+    Call `freeze()` to lock the configuration for production use.
+
+    With tracing enabled, a sampled fraction of run() requests goes through
+    a second, instrumented chain that records one Span per layer and for
+    the provider on ctx.spans, then hands them to the span exporters.
+    Unsampled requests use the plain chain and pay nothing.
+
+    Every request entering and leaving the pipeline is published as a
+    RequestEvent on `events` (the process-wide bus by default) while that
+    bus has subscribers, e.g. a live dashboard; otherwise nothing is built.
     """
-    def __init__(self):
+    def __init__(self, events: Optional[EventBus] = None):
         self._layers: List[Layer] = []
         self._provider: BaseProvider = None
+        self._frozen = False
+        self._chain: Optional[NextCall] = None
+        self._traced_chain: Optional[NextCall] = None
+        self._stream_chain: Optional[NextStream] = None
+        self._sample_rate = 0.0
+        self._exporters: List[SpanExporter] = []
+        self.events = events if events is not None else get_bus()
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def _check_mutable(self):
+        if self._frozen:
+            raise RuntimeError("Pipeline is frozen; layers and provider can no longer be changed")
+
+    def _invalidate(self):
+        self._chain = None
+        self._traced_chain = None
+        self._stream_chain = None
 
     def add_layer(self, layer: Layer):
+        self._check_mutable()
         self._layers.append(layer)
+        self._invalidate()
 
     def set_provider(self, provider: BaseProvider):
+        self._check_mutable()
         self._provider = provider
+        self._invalidate()
 
-    async def run(self, ctx: EventContext) -> EventContext:
+    def set_tracing(self, sample_rate: float, exporter: Optional[SpanExporter] = None):
         """
-        Execute the pipeline.
-        Basic recursive/chain implementation.
+        Record per-layer spans for `sample_rate` (0..1) of the requests.
+        `exporter` is added to the span exporters when given.
+        """
+        self._sample_rate = sample_rate
+        if exporter is not None:
+            self._exporters.append(exporter)
+        self._invalidate()
+
+    def freeze(self):
+        """Compile the chain eagerly and reject further configuration changes."""
+        self.compile()
+        self._frozen = True
+
+    def compile(self):
+        """
+        Build the layer chain backwards into reusable callables.
+        The last middleware calls the provider, the second-to-last
+        calls the last, etc.
         """
         if not self._provider:
             raise ValueError("No provider set for the pipeline!")
 
-        # 1. Define the final step (calling the provider)
-        async def call_provider(c: EventContext) -> EventContext:
-            return await self._provider.generate(c)
+        next_call: NextCall = self._provider.generate
+        next_stream: NextStream = self._provider.stream
 
-        # 2. Build the chain backwards
-        # The last middleware calls 'call_provider'
-        # The second-to-last calls the last, etc.
-        next_call = call_provider
-        
         for layer in reversed(self._layers):
-            # Capture the current 'next_call' in a closure
+            # Capture the current layer and 'next' in a closure (once, not per request)
             def make_bound_next(current_layer, current_next):
                 async def bound_next(c: EventContext) -> EventContext:
                     return await current_layer.process(c, current_next)
                 return bound_next
-            
+
+            def make_bound_stream(current_layer, current_next):
+                def bound_stream(c: EventContext) -> AsyncIterator[str]:
+                    return current_layer.process_stream(c, current_next)
+                return bound_stream
+
             next_call = make_bound_next(layer, next_call)
+            next_stream = make_bound_stream(layer, next_stream)
+
+        self._chain = next_call
+        self._stream_chain = next_stream
+        self._traced_chain = self._compile_traced() if self._sample_rate > 0 else None
+
+    def _compile_traced(self) -> NextCall:
+        """Same chain as compile(), with every step wrapped in a Span."""
+        def make_traced(name: str, kind: str, depth: int, call):
+            async def traced(c: EventContext) -> EventContext:
+                spans = c.spans
+                # The parent is the latest span one level up (still open)
+                parent = None
+                for candidate in reversed(spans):
+                    if candidate.depth == depth - 1:
+                        parent = candidate
+                        break
+                span = Span(name, kind, depth, parent)
+                spans.append(span)
+                try:
+                    return await call(c)
+                except BaseException as e:
+                    span.error = repr(e)
+                    raise
+                finally:
+                    span.finish()
+            return traced
+
+        depth = len(self._layers)
+        next_call: NextCall = make_traced(type(self._provider).__name__, "provider", depth, self._provider.generate)
+
+        for layer in reversed(self._layers):
+            depth -= 1
+            def make_bound_next(current_layer, current_next):
+                async def bound_next(c: EventContext) -> EventContext:
+                    return await current_layer.process(c, current_next)
+                return bound_next
+
+            next_call = make_traced(type(layer).__name__, "layer", depth, make_bound_next(layer, next_call))
+
+        return next_call
+
+    async def startup(self, warmup: bool = True):
+        """Start the provider (opening/warming its connections) and every layer."""
+        if self._provider:
+            await self._provider.startup(warmup=warmup)
+        for layer in self._layers:
+            await layer.startup()
+
+    async def aclose(self):
+        """Release resources held by the layers, the provider and span exporters."""
+        for exporter in self._exporters:
+            exporter.close()
+        for layer in reversed(self._layers):
+            await layer.aclose()
+        if self._provider:
+            await self._provider.aclose()
+
+    async def run(self, ctx: EventContext) -> EventContext:
+        """
+        Execute the pipeline.
+        """
+        if self._chain is None:
+            self.compile()
+        chain = self._chain
+        if self._traced_chain is not None and random.random() < self._sample_rate:
+            chain = self._run_traced
+        if self.events.subscribers:
+            return await self._run_published(ctx, chain)
+        return await chain(ctx)
+
+    def _publish_end(self, ctx: EventContext, started: float, error: Optional[BaseException]):
+        metrics = ctx.metrics
+        now = time.monotonic()
+        self.events.publish(RequestEvent(
+            "end", ctx.model, now,
+            latency_ms=(now - started) * 1000,
+            time_to_first_token_ms=metrics.time_to_first_token_ms,
+            prompt_tokens=metrics.prompt_tokens,
+            completion_tokens=metrics.completion_tokens,
+            cost_usd=metrics.cost_usd,
+            cache_hit=bool(ctx.metadata.get("cache_hit")),
+            error=type(error).__name__ if error is not None else None,
+        ))
+
+    async def _run_published(self, ctx: EventContext, chain: NextCall) -> EventContext:
+        started = time.monotonic()
+        self.events.publish(RequestEvent("start", ctx.model, started))
+        try:
+            ctx = await chain(ctx)
+        except BaseException as e:
+            self._publish_end(ctx, started, e)
+            raise
+        self._publish_end(ctx, started, None)
+        return ctx
+
+    async def _run_traced(self, ctx: EventContext) -> EventContext:
+        ctx.spans = spans = []
+        try:
+            return await self._traced_chain(ctx)
+        finally:
+            for exporter in self._exporters:
+                exporter.export(ctx, spans)
+
+    def stream(self, ctx: EventContext) -> AsyncIterator[str]:
+        """
+        Execute the pipeline in streaming mode.
+        Returns an async iterator of response chunks. Each layer sees the
+        chunks through `process_stream`, and the provider finalizes
+        ctx.response_content and ctx.metrics once the stream is exhausted.
+        """
+        if self._stream_chain is None:
+            self.compile()
+
+        # Record time-to-first-token as the chunks leave the outermost layer
+        return self._timed(ctx, self._stream_chain(ctx))
 
-        # 3. Execute the first step of the chain
-        return await next_call(ctx)
+    async def _timed(self, ctx: EventContext, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        published = bool(self.events.subscribers)
+        if published:
+            started = time.monotonic()
+            self.events.publish(RequestEvent("start", ctx.model, started))
+        first = True
+        try:
+            async for chunk in chunks:
+                if first:
+                    ctx.metrics.time_to_first_token_ms = (time.time() - ctx.start_time) * 1000
+                    first = False
+                yield chunk
+        except BaseException as e:
+            if published:
+                self._publish_end(ctx, started, e)
+            raise
+        if published:
+            self._publish_end(ctx, started, None)
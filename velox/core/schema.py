@@ -0,0 +1,58 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+import time
+from velox.core.context import EventContext, Message, UsageMetrics
+
+# Pydantic mirrors of the hot-path state objects in velox.core.context.
+# Use them at the API boundary: validating untrusted input, JSON (de)serialization
+# and schema generation. The pipeline itself never builds these.
+
+class UsageMetricsModel(BaseModel):
+    total_tokens: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    latency_ms: float = 0.0
+    time_to_first_token_ms: float = 0.0
+    hedge_cost_usd: float = 0.0
+    cached_prompt_tokens: int = 0
+    cache_write_tokens: int = 0
+    cache_savings_usd: float = 0.0
+
+    def to_metrics(self) -> UsageMetrics:
+        return UsageMetrics(**self.model_dump())
+
+
+class MessageModel(BaseModel):
+    role: str
+    content: str
+    name: Optional[str] = None
+
+    def to_message(self) -> Message:
+        return Message(self.role, self.content, self.name)
+
+
+class EventContextModel(BaseModel):
+    messages: List[MessageModel]
+    model: str
+    temperature: float = 0.7
+    max_tokens: Optional[int] = None
+    session_id: str = Field(default_factory=lambda: str(time.time()))
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+    response_content: Optional[str] = None
+    metrics: UsageMetricsModel = Field(default_factory=UsageMetricsModel)
+    start_time: float = Field(default_factory=time.time)
+    spans: Optional[List[Dict[str, Any]]] = None
+
+    def to_context(self) -> EventContext:
+        return EventContext(
+            messages=[m.to_message() for m in self.messages],
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            session_id=self.session_id,
+            metadata=self.metadata,
+            response_content=self.response_content,
+            metrics=self.metrics.to_metrics(),
+            start_time=self.start_time
+        )
@@ -0,0 +1,22 @@
+from __future__ import annotations
+from typing import AsyncIterator
+from velox.core.context import EventContext
+
+class StreamResponse:
+    """
+    Async iterator over the response chunks of a streamed request.
+    The EventContext travelling through the pipeline is exposed as `ctx`;
+    its response_content and metrics are final once iteration completes.
+    """
+    def __init__(self, ctx: EventContext, chunks: AsyncIterator[str]):
+        self.ctx = ctx
+        self._chunks = chunks
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._chunks.__aiter__()
+
+    async def text(self) -> str:
+        """Drain the stream and return the full response content."""
+        async for _ in self._chunks:
+            pass
+        return self.ctx.response_content
@@ -0,0 +1,57 @@
+import re
+from typing import Dict, Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+
+# A run of word characters; shared by the similarity and routing features
+WORD = re.compile(r"\w+")
+
+
+class PrefixTable(Generic[T]):
+    """
+    Per-model settings keyed by model-name prefix ("gpt-4o", "claude"...).
+    `lookup(model)` returns the entry of the longest matching prefix, or
+    `default`; results are memoized per model name.
+    """
+    def __init__(self, table: Dict[str, T], default: T, max_cached: int = 4096):
+        self.table = table
+        self.default = default
+        self.max_cached = max_cached
+        self._cache: Dict[str, T] = {}
+
+    def lookup(self, model: str) -> T:
+        try:
+            return self._cache[model]
+        except KeyError:
+            pass
+        matches = [prefix for prefix in self.table if model.startswith(prefix)]
+        value = self.table[max(matches, key=len)] if matches else self.default
+        if len(self._cache) >= self.max_cached:
+            self._cache.clear()
+        self._cache[model] = value
+        return value
+
+
+def trie_regex(terms: Iterable[str]) -> str:
+    """
+    Compile literal terms into a prefix-trie regex ("foo|foobar" -> "foo(?:bar)?"),
+    so matching a large dictionary costs one scan instead of one per term.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
@@ -0,0 +1,129 @@
+import importlib.util
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from velox.core.text import PrefixTable
+
+if TYPE_CHECKING:
+    from velox.core.context import Message
+
+# tiktoken is optional and only imported once an exact count is needed
+_HAS_TIKTOKEN = importlib.util.find_spec("tiktoken") is not None
+
+
+class TokenFamily:
+    """
+    How one model family counts tokens: an optional exact tiktoken
+    encoding, the chars-per-token ratio of the heuristic fallback and the
+    per-message framing overhead of its chat format.
+    """
+    __slots__ = ("name", "encoding", "chars_per_token", "message_overhead", "reply_overhead")
+
+    def __init__(
+        self,
+        name: str,
+        encoding: Optional[str] = None,
+        chars_per_token: float = 4.0,
+        message_overhead: int = 4,
+        reply_overhead: int = 3
+    ):
+        self.name = name
+        self.encoding = encoding
+        self.chars_per_token = chars_per_token
+        self.message_overhead = message_overhead
+        self.reply_overhead = reply_overhead
+
+
+# Matched on the longest model-name prefix
+FAMILIES: Dict[str, TokenFamily] = {
+    "gpt-4o": TokenFamily("gpt-4o", "o200k_base"),
+    "o1": TokenFamily("gpt-4o", "o200k_base"),
+    "gpt-4": TokenFamily("gpt-4", "cl100k_base"),
+    "gpt-3.5": TokenFamily("gpt-4", "cl100k_base"),
+    "claude": TokenFamily("claude", chars_per_token=3.5, message_overhead=3, reply_overhead=0),
+    "gemini": TokenFamily("gemini", chars_per_token=4.0, message_overhead=2, reply_overhead=0),
+    "mistral": TokenFamily("mistral", chars_per_token=3.7, message_overhead=4, reply_overhead=0),
+    "llama": TokenFamily("llama", chars_per_token=3.8, message_overhead=5, reply_overhead=3),
+}
+DEFAULT_FAMILY = TokenFamily("default")
+
+
+class TokenCounter:
+    """
+    Local prompt token counting, cheap enough for every request.
+
+    Families with a tiktoken encoding are counted exactly when tiktoken is
+    installed (`pip install velox-core[tokens]`); everything else uses a
+    chars-per-token heuristic (UTF-8 bytes for non-ASCII text, so CJK and
+    emoji are not undercounted). Counts are memoized per (family, text),
+    so history re-sent every turn costs one dict lookup per message. The
+    memo is keyed by the text's hash, not the text, so it never keeps
+    prompts alive: at most `cache_size` small int pairs per family.
+    """
+    def __init__(
+        self,
+        families: Optional[Dict[str, TokenFamily]] = None,
+        exact: bool = True,
+        cache_size: int = 65_536
+    ):
+        self.families = FAMILIES if families is None else families
+        self.exact = exact and _HAS_TIKTOKEN
+        self.cache_size = cache_size
+        self._families = PrefixTable(self.families, DEFAULT_FAMILY)
+        self._encoders: Dict[str, object] = {}
+        self._counts: Dict[str, Dict[int, int]] = {}
+
+    def family(self, model: str) -> TokenFamily:
+        return self._families.lookup(model)
+
+    def _encoder(self, family: TokenFamily):
+        if not self.exact or family.encoding is None:
+            return None
+        encoder = self._encoders.get(family.encoding)
+        if encoder is None:
+            import tiktoken
+            encoder = self._encoders[family.encoding] = tiktoken.get_encoding(family.encoding)
+        return encoder
+
+    def _measure(self, text: str, family: TokenFamily) -> int:
+        encoder = self._encoder(family)
+        if encoder is not None:
+            return len(encoder.encode(text, disallowed_special=()))
+        size = len(text) if text.isascii() else len(text.encode("utf-8"))
+        return int(size / family.chars_per_token + 0.5)
+
+    def count_text(self, text: str, model: str = "default") -> int:
+        return self._count(text, self.family(model))
+
+    def _count(self, text: str, family: TokenFamily) -> int:
+        counts = self._counts.get(family.name)
+        if counts is None:
+            counts = self._counts[family.name] = {}
+        # str caches its hash, so this is free for the same Message object
+        # on every turn; a collision would only skew an estimate
+        key = hash(text)
+        count = counts.get(key)
+        if count is None:
+            count = self._measure(text, family)
+            if len(counts) >= self.cache_size:
+                # Cheap bounded memory: start over rather than track recency
+                counts.clear()
+            counts[key] = count
+        return count
+
+    def count_messages(self, messages: Sequence["Message"], model: str = "default") -> Tuple[int, List[int]]:
+        """(prompt total including chat framing, per-message content counts)."""
+        family = self.family(model)
+        per_message = [self._count(m.content, family) for m in messages]
+        total = sum(per_message) + family.message_overhead * len(messages) + family.reply_overhead
+        return total, per_message
+
+
+_counter = TokenCounter()
+
+def get_counter() -> TokenCounter:
+    """The process-wide default counter (shared memo)."""
+    return _counter
+
+def set_counter(counter: TokenCounter):
+    """Replace the process-wide default counter (e.g. with custom families)."""
+    global _counter
+    _counter = counter
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from velox.core.context import EventContext
+
+class Span:
+    """
+    Timing of one layer (or the provider call) for one request.
+    `downstream_ns` is the time spent in the rest of the chain, so
+    `self_ns` is what the layer itself cost.
+    """
+    __slots__ = ("name", "kind", "depth", "parent", "start_ns", "end_ns", "wall_start_ns", "downstream_ns", "error")
+
+    def __init__(self, name: str, kind: str, depth: int, parent: Optional["Span"]):
+        self.name = name
+        self.kind = kind
+        self.depth = depth
+        self.parent = parent
+        self.wall_start_ns = time.time_ns()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = 0
+        self.downstream_ns = 0
+        self.error: Optional[str] = None
+
+    def finish(self):
+        self.end_ns = time.perf_counter_ns()
+        if self.parent is not None:
+            self.parent.downstream_ns += self.duration_ns
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+    @property
+    def self_ns(self) -> int:
+        return self.duration_ns - self.downstream_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "depth": self.depth,
+            "duration_ms": self.duration_ns / 1e6,
+            "self_ms": self.self_ns / 1e6,
+            "downstream_ms": self.downstream_ns / 1e6,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, self={self.self_ns / 1e6:.3f}ms, total={self.duration_ns / 1e6:.3f}ms)"
+
+
+class SpanExporter(ABC):
+    """
+    Hook receiving the spans of every sampled request once it completes.
+    Exporters run on the request path: keep `export` cheap (buffer, don't block).
+    """
+
+    @abstractmethod
+    def export(self, ctx: "EventContext", spans: List[Span]):
+        pass
+
+    def close(self):
+        pass
+
+
+def to_otlp(ctx: "EventContext", spans: List[Span], service_name: str = "velox") -> Dict[str, Any]:
+    """
+    Encode a request's spans as an OTLP/JSON `ExportTraceServiceRequest`,
+    accepted by OpenTelemetry collectors (`otlpjsonfile` receiver, OTLP/HTTP).
+    """
+    trace_id = os.urandom(16).hex()
+    ids = {id(span): os.urandom(8).hex() for span in spans}
+    otlp_spans = []
+    for span in spans:
+        attributes = [
+            {"key": "velox.model", "value": {"stringValue": ctx.model}},
+            {"key": "velox.session_id", "value": {"stringValue": ctx.session_id}},
+            {"key": "velox.self_time_ms", "value": {"doubleValue": span.self_ns / 1e6}},
+        ]
+        entry = {
+            "traceId": trace_id,
+            "spanId": ids[id(span)],
+            "name": span.name,
+            # 3 = CLIENT for the outbound provider call, 1 = INTERNAL for layers
+            "kind": 3 if span.kind == "provider" else 1,
+            "startTimeUnixNano": str(span.wall_start_ns),
+            "endTimeUnixNano": str(span.wall_start_ns + span.duration_ns),
+            "attributes": attributes,
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent is not None:
+            entry["parentSpanId"] = ids[id(span.parent)]
+        otlp_spans.append(entry)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "velox"}, "spans": otlp_spans}],
+        }]
+    }
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Appends one JSON document per traced request to a local file.
+    `format="otlp"` writes OTLP/JSON lines (collector `otlpjsonfile`
+    receiver compatible); `format="simple"` writes a flat span list.
+    """
+    def __init__(self, path: str, format: str = "otlp", service_name: str = "velox"):
+        if format not in ("otlp", "simple"):
+            raise ValueError(f"Unknown trace format '{format}'")
+        self.path = path
+        self.format = format
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8", buffering=1 << 16)
+
+    def export(self, ctx: "EventContext", spans: List[Span]):
+        if self.format == "otlp":
+            record = to_otlp(ctx, spans, self.service_name)
+        else:
+            record = {
+                "session_id": ctx.session_id,
+                "model": ctx.model,
+                "spans": [span.to_dict() for span in spans],
+            }
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
@@ -1,25 +1,70 @@
+"""
+Layers are imported on first attribute access, so using CacheLayer does
+not import rich (dashboards, logging) or numpy (semantic cache).
+"""
+import importlib
+from typing import TYPE_CHECKING
+
 from .base import Layer
-from .logging import LoggerLayer
-from .caching import CacheLayer
-from .resilience import RetryLayer
-from .shadow import ShadowLayer
-from .dashboard import DashboardLayer
-from .advanced_dashboard import AdvancedDashboardLayer
-from .pii_guard import PIIGuardLayer
-from .cost_optimizer import CostOptimizerLayer
-from .semantic_router import SemanticRouterLayer
-from .auto_tooling import AutoToolingLayer
-
-__all__ = [
-    "Layer",
-    "LoggerLayer",
-    "CacheLayer",
-    "RetryLayer",
-    "ShadowLayer",
-    "DashboardLayer",
-    "AdvancedDashboardLayer",
-    "PIIGuardLayer",
-    "CostOptimizerLayer",
-    "SemanticRouterLayer",
-    "AutoToolingLayer",
-]
+
+if TYPE_CHECKING:
+    from .logging import LoggerLayer
+    from .caching import CacheLayer, CacheBackend, LRUCache
+    from .disk_cache import SQLiteCache
+    from .coalescing import CoalescingLayer
+    from .semantic_cache import SemanticCacheLayer
+    from .resilience import RetryLayer, RetryBudget, CircuitOpenError
+    from .rate_limit import RateLimitLayer
+    from .metrics import MetricsLayer
+    from .context_window import ContextWindowLayer
+    from .prompt_cache import PromptCacheLayer
+    from .shadow import ShadowLayer, ShadowResult
+    from .dashboard import DashboardLayer
+    from .advanced_dashboard import AdvancedDashboardLayer
+    from .pii_guard import PIIGuardLayer
+    from .cost_optimizer import CostOptimizerLayer, BudgetLedger
+    from velox.core.errors import BudgetExceededError
+    from .semantic_router import SemanticRouterLayer
+    from .auto_tooling import AutoToolingLayer
+
+_LAZY = {
+    "LoggerLayer": ".logging",
+    "CacheLayer": ".caching",
+    "CacheBackend": ".caching",
+    "LRUCache": ".caching",
+    "SQLiteCache": ".disk_cache",
+    "CoalescingLayer": ".coalescing",
+    "SemanticCacheLayer": ".semantic_cache",
+    "RetryLayer": ".resilience",
+    "RetryBudget": ".resilience",
+    "CircuitOpenError": ".resilience",
+    "RateLimitLayer": ".rate_limit",
+    "MetricsLayer": ".metrics",
+    "ContextWindowLayer": ".context_window",
+    "PromptCacheLayer": ".prompt_cache",
+    "ShadowLayer": ".shadow",
+    "ShadowResult": ".shadow",
+    "DashboardLayer": ".dashboard",
+    "AdvancedDashboardLayer": ".advanced_dashboard",
+    "PIIGuardLayer": ".pii_guard",
+    "CostOptimizerLayer": ".cost_optimizer",
+    "BudgetLedger": ".cost_optimizer",
+    "BudgetExceededError": ".cost_optimizer",
+    "SemanticRouterLayer": ".semantic_router",
+    "AutoToolingLayer": ".auto_tooling",
+}
+
+__all__ = ["Layer", *_LAZY]
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
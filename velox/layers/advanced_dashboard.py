@@ -1,82 +1,113 @@
-from velox.layers.base import Layer
-from velox.core.context import EventContext
-from rich.live import Live
-from rich.layout import Layout
-from rich.panel import Panel
-from rich.table import Table
-from rich.console import Console
+from velox.layers.dashboard import DashboardLayer
+from velox.core.events import EventBus
+try:
+    from rich.layout import Layout
+    from rich.panel import Panel
+    from rich.table import Table
+    from rich.console import Console
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError("AdvancedDashboardLayer requires rich. Install it with `pip install velox-core[rich]`.") from e
 from datetime import datetime
-import asyncio
+from typing import Any, Dict, Optional
 
-class AdvancedDashboardLayer(Layer):
+class AdvancedDashboardLayer(DashboardLayer):
     """
     The Pro 'Dark Mode' Dashboard.
-    Uses a full-screen layout to visualize the motor's state.
+    Uses a full-screen layout to visualize the motor's state: aggregate
+    metrics in the sidebar, the latest completed requests and the traffic
+    per model in the body. Same single background renderer as
+    DashboardLayer, so concurrent requests share one screen and no request
+    waits for the UI.
     """
-    def __init__(self):
-        self.console = Console()
-        self.history = []
+    def __init__(
+        self,
+        bus: Optional[EventBus] = None,
+        window: int = 60,
+        refresh_per_second: float = 4.0,
+        recent: int = 15,
+        console: Optional[Console] = None,
+        screen: bool = True
+    ):
+        super().__init__(bus, window, refresh_per_second, recent, console, screen)
 
     def make_layout(self) -> Layout:
         """Define the grid."""
         layout = Layout(name="root")
-        
+
         layout.split(
             Layout(name="header", size=3),
             Layout(name="main", ratio=1),
             Layout(name="footer", size=3)
         )
-        
+
         layout["main"].split_row(
             Layout(name="side", ratio=1),
-            Layout(name="body", ratio=3)
+            Layout(name="body", ratio=2)
         )
         return layout
 
-    def render_view(self, ctx: EventContext, status: str) -> Layout:
+    def requests_table(self) -> Table:
+        table = Table(expand=True, header_style="bold blue")
+        table.add_column("Model")
+        table.add_column("Latency", justify="right")
+        table.add_column("Tokens", justify="right")
+        table.add_column("Cost", justify="right")
+        table.add_column("Status")
+        for event in reversed(self.recent):
+            if event.error is not None:
+                status = f"[red]{event.error}[/red]"
+            elif event.cache_hit:
+                status = "[cyan]cache[/cyan]"
+            else:
+                status = "[green]ok[/green]"
+            table.add_row(
+                event.model,
+                f"{event.latency_ms:.1f}ms",
+                str(event.prompt_tokens + event.completion_tokens),
+                f"${event.cost_usd:.6f}",
+                status,
+            )
+        return table
+
+    def models_table(self) -> Table:
+        table = Table.grid(padding=(0, 2))
+        table.add_column(style="magenta")
+        table.add_column(justify="right")
+        for model, count in sorted(self.stats.models.items(), key=lambda item: -item[1])[:5]:
+            table.add_row(model, str(count))
+        return table
+
+    def render(self, snapshot: Dict[str, Any]) -> Layout:
         layout = self.make_layout()
-        
+        status = "PROCESSING" if snapshot["in_flight"] else "IDLE"
+
         # Header
         layout["header"].update(
-            Panel(f"[bold cyan]VELOX CORE ENGINE[/bold cyan] | Status: {status}", style="on black")
+            Panel(
+                f"[bold cyan]VELOX CORE ENGINE[/bold cyan] | Status: {status} | "
+                f"{snapshot['rps']:.1f} req/s | in flight: {snapshot['in_flight']}",
+                style="on black"
+            )
         )
-        
+
         # Sidebar (Metrics)
-        stats = Table.grid(padding=1)
-        stats.add_column(style="green", justify="right")
-        stats.add_column(style="magenta")
-        stats.add_row("Model", ctx.model)
-        stats.add_row("Tokens", str(ctx.metrics.total_tokens))
-        stats.add_row("Cost", f"${ctx.metrics.cost_usd:.6f}")
-        stats.add_row("Latency", f"{ctx.metrics.latency_ms:.1f}ms")
-        
         layout["side"].update(
-            Panel(stats, title="[Metrics]", border_style="green")
+            Panel(self.stats_table(snapshot), title="[Metrics]", border_style="green")
         )
 
-        # Body (The Response)
-        content = ctx.response_content or "[dim]Waiting for motor content...[/dim]"
-        layout["body"].update(
-            Panel(content, title=f"[Response: {ctx.model}]", border_style="blue")
+        # Body (Latest requests + traffic per model)
+        layout["body"].split(
+            Layout(Panel(self.requests_table(), title="[Latest Requests]", border_style="blue"), ratio=3),
+            Layout(Panel(self.models_table(), title="[Models]", border_style="magenta"), ratio=1)
         )
 
         # Footer
         layout["footer"].update(
-            Panel(f"[dim]Velox Session: {ctx.session_id} | {datetime.now().strftime('%H:%M:%S')}[/dim]", style="black")
+            Panel(
+                f"[dim]Window: {snapshot['window_s']}s | Uptime: {snapshot['uptime_s']:.0f}s | "
+                f"Dropped events: {snapshot['dropped_events']} | {datetime.now().strftime('%H:%M:%S')}[/dim]",
+                style="black"
+            )
         )
-        
-        return layout
 
-    async def process(self, ctx: EventContext, next_call) -> EventContext:
-        layout = self.make_layout()
-        
-        with Live(self.render_view(ctx, "IGNITION"), refresh_per_second=10, screen=True) as live:
-            live.update(self.render_view(ctx, "PROCESSING"))
-            
-            # Execute
-            ctx = await next_call(ctx)
-            
-            live.update(self.render_view(ctx, "COMPLETE"))
-            await asyncio.sleep(2.0) # Hold screen for a moment
-            
-        return ctx
+        return layout
@@ -1,7 +1,10 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Callable, Awaitable
+from typing import Callable, Awaitable, AsyncIterator
 from velox.core.context import EventContext
 
+_STREAM_END = object()
+
 class Layer(ABC):
     """
     Base class for all Velox Middleware.
@@ -26,3 +29,59 @@ class Layer(ABC):
             The modified (or finalized) EventContext.
         """
         pass
+
+    async def startup(self):
+        """Lifecycle hook called by Velox.startup(). No-op by default."""
+        pass
+
+    async def aclose(self):
+        """Lifecycle hook called by Velox.aclose(). No-op by default."""
+        pass
+
+    async def process_stream(
+        self,
+        ctx: EventContext,
+        next_stream: Callable[[EventContext], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        """
+        Process a streamed request, yielding response chunks.
+
+        The default implementation runs `process` around the downstream
+        stream, forwarding chunks as soon as they arrive, so every layer
+        works in streaming mode without changes. If `process` short-circuits
+        (e.g. a cache hit) the final response_content is yielded as a single
+        chunk. Override this to observe or transform individual chunks.
+
+        Args:
+            ctx: The current EventContext.
+            next_stream: The next layer in the pipeline (or the provider stream).
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def next_call(c: EventContext) -> EventContext:
+            async for chunk in next_stream(c):
+                queue.put_nowait(chunk)
+            return c
+
+        async def run() -> EventContext:
+            try:
+                return await self.process(ctx, next_call)
+            finally:
+                queue.put_nowait(_STREAM_END)
+
+        task = asyncio.create_task(run())
+        streamed = False
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is _STREAM_END:
+                    break
+                streamed = True
+                yield chunk
+            result = await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+        if not streamed and result.response_content:
+            yield result.response_content
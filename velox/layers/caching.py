@@ -1,29 +1,188 @@
-from typing import Dict
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 from velox.layers.base import Layer
 from velox.core.context import EventContext, UsageMetrics
 
+class CacheBackend(ABC):
+    """
+    Storage interface used by CacheLayer.
+    Keys are opaque hashes, values are response strings.
+    CacheLayer calls the async `aget`/`aset`; backends doing blocking I/O
+    override them to keep it off the event loop.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None on a miss or expired entry."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        """Store a value; `ttl` overrides the backend default (seconds)."""
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    @property
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        pass
+
+    async def aget(self, key: str) -> Optional[str]:
+        return self.get(key)
+
+    async def aset(self, key: str, value: str, ttl: Optional[float] = None):
+        self.set(key, value, ttl)
+
+    def close(self):
+        """Release files or connections held by the backend."""
+        pass
+
+    async def aclose(self):
+        self.close()
+
+
+class LRUCache(CacheBackend):
+    """
+    In-memory LRU store with per-entry TTL and a byte budget.
+    Entries are evicted least-recently-used first whenever either
+    `max_entries` or `max_bytes` would be exceeded; expired entries
+    are dropped lazily on access.
+    """
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (value, expires_at, size)
+        self._data: "OrderedDict[str, Tuple[str, Optional[float], int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        size = len(key) + len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        if key in self._data:
+            self._remove(key)
+
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at, size)
+        self._bytes += size
+
+        while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
 class CacheLayer(Layer):
     """
-    Middleware that caches responses based on the prompt content.
-    TODO: In the future, use Vector Similarity (Semantic Caching).
+    Middleware that caches responses based on the full request.
+    The key hashes the model, the generation parameters and the whole
+    message history, so different conversations never share an entry.
+    Storage is a bounded in-memory LRU with optional TTL (see LRUCache)
+    unless another CacheBackend, e.g. the shared on-disk SQLiteCache,
+    is passed as `backend`.
+    For similarity-based matching see SemanticCacheLayer.
     """
-    def __init__(self):
-        self._cache: Dict[str, str] = {}
-        self._cache_hits = 0
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        backend: Optional[CacheBackend] = None
+    ):
+        self._cache = backend or LRUCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+
+    @staticmethod
+    def make_key(ctx: EventContext) -> str:
+        payload = json.dumps(
+            [
+                ctx.model,
+                ctx.temperature,
+                ctx.max_tokens,
+                [[m.role, m.content, m.name] for m in ctx.messages],
+            ],
+            separators=(",", ":"),
+            ensure_ascii=False
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size of the cache."""
+        return self._cache.stats
+
+    async def aclose(self):
+        await self._cache.aclose()
 
     async def process(self, ctx: EventContext, next_call) -> EventContext:
-        # Simple exact match key for now
-        # Key = Model + Last User Message
-        user_msg = ctx.messages[-1].content
-        key = f"{ctx.model}:{user_msg}"
+        key = self.make_key(ctx)
 
-        if key in self._cache:
+        cached = await self._cache.aget(key)
+        if cached is not None:
             ctx.set_response(
-                content=self._cache[key],
+                content=cached,
                 usage=UsageMetrics() # Zero cost for cache hit
             )
             ctx.metadata["cache_hit"] = True
-            self._cache_hits += 1
             return ctx
 
         # No cache hit, proceed
@@ -31,7 +190,7 @@ class CacheLayer(Layer):
 
         # Cache the result
         if ctx.response_content:
-            self._cache[key] = ctx.response_content
+            await self._cache.aset(key, ctx.response_content)
         
         ctx.metadata["cache_hit"] = False
         return ctx
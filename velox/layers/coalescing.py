@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any, Callable, Awaitable, Dict
+from velox.core.context import EventContext, UsageMetrics
+from velox.layers.base import Layer
+from velox.layers.caching import CacheLayer
+
+class _Flight:
+    __slots__ = ("task", "waiters", "followers")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+        self.followers = 0
+
+
+class CoalescingLayer(Layer):
+    """
+    Middleware that collapses identical in-flight requests (single-flight).
+
+    The first request for a key (same model, parameters and messages as
+    CacheLayer) becomes the leader and calls the rest of the pipeline;
+    identical requests arriving while it is in flight await the leader's
+    result instead of calling the provider again. Errors are propagated to
+    every waiter. The shared call is only cancelled once every waiter,
+    leader included, has gone away.
+
+    Place it right after CacheLayer so bursts that miss the cache together
+    still cost a single provider call.
+    """
+    def __init__(self):
+        self._inflight: Dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
+
+    async def process(
+        self,
+        ctx: EventContext,
+        next_call: Callable[[EventContext], Awaitable[EventContext]]
+    ) -> EventContext:
+        key = CacheLayer.make_key(ctx)
+        flight = self._inflight.get(key)
+        leader = flight is None
+
+        if leader:
+            flight = _Flight(asyncio.create_task(next_call(ctx)))
+            self._inflight[key] = flight
+
+            def release(_, key=key, flight=flight):
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+
+            flight.task.add_done_callback(release)
+            self.leaders += 1
+        else:
+            flight.followers += 1
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # shield: one caller going away must not cancel the shared call
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+        if leader:
+            ctx.metadata["coalesced_followers"] = flight.followers
+            return result
+
+        # Followers get the leader's answer at no extra cost
+        ctx.set_response(content=result.response_content, usage=UsageMetrics())
+        ctx.metadata["coalesced"] = True
+        ctx.metadata["coalesced_with"] = result.session_id
+        return ctx
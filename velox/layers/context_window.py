@@ -0,0 +1,205 @@
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+from velox.core.context import EventContext, Message
+from velox.core.text import PrefixTable
+from velox.core.tokens import get_counter
+from velox.layers.base import Layer
+from velox.providers.base import BaseProvider
+
+# Context window in tokens, matched on the longest model-name prefix
+CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-4": 8_192,
+    "gpt-3.5": 16_385,
+    "o1": 128_000,
+    "claude": 200_000,
+    "gemini-1.5": 1_000_000,
+    "mistral-large": 128_000,
+    "llama3": 8_192,
+}
+DEFAULT_CONTEXT_WINDOW = 8_192
+
+Summarizer = Callable[[Optional[str], List[Message]], Awaitable[str]]
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation below in a few sentences, keeping names, facts, "
+    "decisions and open questions. Previous summary (may be empty):\n{previous}\n\n"
+    "Conversation:\n{transcript}"
+)
+
+
+def provider_summarizer(provider: BaseProvider, model: str = "default", max_tokens: int = 300) -> Summarizer:
+    """Summarizer that asks `provider` (ideally a cheap model) for a rolling summary."""
+    async def summarize(previous: Optional[str], messages: List[Message]) -> str:
+        transcript = "\n".join(f"{m.role}: {m.content}" for m in messages)
+        prompt = SUMMARY_PROMPT.format(previous=previous or "", transcript=transcript)
+        ctx = EventContext(messages=[Message("user", prompt)], model=model, temperature=0.0, max_tokens=max_tokens)
+        ctx = await provider.generate(ctx)
+        return ctx.response_content or ""
+    return summarize
+
+
+class ContextWindowLayer(Layer):
+    """
+    Middleware that trims the conversation to a per-model token budget.
+
+    System messages and the newest `min_recent` messages are always kept;
+    older turns are added back newest-first while they fit, the rest is
+    dropped. The budget is the model's context window minus the completion
+    reserve, capped by `max_prompt_tokens`.
+
+    With a `summarizer` (an async `(previous_summary, messages) -> str`, or
+    a provider via `provider_summarizer`), dropped turns are folded into a
+    rolling per-session summary inserted after the system messages. The
+    summary is refreshed by a background task, never on the request path:
+    a request uses the latest cached summary, if any.
+
+    The caller's message list is not modified. ctx.metadata receives
+    `context_tokens_saved` and `context_dropped_messages`.
+    """
+    def __init__(
+        self,
+        max_prompt_tokens: Optional[int] = None,
+        min_recent: int = 4,
+        windows: Optional[Dict[str, int]] = None,
+        default_completion_tokens: int = 1024,
+        summarizer: Optional[Union[Summarizer, BaseProvider]] = None,
+        max_sessions: int = 10_000
+    ):
+        self.max_prompt_tokens = max_prompt_tokens
+        self.min_recent = max(min_recent, 1)
+        self.windows = CONTEXT_WINDOWS if windows is None else windows
+        self.default_completion_tokens = default_completion_tokens
+        if isinstance(summarizer, BaseProvider):
+            summarizer = provider_summarizer(summarizer)
+        self.summarizer = summarizer
+        self.max_sessions = max_sessions
+        # session -> (number of dropped messages covered, fingerprint, summary)
+        self._summaries: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        self._pending: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._windows = PrefixTable(self.windows, DEFAULT_CONTEXT_WINDOW)
+        self.tokens_saved = 0
+
+    def budget(self, ctx: EventContext) -> int:
+        budget = self._windows.lookup(ctx.model) - (ctx.max_tokens or self.default_completion_tokens)
+        if self.max_prompt_tokens is not None:
+            budget = min(budget, self.max_prompt_tokens)
+        return budget
+
+    @staticmethod
+    def _fingerprint(messages: List[Message]) -> int:
+        return hash(tuple((m.role, m.content) for m in messages))
+
+    def _cached_summary(self, session_id: str, candidates: List[Message]) -> Optional[Tuple[int, str]]:
+        """(messages covered, summary) if the session's summary covers a prefix of candidates."""
+        entry = self._summaries.get(session_id)
+        if entry is None:
+            return None
+        covered, fingerprint, summary = entry
+        if covered > len(candidates) or self._fingerprint(candidates[:covered]) != fingerprint:
+            return None
+        self._summaries.move_to_end(session_id)
+        return covered, summary
+
+    def _schedule_summary(self, session_id: str, dropped: List[Message]):
+        if session_id in self._pending:
+            return
+        entry = self._summaries.get(session_id)
+        previous, start = None, 0
+        if entry is not None and entry[0] <= len(dropped) and self._fingerprint(dropped[:entry[0]]) == entry[1]:
+            if entry[0] == len(dropped):
+                return
+            previous, start = entry[2], entry[0]
+        self._pending.add(session_id)
+        task = asyncio.create_task(self._summarize(session_id, previous, list(dropped), start))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _summarize(self, session_id: str, previous: Optional[str], dropped: List[Message], start: int):
+        try:
+            summary = await self.summarizer(previous, dropped[start:])
+        except Exception:
+            # A failed summary only means the next request drops turns instead
+            return
+        finally:
+            self._pending.discard(session_id)
+        self._summaries[session_id] = (len(dropped), self._fingerprint(dropped), summary)
+        self._summaries.move_to_end(session_id)
+        while len(self._summaries) > self.max_sessions:
+            self._summaries.popitem(last=False)
+
+    def trim(self, ctx: EventContext) -> Tuple[List[Message], int, int]:
+        """(messages to send, tokens saved, messages dropped) for ctx."""
+        messages = ctx.messages
+        counter = get_counter()
+        family = counter.family(ctx.model)
+        total, counts = counter.count_messages(messages, ctx.model)
+        budget = self.budget(ctx)
+        if total <= budget:
+            return messages, 0, 0
+
+        overhead = family.message_overhead
+        system = [i for i, m in enumerate(messages) if m.role == "system"]
+        others = [i for i, m in enumerate(messages) if m.role != "system"]
+        used = family.reply_overhead + sum(counts[i] + overhead for i in system)
+
+        # Turns already folded into the cached summary are never re-sent verbatim
+        covered, summary_message = 0, None
+        if self.summarizer is not None and len(others) > self.min_recent:
+            cached = self._cached_summary(ctx.session_id, [messages[i] for i in others[:-self.min_recent]])
+            if cached is not None:
+                covered = cached[0]
+                summary_message = Message("system", f"Summary of the earlier conversation: {cached[1]}")
+                used += counter.count_text(summary_message.content, ctx.model) + overhead
+
+        kept: List[int] = []
+        for position in range(len(others) - 1, covered - 1, -1):
+            i = others[position]
+            cost = counts[i] + overhead
+            if len(kept) >= self.min_recent and used + cost > budget:
+                break
+            used += cost
+            kept.append(i)
+        kept.reverse()
+        # Never start the kept history with an orphaned assistant reply
+        while len(kept) > self.min_recent and messages[kept[0]].role == "assistant":
+            used -= counts[kept[0]] + overhead
+            kept.pop(0)
+
+        first_kept = kept[0] if kept else len(messages)
+        dropped = [messages[i] for i in others if i < first_kept]
+        if not dropped:
+            return messages, 0, 0
+        if self.summarizer is not None:
+            self._schedule_summary(ctx.session_id, dropped)
+
+        # Original order is preserved; the summary goes after the leading system messages
+        keep = sorted(system + kept)
+        result = [messages[i] for i in keep]
+        if summary_message is not None:
+            leading = 0
+            while leading < len(result) and result[leading].role == "system" and keep[leading] < first_kept:
+                leading += 1
+            result.insert(leading, summary_message)
+        return result, max(total - used, 0), len(dropped)
+
+    async def process(
+        self,
+        ctx: EventContext,
+        next_call: Callable[[EventContext], Awaitable[EventContext]]
+    ) -> EventContext:
+        messages, saved, dropped = self.trim(ctx)
+        if dropped:
+            ctx.messages = messages
+            self.tokens_saved += saved
+        ctx.metadata["context_tokens_saved"] = saved
+        ctx.metadata["context_dropped_messages"] = dropped
+        return await next_call(ctx)
+
+    async def aclose(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
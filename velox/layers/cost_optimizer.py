@@ -1,42 +1,295 @@
-from typing import Callable, Awaitable, Dict
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Awaitable, Dict, List, Optional, Sequence, Tuple
 from velox.core.context import EventContext
+from velox.core.errors import BudgetExceededError
+from velox.core.text import PrefixTable
 from velox.layers.base import Layer
 
+# USD per 1M (prompt, completion) tokens, matched on the longest model-name prefix
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (5.0, 15.0),
+    "gpt-4": (30.0, 60.0),
+    "gpt-3.5": (0.50, 1.50),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-3-haiku": (0.25, 1.25),
+    "claude-3-opus": (15.0, 75.0),
+    "gemini-1.5-flash": (0.35, 1.05),
+    "gemini-1.5-pro": (3.5, 10.5),
+    "mistral-large": (2.0, 6.0),
+    "llama3-70b": (0.59, 0.79),
+    "llama3-8b": (0.05, 0.08),
+}
+# Unknown models are priced conservatively so the pre-flight check errs on the safe side
+DEFAULT_PRICE = (5.0, 15.0)
+
+ScopeKey = Tuple[str, str]
+
+
+class _Account:
+    __slots__ = ("spent", "reserved", "touched")
+
+    def __init__(self, spent: float = 0.0, touched: float = 0.0):
+        self.spent = spent
+        self.reserved = 0.0
+        self.touched = touched
+
+
+class Reservation:
+    """Estimated spend held against one or more scopes until the call settles."""
+    __slots__ = ("ledger", "keys", "amount", "settled")
+
+    def __init__(self, ledger: "BudgetLedger", keys: List[ScopeKey], amount: float):
+        self.ledger = ledger
+        self.keys = keys
+        self.amount = amount
+        self.settled = False
+
+    def commit(self, actual: float):
+        """Replace the hold with the actual cost."""
+        if not self.settled:
+            self.settled = True
+            self.ledger._settle(self.keys, self.amount, actual)
+
+    def release(self):
+        """Drop the hold without charging (the call failed)."""
+        self.commit(0.0)
+
+
+class BudgetLedger:
+    """
+    Spend per (scope, key), e.g. ("session", "abc") or ("tenant", "acme").
+
+    `reserve` checks every scope and holds the estimate in one atomic step,
+    so concurrent requests of the same session cannot all pass the check
+    and overspend together; the hold is replaced by the actual cost on
+    commit. Accounts idle for `ttl` seconds are evicted. With `path`, the
+    committed spend is written there every `persist_interval` seconds
+    (off the event loop) and reloaded on start.
+    """
+    def __init__(
+        self,
+        ttl: Optional[float] = 86_400.0,
+        path: Optional[str] = None,
+        persist_interval: float = 30.0,
+        sweep_every: int = 1000
+    ):
+        self.ttl = ttl
+        self.path = path
+        self.persist_interval = persist_interval
+        self.sweep_every = sweep_every
+        self._accounts: Dict[ScopeKey, _Account] = {}
+        # Also guards against threads sharing one ledger across event loops
+        self._lock = threading.Lock()
+        self._ops = 0
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self.evictions = 0
+        self.rejections = 0
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def reserve(self, claims: Sequence[Tuple[str, str, float]], amount: float) -> Reservation:
+        """
+        Hold `amount` against every (scope, key, limit) claim, or raise
+        BudgetExceededError without holding anything.
+        """
+        now = time.time()
+        keys = []
+        with self._lock:
+            self._ops += 1
+            if self._ops % self.sweep_every == 0:
+                self._sweep(now)
+            accounts = []
+            for scope, key, limit in claims:
+                account = self._accounts.get((scope, key))
+                if account is None:
+                    account = self._accounts[(scope, key)] = _Account(touched=now)
+                committed = account.spent + account.reserved
+                if committed + amount > limit:
+                    self.rejections += 1
+                    raise BudgetExceededError(scope, key, limit, committed, amount)
+                accounts.append(account)
+                keys.append((scope, key))
+            for account in accounts:
+                account.reserved += amount
+                account.touched = now
+        return Reservation(self, keys, amount)
+
+    def _settle(self, keys: List[ScopeKey], reserved: float, actual: float):
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                account = self._accounts.get(key)
+                if account is None:
+                    account = self._accounts[key] = _Account()
+                account.reserved -= reserved
+                if account.reserved < 1e-12:
+                    # Float residue would otherwise keep the account from ever being evicted
+                    account.reserved = 0.0
+                account.spent += actual
+                account.touched = now
+            if actual:
+                self._dirty = True
+
+    def spent(self, scope: str, key: str) -> float:
+        account = self._accounts.get((scope, key))
+        return account.spent if account else 0.0
+
+    def reset(self, scope: str, key: str):
+        with self._lock:
+            if self._accounts.pop((scope, key), None) is not None:
+                self._dirty = True
+
+    def _sweep(self, now: float):
+        if self.ttl is None:
+            return
+        cutoff = now - self.ttl
+        stale = [k for k, a in self._accounts.items() if a.touched < cutoff and not a.reserved]
+        for key in stale:
+            del self._accounts[key]
+        self.evictions += len(stale)
+
+    def sweep(self):
+        """Evict accounts idle for longer than `ttl`."""
+        with self._lock:
+            self._sweep(time.time())
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        with self._lock:
+            data: Dict[str, Dict[str, Dict[str, float]]] = {}
+            for (scope, key), account in self._accounts.items():
+                if account.spent:
+                    data.setdefault(scope, {})[key] = {"spent": account.spent, "touched": account.touched}
+            self._dirty = False
+        return data
+
+    def save(self, path: Optional[str] = None):
+        """Atomically write the committed spend as JSON."""
+        path = path or self.path
+        data = self.snapshot()
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".velox-ledger-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def load(self, path: Optional[str] = None):
+        with open(path or self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            for scope, accounts in data.items():
+                for key, entry in accounts.items():
+                    self._accounts[(scope, key)] = _Account(entry["spent"], entry["touched"])
+            self._sweep(time.time())
+
+    def start(self):
+        """Start periodic persistence on the running loop (no-op without `path`)."""
+        if self.path and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._persist_loop())
+
+    async def _persist_loop(self):
+        while True:
+            await asyncio.sleep(self.persist_interval)
+            if self._dirty:
+                await asyncio.to_thread(self.save)
+
+    async def stop(self):
+        """Stop periodic persistence and write a final snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.path and self._dirty:
+            await asyncio.to_thread(self.save)
+
+
 class CostOptimizerLayer(Layer):
     """
     Middleware that tracks and limits AI spend.
-    It can enforce a per-session or per-request budget.
-    """
-    # Simple in-memory session tracking
-    _session_costs: Dict[str, float] = {}
 
-    def __init__(self, max_cost_usd: float = 0.5, per_request: bool = False):
+    Before the provider is called, the request's cost is estimated
+    (prompt tokens x prompt price + max_tokens x completion price) and
+    reserved in a BudgetLedger against the session budget (`max_cost_usd`)
+    and, when `tenant_budget_usd` is set, the budget of the tenant named by
+    ctx.metadata[`tenant_key`]. Requests that would exceed a budget raise
+    BudgetExceededError without reaching the provider; otherwise the
+    reservation is settled with the actual cost. With `per_request=True`
+    only the single request's estimate is checked against `max_cost_usd`.
+
+    Pass the same `ledger` to several layers (or pipelines) to share budgets.
+    """
+    def __init__(
+        self,
+        max_cost_usd: float = 0.5,
+        per_request: bool = False,
+        tenant_budget_usd: Optional[float] = None,
+        tenant_key: str = "tenant_id",
+        ledger: Optional[BudgetLedger] = None,
+        prices: Optional[Dict[str, Tuple[float, float]]] = None,
+        default_completion_tokens: int = 512,
+        ttl: Optional[float] = 86_400.0,
+        persist_path: Optional[str] = None,
+        persist_interval: float = 30.0
+    ):
         self.max_cost_usd = max_cost_usd
         self.per_request = per_request
+        self.tenant_budget_usd = tenant_budget_usd
+        self.tenant_key = tenant_key
+        self.ledger = ledger or BudgetLedger(ttl=ttl, path=persist_path, persist_interval=persist_interval)
+        self.prices = MODEL_PRICES if prices is None else prices
+        self.default_completion_tokens = default_completion_tokens
+        self._prices = PrefixTable(self.prices, DEFAULT_PRICE)
+
+    def price(self, model: str) -> Tuple[float, float]:
+        return self._prices.lookup(model)
+
+    def estimate_cost(self, ctx: EventContext) -> float:
+        prompt_price, completion_price = self.price(ctx.model)
+        completion_tokens = ctx.max_tokens or self.default_completion_tokens
+        return (ctx.token_count * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+    def claims(self, ctx: EventContext) -> List[Tuple[str, str, float]]:
+        claims = [("session", ctx.session_id, self.max_cost_usd)]
+        tenant = ctx.metadata.get(self.tenant_key)
+        if self.tenant_budget_usd is not None and tenant is not None:
+            claims.append(("tenant", str(tenant), self.tenant_budget_usd))
+        return claims
+
+    async def startup(self):
+        self.ledger.start()
+
+    async def aclose(self):
+        await self.ledger.stop()
 
     async def process(
-        self, 
-        ctx: EventContext, 
+        self,
+        ctx: EventContext,
         next_call: Callable[[EventContext], Awaitable[EventContext]]
     ) -> EventContext:
-        session_id = ctx.session_id
-        
-        # 1. Check current Spend
-        current_spend = self._session_costs.get(session_id, 0.0)
-        
-        if not self.per_request and current_spend >= self.max_cost_usd:
-            raise Exception(f"Budget exceeded for session {session_id}. Limit: ${self.max_cost_usd}")
-
-        # 2. Execute the chain
-        ctx = await next_call(ctx)
-        
-        # 3. Update Spend after response
-        new_cost = ctx.metrics.cost_usd
+        estimate = self.estimate_cost(ctx)
+        ctx.metadata["estimated_cost_usd"] = estimate
+
         if self.per_request:
-            if new_cost >= self.max_cost_usd:
-                 # This happens after the fact, but good for logging/metrics
-                 pass
-        else:
-            self._session_costs[session_id] = current_spend + new_cost
-            
+            if estimate > self.max_cost_usd:
+                raise BudgetExceededError("request", ctx.session_id, self.max_cost_usd, 0.0, estimate)
+            return await next_call(ctx)
+
+        # Persistence also starts without Velox.startup(); start() is idempotent
+        self.ledger.start()
+        reservation = self.ledger.reserve(self.claims(ctx), estimate)
+        try:
+            ctx = await next_call(ctx)
+        except BaseException:
+            reservation.release()
+            raise
+        reservation.commit(ctx.metrics.cost_usd)
         return ctx
@@ -1,43 +1,124 @@
 from velox.layers.base import Layer
 from velox.core.context import EventContext
-from rich.live import Live
-from rich.spinner import Spinner
-from rich.table import Table
-from rich.panel import Panel
-from rich.layout import Layout
-from rich.console import Console
+from velox.core.events import EventBus, RequestEvent, RollingStats, get_bus
+try:
+    from rich.live import Live
+    from rich.table import Table
+    from rich.console import Console, RenderableType
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError("DashboardLayer requires rich. Install it with `pip install velox-core[rich]`.") from e
+from collections import deque
+from typing import Any, Deque, Dict, Optional
 import asyncio
+import time
 
 class DashboardLayer(Layer):
     """
     Middleware that provides a "Pro" TUI experience.
-    Shows a spinner during generation and a stats table after.
+    Shows a live aggregate view of all requests going through the motor:
+    rolling throughput, latency percentiles, in-flight requests, cost and
+    cache hit ratio over the last `window` seconds.
+
+    The layer itself does no work per request. A single background task,
+    started on the first request (or by Velox.startup()), drains the
+    pipeline's event bus `refresh_per_second` times a second, aggregates
+    into RollingStats and hands the frame to rich off the event loop.
+    aclose() renders a final frame and stops the task.
     """
-    def __init__(self):
-        self.console = Console()
+    def __init__(
+        self,
+        bus: Optional[EventBus] = None,
+        window: int = 60,
+        refresh_per_second: float = 2.0,
+        recent: int = 10,
+        console: Optional[Console] = None,
+        screen: bool = False
+    ):
+        self.bus = bus or get_bus()
+        self.stats = RollingStats(window)
+        self.refresh_per_second = refresh_per_second
+        self.recent: Deque[RequestEvent] = deque(maxlen=recent)
+        self.console = console or Console()
+        self.screen = screen
+        self.started_at = time.monotonic()
+        # Subscribed right away so requests before the renderer starts are counted
+        self._subscription = self.bus.subscribe()
+        self._task: Optional[asyncio.Task] = None
+
+    def _start(self):
+        if self._subscription is None:
+            self._subscription = self.bus.subscribe()
+        self._task = asyncio.create_task(self._run())
+
+    async def startup(self):
+        if self._task is None:
+            self._start()
 
     async def process(self, ctx: EventContext, next_call) -> EventContext:
-        # Create a layout or simple renderable
-        spinner = Spinner("dots", text=f"Velox Engine Running... [Model: {ctx.model}]")
-        
-        # Use Live display to show spinner
-        with Live(spinner, refresh_per_second=10) as live:
-            # Execute pipeline
-            ctx = await next_call(ctx)
-            
-            # Update to done
-            live.update(Spinner("dots", text="Done!", style="green"))
-            await asyncio.sleep(0.5) # Brief pause to see green
-
-        # Print Final Stats Table
+        if self._task is None:
+            self._start()
+        return await next_call(ctx)
+
+    def process_stream(self, ctx: EventContext, next_stream):
+        # Pass-through: the pipeline publishes stream events itself
+        if self._task is None:
+            self._start()
+        return next_stream(ctx)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Consume pending events and return the current aggregate view."""
+        if self._subscription is not None:
+            events = self._subscription.drain()
+            self.stats.consume(events)
+            self.recent.extend(e for e in events if e.kind == "end")
+        snapshot = self.stats.snapshot()
+        snapshot["dropped_events"] = self._subscription.dropped if self._subscription is not None else 0
+        snapshot["uptime_s"] = time.monotonic() - self.started_at
+        return snapshot
+
+    def stats_table(self, snapshot: Dict[str, Any]) -> Table:
         table = Table(title="Velox Telemetry", show_header=True, header_style="bold magenta")
         table.add_column("Metric", style="dim")
-        table.add_column("Value")
-        
-        table.add_row("Latency", f"{ctx.metrics.latency_ms:.2f} ms")
-        table.add_row("Total Tokens", str(ctx.metrics.total_tokens))
-        table.add_row("Cost", f"${ctx.metrics.cost_usd:.6f}")
-        table.add_row("Provider", ctx.model)
-        
-        self.console.print(table)
-        return ctx
+        table.add_column(f"Last {snapshot['window_s']}s", justify="right")
+        table.add_column("Total", justify="right")
+
+        table.add_row("Throughput", f"{snapshot['rps']:.1f} req/s", str(snapshot["requests_total"]))
+        table.add_row("In flight", str(snapshot["in_flight"]), "")
+        table.add_row("Latency p50", f"{snapshot['p50_ms']:.1f} ms", "")
+        table.add_row("Latency p90", f"{snapshot['p90_ms']:.1f} ms", "")
+        table.add_row("Latency p99", f"{snapshot['p99_ms']:.1f} ms", "")
+        table.add_row("Tokens", f"{snapshot['tokens_per_s']:.0f} tok/s", str(snapshot["tokens_total"]))
+        table.add_row("Cost", f"${snapshot['cost_usd_window']:.6f}", f"${snapshot['cost_usd_total']:.6f}")
+        table.add_row("Cache hit ratio", f"{snapshot['cache_hit_ratio']:.1%}", str(snapshot["cache_hits_total"]))
+        table.add_row("Errors", f"{snapshot['error_rate']:.1%}", str(snapshot["errors_total"]))
+        return table
+
+    def render(self, snapshot: Dict[str, Any]) -> RenderableType:
+        return self.stats_table(snapshot)
+
+    async def _run(self):
+        interval = 1.0 / self.refresh_per_second
+        try:
+            with Live(self.render(self.snapshot()), console=self.console, auto_refresh=False, screen=self.screen) as live:
+                try:
+                    while True:
+                        await asyncio.sleep(interval)
+                        frame = self.render(self.snapshot())
+                        # Terminal I/O happens in a worker thread, never on the event loop
+                        await asyncio.to_thread(live.update, frame, refresh=True)
+                except asyncio.CancelledError:
+                    live.update(self.render(self.snapshot()), refresh=True)
+                    raise
+        finally:
+            if self.screen:
+                # The full-screen view is gone once Live exits; leave a summary behind
+                self.console.print(self.stats_table(self.snapshot()))
+
+    async def aclose(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._subscription is not None:
+            self.bus.unsubscribe(self._subscription)
+            self._subscription = None
@@ -0,0 +1,224 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from velox.layers.caching import CacheBackend
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS velox_cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    compressed INTEGER NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS velox_cache_expires ON velox_cache (expires_at);
+CREATE INDEX IF NOT EXISTS velox_cache_access ON velox_cache (last_access);
+"""
+
+class SQLiteCache(CacheBackend):
+    """
+    Persistent CacheBackend shared by every process on the host.
+
+    Entries live in a single SQLite database in WAL mode, so any number of
+    worker processes can read concurrently while one writes, and the cache
+    survives restarts. Values larger than `compress_min_bytes` are
+    zlib-compressed. Expired entries and the least recently used ones
+    beyond `max_entries` are removed by `compact()`, which also runs
+    automatically every `compact_every` writes.
+
+    `snapshot(path)` writes a consistent copy of the database; passing it
+    as `warm_start` to a fresh instance seeds an empty cache from it.
+
+    CacheLayer reaches the database through `aget`/`aset`, which run on a
+    dedicated worker thread, and closes it with `aclose`, so SQLite never
+    blocks the event loop. A writer lock held by another process is waited
+    on for at most `busy_timeout` seconds; a lookup that times out is a
+    miss and a write that times out is skipped (counted in `lock_timeouts`).
+    `stats` reports the size measured by the last compact().
+    """
+    def __init__(
+        self,
+        path: str = "velox_cache.db",
+        ttl: Optional[float] = None,
+        max_entries: int = 1_000_000,
+        compress_min_bytes: int = 512,
+        compact_every: int = 1000,
+        touch_interval: float = 60.0,
+        warm_start: Optional[str] = None,
+        busy_timeout: float = 0.1
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.compress_min_bytes = compress_min_bytes
+        self.compact_every = compact_every
+        # last_access is only rewritten when older than this, so hits stay read-only
+        self.touch_interval = touch_interval
+
+        if warm_start and not os.path.exists(path) and os.path.exists(warm_start):
+            self._restore(warm_start)
+
+        self._lock = threading.Lock()
+        # Setup may wait longer for the lock than requests do
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA busy_timeout={int(busy_timeout * 1000)}")
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="velox-sqlite")
+
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock_timeouts = 0
+        self._entries, self._bytes = self._size()
+
+    def _restore(self, snapshot: str):
+        source = sqlite3.connect(snapshot)
+        target = sqlite3.connect(self.path)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+
+    def _size(self):
+        return self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM velox_cache"
+        ).fetchone()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def aget(self, key: str) -> Optional[str]:
+        return await self._run(self.get, key)
+
+    async def aset(self, key: str, value: str, ttl: Optional[float] = None):
+        await self._run(self.set, key, value, ttl)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, compressed, expires_at, last_access FROM velox_cache WHERE key = ?",
+                    (key,)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                # Locked by another process beyond busy_timeout: a miss, not a stall
+                self.lock_timeouts += 1
+                row = None
+            if row is None or (row[2] is not None and row[2] <= now):
+                self.misses += 1
+                return None
+            if now - row[3] > self.touch_interval:
+                try:
+                    self._conn.execute("UPDATE velox_cache SET last_access = ? WHERE key = ?", (now, key))
+                except sqlite3.OperationalError:
+                    # LRU order is approximate anyway; keep the hit
+                    self.lock_timeouts += 1
+
+        self.hits += 1
+        value, compressed = row[0], row[1]
+        if compressed:
+            value = zlib.decompress(value)
+        return value.decode("utf-8")
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        data = value.encode("utf-8")
+        compressed = len(data) >= self.compress_min_bytes
+        if compressed:
+            data = zlib.compress(data, 6)
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO velox_cache (key, value, compressed, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, data, int(compressed), now + ttl if ttl is not None else None, now)
+                )
+            except sqlite3.OperationalError:
+                # The cache is best-effort: skip the write rather than wait
+                self.lock_timeouts += 1
+                return
+            self._writes += 1
+            due = self._writes % self.compact_every == 0
+
+        if due:
+            self.compact()
+
+    def compact(self) -> int:
+        """
+        Drop expired entries and trim to max_entries (LRU). Returns rows removed.
+        Blocking: called from set(), i.e. on the worker thread under CacheLayer.
+        """
+        with self._lock:
+            try:
+                removed = self._conn.execute(
+                    "DELETE FROM velox_cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                    (time.time(),)
+                ).rowcount
+                entries, size = self._size()
+                overflow = entries - self.max_entries
+                if overflow > 0:
+                    # Count what was deleted: another process may have pruned rows already
+                    evicted = self._conn.execute(
+                        "DELETE FROM velox_cache WHERE key IN "
+                        "(SELECT key FROM velox_cache ORDER BY last_access LIMIT ?)",
+                        (overflow,)
+                    ).rowcount
+                    removed += evicted
+                    self.evictions += evicted
+                    entries, size = self._size()
+                self._entries, self._bytes = entries, size
+                self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            except sqlite3.OperationalError:
+                # Another process holds the lock; the next compaction will catch up
+                self.lock_timeouts += 1
+                return 0
+        return removed
+
+    def snapshot(self, path: str):
+        """Write a consistent copy of the cache to `path` (online backup)."""
+        target = sqlite3.connect(path)
+        try:
+            with self._lock:
+                self._conn.backup(target)
+        finally:
+            target.close()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM velox_cache")
+            self._entries, self._bytes = 0, 0
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+    async def aclose(self):
+        # Waiting for queued writes to finish must not block the event loop
+        await asyncio.to_thread(self.close)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus entries/bytes as of the last compact() (no table scan)."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._entries,
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "lock_timeouts": self.lock_timeouts,
+        }
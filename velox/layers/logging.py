@@ -1,7 +1,10 @@
 from velox.layers.base import Layer
 from velox.core.context import EventContext
-from rich.console import Console
-from rich.panel import Panel
+try:
+    from rich.console import Console
+    from rich.panel import Panel
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError("LoggerLayer requires rich. Install it with `pip install velox-core[rich]`.") from e
 
 console = Console()
 
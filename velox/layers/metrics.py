@@ -0,0 +1,85 @@
+import time
+from typing import AsyncIterator, Callable, Optional
+
+from velox.core.context import EventContext
+from velox.core.metrics import MetricsRegistry, get_registry
+from velox.layers.base import Layer
+
+
+class MetricsLayer(Layer):
+    """
+    Records every request into a process-wide MetricsRegistry:
+    request counts and latency histograms per model/provider, token and
+    cost counters, cache hits, retries, errors and in-flight requests.
+    Add it first so it sees cache hits and retries of the inner layers.
+    Expose the registry with `registry.render()`, `registry.write(path)`
+    or `await registry.serve(port=9464)`.
+    """
+    def __init__(self, registry: Optional[MetricsRegistry] = None, provider: str = ""):
+        self.registry = registry = registry or get_registry()
+        self.provider = provider
+        labels = ("model", "provider")
+        self.requests = registry.counter("requests_total", "Completed requests", labels + ("status",))
+        self.latency = registry.histogram("request_latency_ms", "End-to-end request latency", labels)
+        self.ttft = registry.histogram("time_to_first_token_ms", "Time to first streamed token", labels)
+        self.tokens = registry.counter("tokens_total", "Tokens processed", labels + ("type",))
+        self.cost = registry.counter("cost_usd_total", "Accumulated cost in USD", labels)
+        self.cache_hits = registry.counter("cache_hits_total", "Requests answered from a cache", labels)
+        self.retries = registry.counter("retries_total", "Retried provider attempts", labels)
+        self.errors = registry.counter("errors_total", "Failed requests", labels + ("error",))
+        self.in_flight = registry.gauge("in_flight_requests", "Requests currently in the pipeline", ("model",))
+
+    def _record(self, ctx: EventContext, entry_model: str, started: float, error: Optional[BaseException]):
+        # The gauge is decremented under the labels it was incremented with:
+        # routing layers downstream may have changed ctx.model meanwhile
+        self.in_flight.dec(model=entry_model)
+        model = ctx.model
+        provider = ctx.metadata.get("provider") or self.provider
+        self.latency.observe((time.perf_counter() - started) * 1000, model=model, provider=provider)
+        retries = ctx.metadata.get("retries")
+        if retries:
+            self.retries.inc(retries, model=model, provider=provider)
+        if error is not None:
+            self.requests.inc(model=model, provider=provider, status="error")
+            self.errors.inc(model=model, provider=provider, error=type(error).__name__)
+            return
+
+        self.requests.inc(model=model, provider=provider, status="ok")
+        if ctx.metadata.get("cache_hit"):
+            self.cache_hits.inc(model=model, provider=provider)
+            return
+        metrics = ctx.metrics
+        if metrics.prompt_tokens:
+            self.tokens.inc(metrics.prompt_tokens, model=model, provider=provider, type="prompt")
+        if metrics.cached_prompt_tokens:
+            self.tokens.inc(metrics.cached_prompt_tokens, model=model, provider=provider, type="cached_prompt")
+        if metrics.completion_tokens:
+            self.tokens.inc(metrics.completion_tokens, model=model, provider=provider, type="completion")
+        if metrics.cost_usd:
+            self.cost.inc(metrics.cost_usd, model=model, provider=provider)
+        if metrics.time_to_first_token_ms:
+            self.ttft.observe(metrics.time_to_first_token_ms, model=model, provider=provider)
+
+    async def process(self, ctx: EventContext, next_call) -> EventContext:
+        entry_model = ctx.model
+        self.in_flight.inc(model=entry_model)
+        started = time.perf_counter()
+        try:
+            ctx = await next_call(ctx)
+        except BaseException as e:
+            self._record(ctx, entry_model, started, e)
+            raise
+        self._record(ctx, entry_model, started, None)
+        return ctx
+
+    async def process_stream(self, ctx: EventContext, next_stream: Callable) -> AsyncIterator[str]:
+        entry_model = ctx.model
+        self.in_flight.inc(model=entry_model)
+        started = time.perf_counter()
+        try:
+            async for chunk in next_stream(ctx):
+                yield chunk
+        except BaseException as e:
+            self._record(ctx, entry_model, started, e)
+            raise
+        self._record(ctx, entry_model, started, None)
@@ -1,34 +1,247 @@
+import hashlib
 import re
-from typing import Callable, Awaitable, List
-from velox.core.context import EventContext
+from collections import Counter, OrderedDict
+from typing import AsyncIterator, Callable, Awaitable, Dict, Iterable, List, Optional, Tuple, Union
+from velox.core.context import EventContext, Message
+from velox.core.text import trie_regex
 from velox.layers.base import Layer
 
+DEFAULT_PATTERNS = {
+    "email": r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+',
+    "phone": r'\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b',
+}
+
+
+class RedactionEngine:
+    """
+    PII redactor building each redacted text in a single pass.
+
+    Each kind keeps its own compiled regex (CPython's `re` scans a lone
+    pattern faster than an alternation of them), literal terms share one
+    trie regex, and the matches of all kinds are merged into one span list
+    so the output is built in a single pass. Results are memoized per text
+    (LRU bounded by `cache_size` entries and `cache_bytes` of redacted
+    text), which makes re-sending the same history turn after turn a
+    dictionary lookup. The memo is keyed by a blake2b digest and texts
+    without PII are stored as a bare marker, so original prompts are
+    never retained.
+    """
+    def __init__(
+        self,
+        patterns: Union[Dict[str, str], List[str], None] = None,
+        terms: Optional[Iterable[str]] = None,
+        replacement: str = "[REDACTED]",
+        ignore_case_terms: bool = True,
+        cache_size: int = 4096,
+        cache_bytes: int = 8 * 1024 * 1024
+    ):
+        if patterns is None:
+            patterns = DEFAULT_PATTERNS
+        elif not isinstance(patterns, dict):
+            patterns = {f"pattern_{i}": p for i, p in enumerate(patterns)}
+        self.patterns = dict(patterns)
+        self.regexes = [(kind, re.compile(pattern)) for kind, pattern in self.patterns.items()]
+        terms = sorted({t for t in (terms or ()) if t})
+        if terms:
+            flags = re.IGNORECASE if ignore_case_terms else 0
+            self.regexes.append(("term", re.compile(r"\b(?:" + trie_regex(terms) + r")\b", flags)))
+        self.replacement = replacement
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        # digest -> (redacted text or None when unchanged, counts)
+        self._cache: "OrderedDict[bytes, Tuple[Optional[str], Dict[str, int]]]" = OrderedDict()
+        self._cached_bytes = 0
+
+    def spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Non-overlapping (start, end, kind) matches in text order. Where
+        matches of different kinds overlap, the earliest (then longest,
+        then first-declared) wins.
+        """
+        found = []
+        for priority, (kind, regex) in enumerate(self.regexes):
+            for match in regex.finditer(text):
+                start, end = match.span()
+                if start != end:
+                    found.append((start, -end, priority, kind))
+        if len(self.regexes) > 1:
+            found.sort()
+        result = []
+        last = 0
+        for start, neg_end, _, kind in found:
+            if start >= last:
+                result.append((start, -neg_end, kind))
+                last = -neg_end
+        return result
+
+    def scan(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """Uncached redaction: (redacted text, {kind: count})."""
+        spans = self.spans(text)
+        if not spans:
+            return text, {}
+        counts: Dict[str, int] = {}
+        pieces: List[str] = []
+        last = 0
+        for start, end, kind in spans:
+            pieces.append(text[last:start])
+            pieces.append(self.replacement)
+            counts[kind] = counts.get(kind, 0) + 1
+            last = end
+        pieces.append(text[last:])
+        return "".join(pieces), counts
+
+    def redact(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """Memoized `scan`."""
+        if not self.cache_size:
+            return self.scan(text)
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            redacted, counts = cached
+            return (text if redacted is None else redacted), counts
+        result = self.scan(text)
+        redacted = result[0] if result[1] else None
+        size = len(redacted) if redacted is not None else 0
+        if size <= self.cache_bytes:
+            self._cache[key] = (redacted, result[1])
+            self._cached_bytes += size
+            while len(self._cache) > self.cache_size or self._cached_bytes > self.cache_bytes:
+                evicted, _ = self._cache.popitem(last=False)[1]
+                self._cached_bytes -= len(evicted) if evicted is not None else 0
+        return result
+
+    def stream(self, holdback: int = 64) -> "StreamRedactor":
+        return StreamRedactor(self, holdback)
+
+
+class StreamRedactor:
+    """
+    Incremental redaction of a chunked stream.
+
+    The last `holdback` characters (and any match reaching into them) are
+    held back until more text arrives, so PII split across chunk boundaries
+    is still caught. `holdback` must exceed the longest expected match.
+    """
+    def __init__(self, engine: RedactionEngine, holdback: int = 64):
+        self.engine = engine
+        self.holdback = holdback
+        self.counts: Counter = Counter()
+        self._buffer = ""
+
+    def _emit(self, final: bool) -> str:
+        text = self._buffer
+        cut = len(text) if final else max(len(text) - self.holdback, 0)
+        pieces: List[str] = []
+        last = 0
+        for start, end, kind in self.engine.spans(text):
+            if start >= cut:
+                break
+            if end > cut:
+                # Match reaches into the held-back tail: it may still grow.
+                cut = start
+                break
+            pieces.append(text[last:start])
+            pieces.append(self.engine.replacement)
+            self.counts[kind] += 1
+            last = end
+        pieces.append(text[last:cut])
+        self._buffer = text[cut:]
+        return "".join(pieces)
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk; returns the text that is now safe to emit (may be empty)."""
+        self._buffer += chunk
+        return self._emit(final=False)
+
+    def flush(self) -> str:
+        """Redact and return whatever is still buffered."""
+        return self._emit(final=True)
+
+
 class PIIGuardLayer(Layer):
     """
-    Middleware that redacts PII (Personally Identifiable Information) 
+    Middleware that redacts PII (Personally Identifiable Information)
     from outgoing messages before they reach the provider.
+
+    The caller's Message objects are never modified: redacted copies
+    replace them on the context. With `redact_response=True` the
+    provider's answer is redacted too, including streamed chunks.
+    Per-request counts are stored in ctx.metadata["pii_redactions"].
     """
-    def __init__(self, patterns: List[str] = None):
-        # Default patterns for emails and phone numbers
-        self.patterns = patterns or [
-            r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+',  # Email
-            r'\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b',  # Phone
-        ]
-        self.regex = [re.compile(p) for p in self.patterns]
+    def __init__(
+        self,
+        patterns: Union[Dict[str, str], List[str], None] = None,
+        terms: Optional[Iterable[str]] = None,
+        replacement: str = "[REDACTED]",
+        redact_response: bool = False,
+        holdback: int = 64,
+        cache_size: int = 4096,
+        cache_bytes: int = 8 * 1024 * 1024
+    ):
+        self.engine = RedactionEngine(patterns, terms, replacement, cache_size=cache_size, cache_bytes=cache_bytes)
+        self.patterns = list(self.engine.patterns.values())
+        self.redact_response = redact_response
+        self.holdback = holdback
+        self.counts: Counter = Counter()
 
     def _redact(self, text: str) -> str:
-        for r in self.regex:
-            text = r.sub("[REDACTED]", text)
-        return text
+        return self.engine.redact(text)[0]
+
+    def _redact_messages(self, ctx: EventContext) -> Counter:
+        counts: Counter = Counter()
+        messages = []
+        for msg in ctx.messages:
+            content, found = self.engine.redact(msg.content)
+            if found:
+                counts.update(found)
+                msg = Message(msg.role, content, msg.name)
+            messages.append(msg)
+        ctx.messages = messages
+        return counts
+
+    def _report(self, ctx: EventContext, counts: Counter):
+        self.counts.update(counts)
+        ctx.metadata["pii_redactions"] = dict(counts)
 
     async def process(
-        self, 
-        ctx: EventContext, 
+        self,
+        ctx: EventContext,
         next_call: Callable[[EventContext], Awaitable[EventContext]]
     ) -> EventContext:
-        # Redact messages
-        for msg in ctx.messages:
-            msg.content = self._redact(msg.content)
-        
-        # Pass to next layer
-        return await next_call(ctx)
+        counts = self._redact_messages(ctx)
+        try:
+            ctx = await next_call(ctx)
+            if self.redact_response and ctx.response_content:
+                ctx.response_content, found = self.engine.scan(ctx.response_content)
+                counts.update(found)
+        finally:
+            self._report(ctx, counts)
+        return ctx
+
+    async def process_stream(
+        self,
+        ctx: EventContext,
+        next_stream: Callable[[EventContext], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        counts = self._redact_messages(ctx)
+        if not self.redact_response:
+            self._report(ctx, counts)
+            async for chunk in next_stream(ctx):
+                yield chunk
+            return
+
+        redactor = self.engine.stream(self.holdback)
+        try:
+            async for chunk in next_stream(ctx):
+                safe = redactor.feed(chunk)
+                if safe:
+                    yield safe
+            tail = redactor.flush()
+            if tail:
+                yield tail
+        finally:
+            counts.update(redactor.counts)
+            self._report(ctx, counts)
+        if ctx.response_content:
+            ctx.response_content = self.engine.scan(ctx.response_content)[0]
@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from typing import Callable, Awaitable, List
+from velox.core.context import EventContext, Message
+from velox.core.tokens import get_counter
+from velox.layers.base import Layer
+
+# Providers accept at most this many explicit cache breakpoints (Anthropic: 4)
+MAX_BREAKPOINTS = 4
+
+# Roles of a conversation; anything else in the leading block (system
+# prompts, tool definitions...) is static configuration
+_CONVERSATION_ROLES = ("user", "assistant")
+
+
+class PromptCacheLayer(Layer):
+    """
+    Middleware that makes conversations friendly to provider prompt caching.
+
+    Provider caches match on exact prompt prefixes, so the layer:
+
+    1. within the leading block of non-conversational messages, puts the
+       system messages before the rest (e.g. tool definitions), keeping
+       their relative order, so the most stable part forms the prefix.
+       Messages after the first user/assistant turn are never moved;
+    2. hashes every message-boundary prefix and remembers recently seen
+       ones, detecting prefixes that recur across requests;
+    3. stores up to MAX_BREAKPOINTS marked Message objects in
+       ctx.metadata["prompt_cache_breakpoints"]: the end of the system
+       block, the longest recurring prefix and, with `cache_conversation`,
+       the end of the prompt so the next turn of the chat can reuse it.
+       Only prefixes of at least `min_tokens` are marked (providers
+       ignore shorter ones). Providers locate the markers by identity, so
+       a later layer that trims or rewrites ctx.messages can at worst drop
+       a marker, never move it onto another message.
+
+    Providers that support explicit markers (AnthropicProvider adds
+    `cache_control` blocks) read the breakpoints; OpenAI caches prefixes
+    automatically and benefits from the ordering. Cached and written token
+    counts and the resulting savings are reported in ctx.metrics.
+    """
+    def __init__(
+        self,
+        min_tokens: int = 1024,
+        cache_conversation: bool = True,
+        reorder: bool = True,
+        max_prefixes: int = 100_000
+    ):
+        self.min_tokens = min_tokens
+        self.cache_conversation = cache_conversation
+        self.reorder = reorder
+        self.max_prefixes = max_prefixes
+        # prefix hash -> times seen
+        self._seen: "OrderedDict[int, int]" = OrderedDict()
+        self.recurring_hits = 0
+
+    def _remember(self, key: int) -> int:
+        seen = self._seen.get(key, 0)
+        self._seen[key] = seen + 1
+        if seen:
+            self._seen.move_to_end(key)
+        elif len(self._seen) > self.max_prefixes:
+            self._seen.popitem(last=False)
+        return seen
+
+    def breakpoints(self, ctx: EventContext) -> List[int]:
+        """Indices in ctx.messages of the messages after which the prompt should be cached."""
+        messages = ctx.messages
+        counts = get_counter().count_messages(messages, ctx.model)[1]
+        breakpoints: List[int] = []
+        prefix_hash = hash(ctx.model)
+        tokens = 0
+        recurring = -1
+        # Last message of the leading system block (mid-conversation system
+        # messages are not a stable prefix)
+        system_end = -1
+        while system_end + 1 < len(messages) and messages[system_end + 1].role == "system":
+            system_end += 1
+        for i, message in enumerate(messages):
+            prefix_hash = hash((prefix_hash, message.role, message.content))
+            tokens += counts[i]
+            seen = self._remember(prefix_hash)
+            if tokens < self.min_tokens:
+                continue
+            if seen:
+                recurring = i
+            if i == system_end:
+                breakpoints.append(i)
+        if recurring >= 0:
+            self.recurring_hits += 1
+            breakpoints.append(recurring)
+        if self.cache_conversation and tokens >= self.min_tokens:
+            breakpoints.append(len(messages) - 1)
+        breakpoints = sorted(set(breakpoints))
+        # Keep the longest prefixes when over the provider limit
+        return breakpoints[-MAX_BREAKPOINTS:]
+
+    async def process(
+        self,
+        ctx: EventContext,
+        next_call: Callable[[EventContext], Awaitable[EventContext]]
+    ) -> EventContext:
+        if self.reorder:
+            ctx.messages = self._reorder_leading(ctx.messages)
+        breakpoints = self.breakpoints(ctx)
+        if breakpoints:
+            ctx.metadata["prompt_cache_breakpoints"] = [ctx.messages[i] for i in breakpoints]
+        return await next_call(ctx)
+
+    @staticmethod
+    def _reorder_leading(messages: List[Message]) -> List[Message]:
+        leading = 0
+        while leading < len(messages) and messages[leading].role not in _CONVERSATION_ROLES:
+            leading += 1
+        roles = [m.role == "system" for m in messages[:leading]]
+        # Only rebuild when a system message follows another static message
+        if roles == sorted(roles, reverse=True):
+            return messages
+        block = messages[:leading]
+        return [m for m in block if m.role == "system"] + \
+               [m for m in block if m.role != "system"] + messages[leading:]
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from typing import Callable, Awaitable, Dict, Optional, Tuple
+from velox.core.context import EventContext
+from velox.layers.base import Layer
+
+def _header_float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `per_minute / 60` per second.
+    The balance may go negative when a reservation is corrected upwards;
+    callers then wait until it is paid back.
+    """
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it already is)."""
+        missing = min(amount, self.capacity) - self.tokens
+        return max(missing, 0.0) / self.rate if self.rate else float("inf")
+
+    def set_limit(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = min(self.tokens, self.capacity)
+
+
+class RateLimiter:
+    """
+    Request and token buckets for one provider/model.
+    Waiters are served strictly first-in first-out: the lock is FIFO and
+    the head of the queue holds it while sleeping for its budget.
+    """
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float) -> float:
+        """Wait for one request slot and `tokens` tokens. Returns seconds waited."""
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = self.blocked_until - now
+                for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                    if bucket:
+                        bucket.refill(now)
+                        wait = max(wait, bucket.wait_time(amount))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self.requests:
+                self.requests.tokens -= 1
+            if self.tokens:
+                self.tokens.tokens -= tokens
+        return time.monotonic() - start
+
+    def settle(self, estimated: float, actual: float):
+        """Correct a token reservation once the real usage is known."""
+        if self.tokens and actual:
+            self.tokens.tokens += estimated - actual
+
+    def calibrate(self, headers: Dict[str, str]):
+        """
+        Adopt the limits and remaining budget reported by the provider
+        (x-ratelimit-* / anthropic-ratelimit-* headers, retry-after).
+        """
+        now = time.monotonic()
+        for key, value in headers.items():
+            number = _header_float(value)
+            if number is None:
+                continue
+            if key == "retry-after":
+                self.blocked_until = max(self.blocked_until, now + number)
+                continue
+            if "reset" in key or "input" in key or "output" in key:
+                continue
+
+            if "request" in key:
+                bucket, kind = self.requests, "requests"
+            elif "token" in key:
+                bucket, kind = self.tokens, "tokens"
+            else:
+                continue
+
+            if "remaining" in key:
+                if bucket:
+                    bucket.refill(now)
+                    bucket.tokens = min(bucket.tokens, number)
+            elif "limit" in key.replace("ratelimit", ""):
+                # A zero (or NaN) limit would stop the bucket refilling for good
+                if not number > 0:
+                    continue
+                if bucket:
+                    bucket.set_limit(number)
+                else:
+                    setattr(self, kind, TokenBucket(number))
+
+
+class RateLimitLayer(Layer):
+    """
+    Middleware that paces requests to stay within provider quotas
+    (requests-per-minute and tokens-per-minute) instead of hitting 429s.
+
+    Each model gets its own limiter (override per model with `limits`).
+    Tokens are reserved up front from an estimate (ctx.token_count plus
+    max_tokens) and corrected with the real usage afterwards. Limits
+    are recalibrated from the provider's rate-limit headers, and a 429's
+    Retry-After pauses the whole queue.
+    """
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        limits: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        default_completion_tokens: int = 256,
+        calibrate: bool = True
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.limits = limits or {}
+        self.default_completion_tokens = default_completion_tokens
+        self.calibrate = calibrate
+        self._limiters: Dict[str, RateLimiter] = {}
+
+    def limiter(self, model: str) -> RateLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            rpm, tpm = self.limits.get(model, (self.requests_per_minute, self.tokens_per_minute))
+            limiter = self._limiters[model] = RateLimiter(rpm, tpm)
+        return limiter
+
+    def estimate_tokens(self, ctx: EventContext) -> int:
+        return ctx.token_count + (ctx.max_tokens or self.default_completion_tokens)
+
+    async def process(
+        self,
+        ctx: EventContext,
+        next_call: Callable[[EventContext], Awaitable[EventContext]]
+    ) -> EventContext:
+        limiter = self.limiter(ctx.model)
+        estimate = self.estimate_tokens(ctx)
+
+        waited = await limiter.acquire(estimate)
+        ctx.metadata["rate_limit_wait_ms"] = waited * 1000
+
+        try:
+            ctx = await next_call(ctx)
+        except Exception as e:
+            # 429s carry the provider's view of our budget (httpx / openai errors)
+            response = getattr(e, "response", None)
+            if self.calibrate and response is not None and getattr(response, "status_code", None) == 429:
+                limiter.calibrate({k.lower(): v for k, v in response.headers.items()})
+            raise
+
+        limiter.settle(estimate, ctx.metrics.total_tokens)
+        if self.calibrate:
+            limiter.calibrate(ctx.metadata.get("rate_limit_headers", {}))
+        return ctx
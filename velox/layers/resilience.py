@@ -1,37 +1,236 @@
 import asyncio
-from typing import Callable, Awaitable, Type
+import random
+import time
+from typing import Callable, Awaitable, AsyncIterator, Dict, Optional, Tuple, Type
 from velox.layers.base import Layer
 from velox.core.context import EventContext
+from velox.core.errors import CircuitOpenError, is_retryable, retry_after
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures.
+    While open every call fails fast; after `recovery_timeout` seconds the
+    breaker goes half-open and lets `half_open_max_calls` trial calls
+    through. A trial success closes it, a trial failure re-opens it; a
+    trial that ends without a verdict (cancelled, abandoned) gives its
+    slot back with `release()`.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trials = 0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._trials = 0
+        if self._trials < self.half_open_max_calls:
+            self._trials += 1
+            return True
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def release(self):
+        """Return a half-open trial slot without judging the provider."""
+        if self.state == self.HALF_OPEN and self._trials > 0:
+            self._trials -= 1
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """
+    Caps retry amplification: every request deposits `ratio` tokens and
+    every retry spends one, so sustained retries stay below `ratio` of the
+    traffic. `min_retries` tokens are available up front for low traffic.
+    """
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, max_balance: float = 100.0):
+        self.ratio = ratio
+        self.max_balance = max_balance
+        self.balance = float(min_retries)
+
+    def deposit(self):
+        self.balance = min(self.max_balance, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
 
 class RetryLayer(Layer):
     """
     Middleware that automatically retries the request if the provider fails.
+
+    Only retryable errors are retried (see `is_retryable`), with
+    decorrelated-jitter backoff capped at `max_delay` and at least the
+    provider's Retry-After. A circuit breaker per provider+model fails fast
+    while a provider is down, and a shared RetryBudget keeps retries from
+    multiplying load during an incident. The provider is
+    ctx.metadata["provider"] when set upstream, else `provider`, so
+    pipelines sharing a model name through different providers keep
+    separate breakers.
     """
     def __init__(
         self, 
         max_retries: int = 3, 
         base_delay: float = 1.0, 
-        exceptions: Type[Exception] = Exception
+        exceptions: Type[Exception] = Exception,
+        max_delay: float = 30.0,
+        jitter: bool = True,
+        circuit_breaker: bool = True,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        retry_budget: Optional[RetryBudget] = None,
+        provider: str = ""
     ):
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.exceptions = exceptions
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.circuit_breaker = circuit_breaker
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.retry_budget = retry_budget or RetryBudget()
+        self.provider = provider
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    def breaker(self, ctx: EventContext) -> Optional[CircuitBreaker]:
+        if not self.circuit_breaker:
+            return None
+        key = (ctx.metadata.get("provider") or self.provider, ctx.model)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+        return breaker
+
+    def _delay(self, attempt: int, previous: float, exc: BaseException) -> float:
+        if self.jitter:
+            # Decorrelated jitter: spreads retries instead of lock-stepping them
+            delay = random.uniform(self.base_delay, max(previous, self.base_delay) * 3)
+        else:
+            # Exponential backoff
+            delay = self.base_delay * (2 ** (attempt - 1))
+        delay = min(delay, self.max_delay)
+        hinted = retry_after(exc)
+        if hinted is not None:
+            delay = max(delay, min(hinted, self.max_delay))
+        return delay
+
+    def _admit(self, ctx: EventContext, breaker: Optional[CircuitBreaker]):
+        if breaker and not breaker.allow():
+            ctx.metadata["circuit_open"] = True
+            provider = ctx.metadata.get("provider") or self.provider
+            where = f"provider '{provider}', model '{ctx.model}'" if provider else f"model '{ctx.model}'"
+            raise CircuitOpenError(f"Circuit open for {where}")
+
+    @staticmethod
+    def _settle(breaker: Optional[CircuitBreaker], exc: Optional[BaseException], responded: bool = False):
+        """
+        Report the outcome of one attempt to the breaker. Retryable errors
+        count as failures; a non-retryable error (e.g. a 400) still proves
+        the provider is up, so it counts as a success. Cancellation or an
+        abandoned stream only releases the trial slot, unless the provider
+        had already `responded`.
+        """
+        if breaker is None:
+            return
+        if exc is None or responded:
+            breaker.record_success()
+        elif not isinstance(exc, Exception):
+            breaker.release()
+        elif is_retryable(exc):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _should_retry(self, ctx: EventContext, exc: BaseException, attempt: int) -> bool:
+        if not isinstance(exc, self.exceptions) or not is_retryable(exc) or attempt > self.max_retries:
+            return False
+        if not self.retry_budget.withdraw():
+            ctx.metadata["retry_budget_exhausted"] = True
+            return False
+        return True
+
+    def _before_retry(self, ctx: EventContext, attempt: int, delay: float, exc: BaseException) -> float:
+        delay = self._delay(attempt, delay, exc)
+        # Log usage inside context metadata for debugging
+        ctx.metadata.setdefault("_logs", []).append(
+            f"Retry {attempt}/{self.max_retries} due to: {str(exc)}"
+        )
+        ctx.metadata["retries"] = attempt
+        return delay
 
     async def process(self, ctx: EventContext, next_call: Callable) -> EventContext:
+        breaker = self.breaker(ctx)
+        self.retry_budget.deposit()
         attempt = 0
+        delay = self.base_delay
         while True:
+            self._admit(ctx, breaker)
             try:
                 # Try to execute the rest of the pipeline
-                return await next_call(ctx)
-            except self.exceptions as e:
+                result = await next_call(ctx)
+            except BaseException as e:
+                # Every exit settles the attempt, so a half-open trial never leaks
+                self._settle(breaker, e)
                 attempt += 1
-                if attempt > self.max_retries:
-                    raise e
-                
-                # Exponential backoff
-                delay = self.base_delay * (2 ** (attempt - 1))
-                # Log usage inside context metadata for debugging
-                ctx.metadata.setdefault("_logs", []).append(
-                    f"Retry {attempt}/{self.max_retries} due to: {str(e)}"
-                )
+                if not self._should_retry(ctx, e, attempt):
+                    raise
+                delay = self._before_retry(ctx, attempt, delay, e)
                 await asyncio.sleep(delay)
+                continue
+
+            self._settle(breaker, None)
+            return result
+
+    async def process_stream(self, ctx: EventContext, next_stream: Callable) -> AsyncIterator[str]:
+        """
+        Streaming variant: a failure is only retried while nothing has been
+        yielded yet, otherwise the caller would receive duplicated chunks.
+        A consumer that stops early settles the attempt as well.
+        """
+        breaker = self.breaker(ctx)
+        self.retry_budget.deposit()
+        attempt = 0
+        delay = self.base_delay
+        while True:
+            self._admit(ctx, breaker)
+            streamed = False
+            try:
+                async for chunk in next_stream(ctx):
+                    streamed = True
+                    yield chunk
+            except BaseException as e:
+                # GeneratorExit (abandoned stream) and cancellation land here too
+                self._settle(breaker, e, responded=streamed and not isinstance(e, Exception))
+                attempt += 1
+                if streamed or not self._should_retry(ctx, e, attempt):
+                    raise
+                delay = self._before_retry(ctx, attempt, delay, e)
+                await asyncio.sleep(delay)
+                continue
+
+            self._settle(breaker, None)
+            return
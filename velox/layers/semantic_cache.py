@@ -0,0 +1,271 @@
+import hashlib
+import time
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Awaitable, Dict, List, Optional, Sequence, Tuple
+from velox.core.context import EventContext, UsageMetrics
+from velox.core.text import WORD
+from velox.layers.base import Layer
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+def _require_numpy(name: str):
+    if np is None:
+        raise ImportError(f"{name} requires numpy. Install it with `pip install velox-core[semantic]`.")
+
+
+class Embedder(ABC):
+    """
+    Turns texts into fixed-size vectors for the semantic cache.
+    Implement `embed` for local models; override `aembed` for remote
+    embedding APIs so the event loop is not blocked.
+    """
+    dim: int
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        """Return a (len(texts), dim) float32 matrix."""
+        pass
+
+    async def aembed(self, texts: Sequence[str]) -> "np.ndarray":
+        return self.embed(texts)
+
+
+class HashingEmbedder(Embedder):
+    """
+    Dependency-free embedder based on feature hashing.
+    Words and character n-grams are hashed into `dim` signed buckets and
+    the result is L2-normalized, so cosine similarity reflects lexical
+    overlap. Cheap enough to run on every request.
+    """
+    def __init__(self, dim: int = 512, ngram: int = 3):
+        _require_numpy("HashingEmbedder")
+        self.dim = dim
+        self.ngram = ngram
+
+    def _features(self, text: str) -> List[str]:
+        text = " ".join(text.lower().split())
+        words = WORD.findall(text)
+        padded = f" {text} "
+        n = self.ngram
+        grams = [padded[i:i + n] for i in range(max(len(padded) - n + 1, 0))]
+        return words + grams
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter(
+                (zlib.crc32(f.encode("utf-8")) for f in self._features(text)),
+                dtype=np.uint32
+            )
+            if hashes.size == 0:
+                continue
+            # Low bits pick the bucket, the top bit picks the sign
+            signs = np.where(hashes >> 31, 1.0, -1.0)
+            out[row] = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim)
+
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+class VectorIndex:
+    """
+    NumPy-backed store of unit vectors answering cosine top-k queries.
+
+    Rows live in one contiguous float32 matrix so a lookup is a single
+    matrix-vector product. Each row carries a scope id (only rows of the
+    same scope can match), an expiry and a last-used stamp for LRU eviction.
+    With `approximate=True`, large indexes first filter rows by a random
+    hyperplane signature (SimHash) and only score rows within `max_hamming`
+    bits of the query.
+    """
+    def __init__(
+        self,
+        dim: int,
+        max_entries: int = 10_000,
+        ttl: Optional[float] = None,
+        approximate: bool = False,
+        n_bits: int = 16,
+        max_hamming: int = 2,
+        approximate_min_entries: int = 4096,
+        seed: int = 0
+    ):
+        _require_numpy("VectorIndex")
+        self.dim = dim
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.approximate = approximate
+        self.max_hamming = max_hamming
+        self.approximate_min_entries = approximate_min_entries
+
+        capacity = min(max_entries, 1024)
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._scopes = np.zeros(capacity, dtype=np.int64)
+        self._expires = np.full(capacity, np.inf)
+        self._last_used = np.zeros(capacity)
+        self._codes = np.zeros(capacity, dtype=np.int64)
+        self._values: List[Optional[str]] = [None] * capacity
+        self._size = 0
+        self.evictions = 0
+
+        self._planes = np.random.default_rng(seed).standard_normal((n_bits, dim)).astype(np.float32)
+        self._bit_weights = (1 << np.arange(n_bits)).astype(np.int64)
+        self._popcount = np.array([bin(i).count("1") for i in range(1 << n_bits)], dtype=np.int8)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _signature(self, vector: "np.ndarray") -> int:
+        return int(((self._planes @ vector) > 0).astype(np.int64) @ self._bit_weights)
+
+    def _grow(self):
+        capacity = min(self.max_entries, len(self._scopes) * 2)
+        extra = capacity - len(self._scopes)
+        self._vectors = np.vstack([self._vectors, np.zeros((extra, self.dim), dtype=np.float32)])
+        self._scopes = np.concatenate([self._scopes, np.zeros(extra, dtype=np.int64)])
+        self._expires = np.concatenate([self._expires, np.full(extra, np.inf)])
+        self._last_used = np.concatenate([self._last_used, np.zeros(extra)])
+        self._codes = np.concatenate([self._codes, np.zeros(extra, dtype=np.int64)])
+        self._values.extend([None] * extra)
+
+    def search(
+        self,
+        vector: "np.ndarray",
+        scope: int,
+        k: int = 1,
+        threshold: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """Return up to k (value, similarity) pairs above threshold, best first."""
+        n = self._size
+        if n == 0:
+            return []
+
+        now = time.monotonic()
+        valid = (self._scopes[:n] == scope) & (self._expires[:n] > now)
+        if self.approximate and n >= self.approximate_min_entries:
+            distance = self._popcount[self._codes[:n] ^ self._signature(vector)]
+            valid &= distance <= self.max_hamming
+
+        rows = np.flatnonzero(valid)
+        if rows.size == 0:
+            return []
+
+        scores = self._vectors[rows] @ vector
+        keep = scores >= threshold
+        rows, scores = rows[keep], scores[keep]
+        if rows.size == 0:
+            return []
+
+        if rows.size > k:
+            top = np.argpartition(-scores, k)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores)
+        rows, scores = rows[order], scores[order]
+
+        self._last_used[rows] = now
+        return [(self._values[r], float(s)) for r, s in zip(rows, scores)]
+
+    def add(self, vector: "np.ndarray", scope: int, value: str, ttl: Optional[float] = None):
+        now = time.monotonic()
+        if self._size < len(self._scopes):
+            row = self._size
+            self._size += 1
+        elif self._size < self.max_entries:
+            self._grow()
+            row = self._size
+            self._size += 1
+        else:
+            # Full: reuse an expired row, else the least recently used one
+            rank = np.where(self._expires <= now, -np.inf, self._last_used)
+            row = int(np.argmin(rank))
+            self.evictions += 1
+
+        ttl = self.ttl if ttl is None else ttl
+        self._vectors[row] = vector
+        self._scopes[row] = scope
+        self._expires[row] = now + ttl if ttl is not None else np.inf
+        self._last_used[row] = now
+        self._codes[row] = self._signature(vector)
+        self._values[row] = value
+
+    def clear(self):
+        self._size = 0
+        self._values = [None] * len(self._values)
+
+
+class SemanticCacheLayer(Layer):
+    """
+    Middleware that answers near-duplicate prompts from cache.
+    The latest user message is embedded and compared (cosine similarity)
+    against previous prompts with the same model, parameters and earlier
+    history; the best match above `threshold` is returned without calling
+    the provider.
+    """
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        embedder: Optional[Embedder] = None,
+        max_entries: int = 10_000,
+        ttl: Optional[float] = None,
+        approximate: bool = False
+    ):
+        _require_numpy("SemanticCacheLayer")
+        self.threshold = threshold
+        self.embedder = embedder or HashingEmbedder()
+        self.index = VectorIndex(
+            self.embedder.dim,
+            max_entries=max_entries,
+            ttl=ttl,
+            approximate=approximate
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _scope(ctx: EventContext) -> int:
+        # Everything but the latest message must match exactly
+        head = "\x1e".join(f"{m.role}\x1f{m.content}" for m in ctx.messages[:-1])
+        raw = f"{ctx.model}\x1d{ctx.temperature}\x1d{ctx.max_tokens}\x1d{head}"
+        return int.from_bytes(hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.index),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.index.evictions,
+        }
+
+    async def process(
+        self,
+        ctx: EventContext,
+        next_call: Callable[[EventContext], Awaitable[EventContext]]
+    ) -> EventContext:
+        scope = self._scope(ctx)
+        vector = (await self.embedder.aembed([ctx.messages[-1].content]))[0]
+
+        matches = self.index.search(vector, scope, k=1, threshold=self.threshold)
+        if matches:
+            content, similarity = matches[0]
+            ctx.set_response(content=content, usage=UsageMetrics())
+            ctx.metadata["cache_hit"] = True
+            ctx.metadata["semantic_similarity"] = similarity
+            self.hits += 1
+            return ctx
+
+        self.misses += 1
+        ctx = await next_call(ctx)
+
+        if ctx.response_content:
+            self.index.add(vector, scope, ctx.response_content)
+
+        ctx.metadata["cache_hit"] = False
+        return ctx
@@ -1,39 +1,326 @@
+import json
+import math
 import re
-from typing import Callable, Awaitable
+import zlib
+from typing import Any, Callable, Awaitable, Dict, Iterable, List, Optional, Sequence, Tuple
 from velox.core.context import EventContext
+from velox.core.text import WORD, trie_regex
 from velox.layers.base import Layer
 
+Features = Dict[int, float]
+
+DEFAULT_KEYWORDS = {
+    "complex": ["explain", "analyze", "complex", "detailed", "step-by-step", "compare", "prove", "design", "evaluate"],
+    "code": ["code", "function", "bug", "stack trace", "refactor", "sql", "regex", "python", "javascript"],
+    "math": ["calculate", "equation", "integral", "derivative", "probability", "theorem"],
+}
+
+# The pre-learning heuristic: substring match, as the original router did
+PRIOR_KEYWORDS = ("explain", "analyze", "complex", "detailed", "step-by-step")
+
+
+class KeywordMatcher:
+    """
+    Counts keyword groups in one scan: every keyword of every group is
+    compiled into a single case-insensitive trie regex (a DFA-like prefix
+    automaton), so the cost does not grow with the number of keywords.
+    """
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self._group: Dict[str, str] = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                self._group[keyword.lower()] = group
+        pattern = trie_regex(sorted(self._group)) if self._group else r"(?!)"
+        self.regex = re.compile(r"\b(?:" + pattern + r")\b", re.IGNORECASE)
+
+    def match(self, text: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for found in self.regex.findall(text):
+            group = self._group[found.lower()]
+            counts[group] = counts.get(group, 0) + 1
+        return counts
+
+
+class FeatureHasher:
+    """
+    Sparse hashed features of a request: length and turn-count buckets,
+    keyword groups, structural hints (code fences, questions) and the
+    first `max_words` words. crc32 keeps indices stable across processes,
+    so trained weights can be saved and reloaded.
+    """
+    def __init__(self, dim: int = 4096, matcher: Optional[KeywordMatcher] = None, max_words: int = 128):
+        self.dim = dim
+        self.matcher = matcher or KeywordMatcher(DEFAULT_KEYWORDS)
+        self.max_words = max_words
+        self._index_cache: Dict[str, int] = {}
+
+    def index(self, name: str) -> int:
+        index = self._index_cache.get(name)
+        if index is None:
+            index = zlib.crc32(name.encode("utf-8")) % self.dim
+            if len(self._index_cache) < 100_000:
+                self._index_cache[name] = index
+        return index
+
+    def add(self, features: Features, name: str, value: float = 1.0):
+        index = self.index(name)
+        features[index] = features.get(index, 0.0) + value
+
+    def features(self, text: str, turns: int = 1) -> Features:
+        features: Features = {}
+        length = len(text)
+        self.add(features, f"len:{min(int(math.log2(length + 1)), 16)}")
+        self.add(features, f"turns:{min(turns, 8)}")
+        for group, count in self.matcher.match(text).items():
+            self.add(features, f"kw:{group}", min(count, 3))
+        if "```" in text:
+            self.add(features, "code_fence")
+        questions = text.count("?")
+        if questions:
+            self.add(features, "questions", min(questions, 3))
+        words = WORD.findall(text[:self.max_words * 12])[:self.max_words]
+        if words:
+            weight = 1.0 / math.sqrt(len(words))
+            for word in words:
+                self.add(features, "w:" + word.lower(), weight)
+        return features
+
+
+class LinearRouterModel:
+    """
+    One logistic model per tier estimating P(tier answers well | features).
+    Starts from a prior that mimics the old length/keyword heuristic and is
+    refined online (`update`) or in bulk (`fit`) from logged outcomes.
+    """
+    def __init__(self, tiers: int, dim: int, learning_rate: float = 0.1, l2: float = 1e-4):
+        self.tiers = tiers
+        self.dim = dim
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.weights: List[Dict[int, float]] = [{} for _ in range(tiers)]
+        self.bias: List[float] = [0.0] * tiers
+
+    def score(self, tier: int, features: Features) -> float:
+        weights = self.weights[tier]
+        z = self.bias[tier]
+        for index, value in features.items():
+            w = weights.get(index)
+            if w is not None:
+                z += w * value
+        return 1.0 / (1.0 + math.exp(-max(min(z, 30.0), -30.0)))
+
+    def update(self, tier: int, features: Features, quality: float):
+        """One SGD step of the logistic loss towards `quality` (0..1)."""
+        error = quality - self.score(tier, features)
+        step = self.learning_rate * error
+        weights = self.weights[tier]
+        for index, value in features.items():
+            w = weights.get(index, 0.0)
+            weights[index] = w + step * value - self.learning_rate * self.l2 * w
+        self.bias[tier] += step
+
+    def to_dict(self) -> dict:
+        return {
+            "tiers": self.tiers,
+            "dim": self.dim,
+            "bias": self.bias,
+            "weights": [{str(k): v for k, v in w.items()} for w in self.weights],
+        }
+
+    def load_dict(self, data: dict):
+        if data["tiers"] != self.tiers or data["dim"] != self.dim:
+            raise ValueError("Saved router model does not match the configured tiers/dim")
+        self.bias = list(data["bias"])
+        self.weights = [{int(k): v for k, v in w.items()} for w in data["weights"]]
+
+
+class _TierStats:
+    __slots__ = ("latency_ms", "cost_usd", "requests", "errors")
+
+    def __init__(self):
+        self.latency_ms = 0.0
+        self.cost_usd = 0.0
+        self.requests = 0
+        self.errors = 0
+
+
 class SemanticRouterLayer(Layer):
     """
-    Middleware that routes simple prompts to a cheaper/faster model
+    Middleware that routes each request to the cheapest adequate model tier
     to optimize latency and cost.
+
+    `tiers` lists models cheapest/fastest first; `None` stands for the
+    model the request asked for (the default top tier). The last user
+    message is turned into hashed features and a per-tier logistic model
+    estimates whether that tier will answer well; the request goes to the
+    tier with the lowest observed cost (plus `latency_weight` x latency)
+    among those whose estimate reaches `quality_target`, else to the top
+    tier.
+
+    The model starts from a prior that mimics the old heuristic: a last
+    user message of at most `threshold_chars` characters with none of
+    PRIOR_KEYWORDS as a substring goes to the cheapest tier, anything else
+    to the top tier. The two signals have their own feature indices past
+    the hashed range, so no hashed feature can collide with them. Train it
+    with `fit()` on logged outcomes or call `feedback(ctx, quality)` once a
+    response has been judged; provider errors on a lower tier are fed back
+    as failures automatically. Observed latency and cost per tier are
+    tracked as EWMAs and reported by `stats`.
     """
-    def __init__(self, simple_model: str = "gpt-3.5-turbo", threshold_chars: int = 50):
+    def __init__(
+        self,
+        simple_model: str = "gpt-3.5-turbo",
+        threshold_chars: int = 50,
+        tiers: Optional[Sequence[Optional[str]]] = None,
+        keywords: Optional[Dict[str, Iterable[str]]] = None,
+        quality_target: float = 0.7,
+        latency_weight: float = 0.0,
+        dim: int = 4096,
+        learning_rate: float = 0.1,
+        decay: float = 0.1,
+        model_path: Optional[str] = None
+    ):
         self.simple_model = simple_model
         self.threshold_chars = threshold_chars
+        self.tiers: List[Optional[str]] = list(tiers) if tiers else [simple_model, None]
+        self.quality_target = quality_target
+        self.latency_weight = latency_weight
+        self.decay = decay
+        self.hasher = FeatureHasher(dim, KeywordMatcher(keywords or DEFAULT_KEYWORDS))
+        # Hashed features use [0, dim); the prior signals sit right after them
+        self._prior_long = dim
+        self._prior_complex = dim + 1
+        self.model = LinearRouterModel(len(self.tiers), dim + 2, learning_rate)
+        self._tier_stats = [_TierStats() for _ in self.tiers]
+        self.model_path = model_path
+        self._set_prior()
+        if model_path:
+            try:
+                self.load(model_path)
+            except FileNotFoundError:
+                pass
+
+    def _set_prior(self):
+        # Lower tiers: adequate unless the prompt is over the threshold or has
+        # a complex keyword (reserved features below). The top tier is always adequate.
+        top = len(self.tiers) - 1
+        for tier in range(top):
+            weights = self.model.weights[tier]
+            self.model.bias[tier] = 2.0
+            weights[self._prior_long] = -4.0
+            weights[self._prior_complex] = -4.0
+        self.model.bias[top] = 6.0
 
-    def _is_simple(self, text: str) -> bool:
-        # Very basic check: short text, no complex punctuation, no "explain", etc.
+    def features(self, text: str, turns: int = 1) -> Features:
+        features = self.hasher.features(text, turns)
+        # Exact signals of the old heuristic, on which the prior is built
         if len(text) > self.threshold_chars:
-            return False
-            
-        complex_keywords = ["explain", "analyze", "complex", "detailed", "step-by-step"]
-        if any(kw in text.lower() for kw in complex_keywords):
-            return False
-            
-        return True
+            features[self._prior_long] = 1.0
+        lowered = text.lower()
+        if any(keyword in lowered for keyword in PRIOR_KEYWORDS):
+            features[self._prior_complex] = 1.0
+        return features
+
+    def featurize(self, ctx: EventContext) -> Features:
+        last_user_msg = next((m for m in reversed(ctx.messages) if m.role == "user"), None)
+        text = last_user_msg.content if last_user_msg else ""
+        return self.features(text, turns=len(ctx.messages))
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Requests, errors and EWMA latency/cost per tier ("requested" for None)."""
+        return {
+            model or "requested": {
+                "requests": stats.requests,
+                "errors": stats.errors,
+                "latency_ms": stats.latency_ms,
+                "cost_usd": stats.cost_usd,
+            }
+            for model, stats in zip(self.tiers, self._tier_stats)
+        }
+
+    def _expected_cost(self, tier: int) -> float:
+        stats = self._tier_stats[tier]
+        return stats.cost_usd + self.latency_weight * stats.latency_ms / 1000
+
+    def choose(self, features: Features) -> Tuple[int, List[float]]:
+        """(tier index, per-tier adequacy scores)."""
+        scores = [self.model.score(tier, features) for tier in range(len(self.tiers))]
+        adequate = [tier for tier, score in enumerate(scores) if score >= self.quality_target]
+        if not adequate:
+            return len(self.tiers) - 1, scores
+        # Tiers are cheapest-first; observed cost only reorders them once all are measured
+        if len(adequate) > 1 and all(self._tier_stats[tier].requests for tier in adequate):
+            return min(adequate, key=lambda tier: (self._expected_cost(tier), tier)), scores
+        return adequate[0], scores
+
+    def _observe(self, tier: int, ctx: EventContext, error: bool):
+        stats = self._tier_stats[tier]
+        stats.requests += 1
+        if error:
+            stats.errors += 1
+            return
+        if stats.requests == 1:
+            stats.latency_ms, stats.cost_usd = ctx.metrics.latency_ms, ctx.metrics.cost_usd
+            return
+        stats.latency_ms += self.decay * (ctx.metrics.latency_ms - stats.latency_ms)
+        stats.cost_usd += self.decay * (ctx.metrics.cost_usd - stats.cost_usd)
+
+    def feedback(self, ctx: EventContext, quality: float):
+        """
+        Report how well the routed tier answered (1.0 good .. 0.0 bad).
+        A poor answer from a lower tier also teaches the tiers below it.
+        """
+        tier = ctx.metadata.get("router_tier")
+        features = ctx.metadata.get("router_features")
+        if tier is None or features is None:
+            return
+        self.model.update(tier, features, quality)
+        if quality < self.quality_target:
+            for lower in range(tier):
+                self.model.update(lower, features, quality)
+
+    def fit(self, samples: Iterable[Tuple[str, int, float]], epochs: int = 5):
+        """Train on logged (prompt text, tier, quality) outcomes."""
+        data = [(self.features(text), tier, quality) for text, tier, quality in samples]
+        for _ in range(epochs):
+            for features, tier, quality in data:
+                self.model.update(tier, features, quality)
+
+    def save(self, path: Optional[str] = None):
+        with open(path or self.model_path, "w", encoding="utf-8") as f:
+            json.dump(self.model.to_dict(), f)
+
+    def load(self, path: Optional[str] = None):
+        with open(path or self.model_path, "r", encoding="utf-8") as f:
+            self.model.load_dict(json.load(f))
+
+    async def aclose(self):
+        if self.model_path:
+            self.save()
 
     async def process(
-        self, 
-        ctx: EventContext, 
+        self,
+        ctx: EventContext,
         next_call: Callable[[EventContext], Awaitable[EventContext]]
     ) -> EventContext:
-        # Get the latest user message
-        last_user_msg = next((m for m in reversed(ctx.messages) if m.role == "user"), None)
-        
-        if last_user_msg and self._is_simple(last_user_msg.content):
+        features = self.featurize(ctx)
+        tier, scores = self.choose(features)
+        model = self.tiers[tier]
+        ctx.metadata["router_tier"] = tier
+        ctx.metadata["router_scores"] = scores
+        ctx.metadata["router_features"] = features
+        if model is not None and model != ctx.model:
             ctx.metadata["original_model"] = ctx.model
-            ctx.model = self.simple_model
+            ctx.model = model
             ctx.metadata["routed_by"] = "SemanticRouter"
-            
-        return await next_call(ctx)
+
+        try:
+            ctx = await next_call(ctx)
+        except Exception:
+            self._observe(tier, ctx, error=True)
+            if tier < len(self.tiers) - 1:
+                self.model.update(tier, features, 0.0)
+            raise
+        self._observe(tier, ctx, error=False)
+        return ctx
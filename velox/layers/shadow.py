@@ -1,42 +1,191 @@
 import asyncio
-from typing import Callable
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
 from velox.layers.base import Layer
 from velox.providers.base import BaseProvider
 from velox.core.context import EventContext
-from rich.console import Console
+from velox.core.metrics import MetricsRegistry, get_registry
+from velox.core.text import WORD
+
+SIMILARITY_BUCKETS = (0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0)
+
+
+def similarity(a: Optional[str], b: Optional[str]) -> float:
+    """Jaccard similarity of the lower-cased word sets (cheap, order-insensitive)."""
+    words_a = set(WORD.findall((a or "").lower()))
+    words_b = set(WORD.findall((b or "").lower()))
+    if not words_a and not words_b:
+        return 1.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+class ShadowResult:
+    """Primary-vs-shadow comparison of one sampled request."""
+    __slots__ = (
+        "name", "primary_model", "shadow_model",
+        "primary_latency_ms", "shadow_latency_ms",
+        "primary_cost_usd", "shadow_cost_usd",
+        "similarity", "primary_error", "shadow_error",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"ShadowResult({', '.join(f'{k}={v!r}' for k, v in self.to_dict().items())})"
 
-console = Console()
 
 class ShadowLayer(Layer):
     """
-    Middleware that runs a 'Shadow Model' in parallel.
+    Middleware that runs a 'Shadow Model' in the background.
     The shadow result is computed but NOT returned to the user.
     Useful for testing new models or comparing cost/quality.
+
+    A `sample_rate` fraction of requests is shadowed on a forked context
+    (the caller's messages are never shared). Jobs go to a bounded queue
+    served by `workers` tasks; when the queue is full the job is shed
+    instead of piling up. Each comparison (latency, cost and response
+    similarity of primary vs shadow) is recorded in the metrics registry
+    under `shadow_*` and passed to `on_result`. aclose() stops accepting
+    jobs and drains the queue for up to `drain_timeout` seconds.
     """
-    def __init__(self, shadow_provider: BaseProvider, name: str = "Shadow"):
+    def __init__(
+        self,
+        shadow_provider: BaseProvider,
+        name: str = "Shadow",
+        sample_rate: float = 1.0,
+        shadow_model: str = "default",
+        max_queue: int = 100,
+        workers: int = 4,
+        drain_timeout: float = 10.0,
+        registry: Optional[MetricsRegistry] = None,
+        on_result: Optional[Callable[[ShadowResult], Any]] = None
+    ):
         self.shadow_provider = shadow_provider
         self.name = name
+        self.sample_rate = sample_rate
+        self.shadow_model = shadow_model
+        self.max_queue = max_queue
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+        self.on_result = on_result
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._closing = False
+
+        registry = registry or get_registry()
+        self._jobs = registry.counter("shadow_jobs_total", "Shadow jobs by outcome", ("shadow", "outcome"))
+        self._latency = registry.histogram("shadow_latency_ms", "Primary vs shadow latency", ("shadow", "role"))
+        self._cost = registry.counter("shadow_cost_usd_total", "Primary vs shadow cost", ("shadow", "role"))
+        self._similarity = registry.histogram(
+            "shadow_similarity", "Word overlap of primary and shadow responses", ("shadow",), SIMILARITY_BUCKETS
+        )
+        self._depth = registry.gauge("shadow_queue_depth", "Shadow jobs waiting", ("shadow",))
+
+    def _start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def startup(self):
+        await self.shadow_provider.startup()
+        if self._queue is None:
+            self._start()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Queued jobs and ok/error/shed counts of this shadow."""
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            **{outcome: self._jobs.get(shadow=self.name, outcome=outcome)
+               for outcome in ("ok", "error", "shed")},
+        }
 
     async def process(self, ctx: EventContext, next_call: Callable) -> EventContext:
-        # 1. Clone context for the shadow (deep copy needed ideally, but shallow ok for now)
-        # We need a fresh context so we don't mess up the main one's metrics
-        shadow_ctx = EventContext(
-            messages=ctx.messages,
-            model=f"{ctx.model}-shadow",
-            metadata=ctx.metadata.copy()
+        if self._closing or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            return await next_call(ctx)
+
+        # Forked before the primary call so later layers can't change what the shadow sees
+        shadow_ctx = ctx.fork(model=self.shadow_model, start_time=time.time())
+        try:
+            ctx = await next_call(ctx)
+        except Exception as e:
+            self._submit(ctx, shadow_ctx, e)
+            raise
+        self._submit(ctx, shadow_ctx, None)
+        return ctx
+
+    def _submit(self, ctx: EventContext, shadow_ctx: EventContext, primary_error: Optional[BaseException]):
+        if self._queue is None:
+            self._start()
+        primary = ShadowResult(
+            name=self.name,
+            primary_model=ctx.model,
+            shadow_model=shadow_ctx.model,
+            primary_latency_ms=ctx.metrics.latency_ms,
+            primary_cost_usd=ctx.metrics.cost_usd,
+            primary_error=type(primary_error).__name__ if primary_error else None,
         )
+        try:
+            self._queue.put_nowait((shadow_ctx, primary, ctx.response_content))
+        except asyncio.QueueFull:
+            self._jobs.inc(shadow=self.name, outcome="shed")
+            return
+        self._depth.set(self._queue.qsize(), shadow=self.name)
 
-        # 2. Define the background task
-        async def run_shadow():
+    async def _worker(self):
+        queue = self._queue
+        while True:
+            shadow_ctx, result, primary_content = await queue.get()
             try:
-                result = await self.shadow_provider.generate(shadow_ctx)
-                # Log shadow result
-                console.print(f"[dim i]>> Shadow ({self.name}) finished: {result.response_content} (Lat: {result.metrics.latency_ms:.1f}ms)[/dim i]")
-            except Exception as e:
-                console.print(f"[dim red]>> Shadow ({self.name}) failed: {e}[/dim red]")
+                await self._run(shadow_ctx, result, primary_content)
+            finally:
+                queue.task_done()
+                self._depth.set(queue.qsize(), shadow=self.name)
+
+    async def _run(self, shadow_ctx: EventContext, result: ShadowResult, primary_content: Optional[str]):
+        started = time.perf_counter()
+        try:
+            shadow_ctx = await self.shadow_provider.generate(shadow_ctx)
+        except Exception as e:
+            result.shadow_error = type(e).__name__
+        result.shadow_latency_ms = (time.perf_counter() - started) * 1000
+        result.shadow_cost_usd = shadow_ctx.metrics.cost_usd
 
-        # 3. Fire and Forget
-        asyncio.create_task(run_shadow())
+        name = self.name
+        self._jobs.inc(shadow=name, outcome="error" if result.shadow_error else "ok")
+        self._latency.observe(result.shadow_latency_ms, shadow=name, role="shadow")
+        self._cost.inc(result.shadow_cost_usd, shadow=name, role="shadow")
+        if result.primary_error is None:
+            self._latency.observe(result.primary_latency_ms, shadow=name, role="primary")
+            self._cost.inc(result.primary_cost_usd, shadow=name, role="primary")
+            if result.shadow_error is None:
+                result.similarity = similarity(primary_content, shadow_ctx.response_content)
+                self._similarity.observe(result.similarity, shadow=name)
 
-        # 4. Continue main pipeline
-        return await next_call(ctx)
+        if self.on_result is not None:
+            try:
+                outcome = self.on_result(result)
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+            except Exception:
+                # A broken reporting hook must not kill the worker
+                pass
+
+    async def aclose(self):
+        self._closing = True
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+            except asyncio.TimeoutError:
+                pass
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+            self._queue = None
+        await self.shadow_provider.aclose()
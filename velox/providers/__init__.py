@@ -1,17 +1,44 @@
+"""
+Providers are imported on first attribute access, so `from velox.providers
+import GroqProvider` does not pay for (or require) the OpenAI and Google SDKs.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
 from .base import BaseProvider
-from .mock import MockProvider
-from .openai import OpenAIProvider
-from .anthropic import AnthropicProvider
-from .google import GoogleGeminiProvider
-from .mistral import MistralProvider
-from .groq import GroqProvider
-
-__all__ = [
-    "BaseProvider", 
-    "MockProvider", 
-    "OpenAIProvider", 
-    "AnthropicProvider", 
-    "GoogleGeminiProvider", 
-    "MistralProvider", 
-    "GroqProvider"
-]
+
+if TYPE_CHECKING:
+    from .mock import MockProvider
+    from .openai import OpenAIProvider
+    from .anthropic import AnthropicProvider
+    from .google import GoogleGeminiProvider
+    from .mistral import MistralProvider
+    from .groq import GroqProvider
+    from .pool import ProviderPool
+    from .hedging import HedgedProvider
+
+_LAZY = {
+    "MockProvider": ".mock",
+    "OpenAIProvider": ".openai",
+    "AnthropicProvider": ".anthropic",
+    "GoogleGeminiProvider": ".google",
+    "MistralProvider": ".mistral",
+    "GroqProvider": ".groq",
+    "ProviderPool": ".pool",
+    "HedgedProvider": ".hedging",
+}
+
+__all__ = ["BaseProvider", *_LAZY]
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
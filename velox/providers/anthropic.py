@@ -1,58 +1,116 @@
 import os
-import httpx
-from typing import Optional
-from velox.providers.base import BaseProvider
+from typing import AsyncIterator, Optional
+from velox.providers.base import iter_sse_json, rate_limit_headers
+from velox.providers.http import HTTPProvider
 from velox.core.context import EventContext, UsageMetrics
 
-class AnthropicProvider(BaseProvider):
+_EPHEMERAL = {"type": "ephemeral"}
+
+class AnthropicProvider(HTTPProvider):
     """
     Anthropic (Claude) LLM Integration using httpx.
     """
-    def __init__(self, api_key: str = None, model: str = "claude-3-5-sonnet-20240620"):
+    def __init__(self, api_key: str = None, model: str = "claude-3-5-sonnet-20240620", **client_options):
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("Anthropic API Key must be provided or set in ANTHROPIC_API_KEY env")
         
+        super().__init__(**client_options)
         self.default_model = model
         self.base_url = "https://api.anthropic.com/v1/messages"
 
-    async def generate(self, ctx: EventContext) -> EventContext:
-        model = ctx.model if ctx.model != "default" else self.default_model
-        
-        headers = {
+    def _headers(self) -> dict:
+        return {
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01",
             "content-type": "application/json"
         }
-        
-        data = {
+
+    def _payload(self, ctx: EventContext) -> dict:
+        model = ctx.model if ctx.model != "default" else self.default_model
+        # System messages go to the top-level `system` field; prompt cache
+        # breakpoints (Message objects marked by PromptCacheLayer, matched by
+        # identity) become `cache_control` blocks
+        marked = {id(m) for m in ctx.metadata.get("prompt_cache_breakpoints", ())}
+        system = []
+        messages = []
+        for m in ctx.messages:
+            if m.role == "system":
+                block = {"type": "text", "text": m.content}
+                if id(m) in marked:
+                    block["cache_control"] = _EPHEMERAL
+                system.append(block)
+            elif id(m) in marked:
+                messages.append({"role": m.role, "content": [
+                    {"type": "text", "text": m.content, "cache_control": _EPHEMERAL}
+                ]})
+            else:
+                messages.append({"role": m.role, "content": m.content})
+        payload = {
             "model": model,
-            "messages": [{"role": m.role, "content": m.content} for m in ctx.messages],
+            "messages": messages,
             "max_tokens": ctx.max_tokens or 1024,
             "temperature": ctx.temperature
         }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.base_url, headers=headers, json=data, timeout=60.0)
-            response.raise_for_status()
-            res_json = response.json()
+        if system:
+            payload["system"] = system
+        return payload
+
+    def _usage(self, usage: dict, completion_tokens: Optional[int] = None) -> UsageMetrics:
+        # Approximate cost for Claude 3.5 Sonnet; cache reads bill at 10%, writes at 125%
+        input_price, output_price = 3.0 / 1_000_000, 15.0 / 1_000_000
+        uncached = usage.get("input_tokens", 0)
+        cached = usage.get("cache_read_input_tokens") or 0
+        written = usage.get("cache_creation_input_tokens") or 0
+        if completion_tokens is None:
+            completion_tokens = usage.get("output_tokens", 0)
+        prompt_tokens = uncached + cached + written
+        cost = (uncached + cached * 0.1 + written * 1.25) * input_price + completion_tokens * output_price
+        return UsageMetrics(
+            total_tokens=prompt_tokens + completion_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=cost,
+            cached_prompt_tokens=cached,
+            cache_write_tokens=written,
+            cache_savings_usd=(cached * 0.9 - written * 0.25) * input_price
+        )
+
+    async def generate(self, ctx: EventContext) -> EventContext:
+        response = await self.client.post(self.base_url, headers=self._headers(), json=self._payload(ctx))
+        ctx.metadata["rate_limit_headers"] = rate_limit_headers(response.headers)
+        response.raise_for_status()
+        res_json = response.json()
             
         content = res_json["content"][0]["text"]
-        usage = res_json.get("usage", {})
-        
-        # Approximate cost for Claude 3.5 Sonnet
-        prompt_tokens = usage.get("input_tokens", 0)
-        completion_tokens = usage.get("output_tokens", 0)
-        cost = (prompt_tokens * 3.0 / 1_000_000) + (completion_tokens * 15.0 / 1_000_000)
-
-        ctx.set_response(
-            content=content,
-            usage=UsageMetrics(
-                total_tokens=prompt_tokens + completion_tokens,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                cost_usd=cost
-            )
-        )
+
+        ctx.set_response(content=content, usage=self._usage(res_json.get("usage", {})))
         
         return ctx
+
+    async def stream(self, ctx: EventContext) -> AsyncIterator[str]:
+        data = self._payload(ctx)
+        data["stream"] = True
+
+        parts = []
+        prompt_usage = {}
+        completion_tokens = 0
+
+        async with self.client.stream("POST", self.base_url, headers=self._headers(), json=data) as response:
+            ctx.metadata["rate_limit_headers"] = rate_limit_headers(response.headers)
+            response.raise_for_status()
+            async for event in iter_sse_json(response):
+                kind = event.get("type")
+                if kind == "message_start":
+                    prompt_usage = event["message"].get("usage", {})
+                elif kind == "content_block_delta":
+                    text = event["delta"].get("text")
+                    if text:
+                        parts.append(text)
+                        yield text
+                elif kind == "message_delta":
+                    completion_tokens = event.get("usage", {}).get("output_tokens", completion_tokens)
+                elif kind == "message_stop":
+                    break
+
+        ctx.set_response(content="".join(parts), usage=self._usage(prompt_usage, completion_tokens))
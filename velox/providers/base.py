@@ -1,4 +1,6 @@
+import json
 from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict
 from velox.core.context import EventContext
 
 class BaseProvider(ABC):
@@ -14,3 +16,56 @@ class BaseProvider(ABC):
         Must populate ctx.response_content and ctx.metrics.
         """
         pass
+
+    async def startup(self, warmup: bool = True):
+        """
+        Lifecycle hook called by Velox.startup().
+        Providers holding network resources open (and optionally warm) them here.
+        """
+        pass
+
+    async def aclose(self):
+        """
+        Lifecycle hook called by Velox.aclose().
+        Release connection pools or other resources held by the provider.
+        """
+        pass
+
+    async def stream(self, ctx: EventContext) -> AsyncIterator[str]:
+        """
+        Stream the response as text chunks.
+        Must populate ctx.response_content and ctx.metrics once the last
+        chunk has been yielded. Providers without native streaming fall
+        back to a single chunk holding the full response.
+        """
+        ctx = await self.generate(ctx)
+        if ctx.response_content:
+            yield ctx.response_content
+
+
+def rate_limit_headers(headers) -> Dict[str, str]:
+    """
+    Keep only the rate-limit related response headers
+    (x-ratelimit-*, anthropic-ratelimit-*, retry-after).
+    Providers store them in ctx.metadata["rate_limit_headers"].
+    """
+    return {
+        k.lower(): v for k, v in headers.items()
+        if "ratelimit" in k.lower() or k.lower() == "retry-after"
+    }
+
+
+async def iter_sse_json(response) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Decode a Server-Sent Events body (httpx streaming response) into
+    the JSON payloads of its `data:` lines. Stops at the `[DONE]` marker.
+    """
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if not data:
+            continue
+        if data == "[DONE]":
+            break
+        yield json.loads(data)
@@ -1,7 +1,12 @@
 import os
 import asyncio
-from typing import Optional
-import google.generativeai as genai
+from typing import AsyncIterator, Optional
+try:
+    import google.generativeai as genai
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "GoogleGeminiProvider requires google-generativeai. Install it with `pip install velox-core[google]`."
+    ) from e
 from velox.providers.base import BaseProvider
 from velox.core.context import EventContext, UsageMetrics
 
@@ -17,7 +22,7 @@ class GoogleGeminiProvider(BaseProvider):
         genai.configure(api_key=self.api_key)
         self.default_model = model
 
-    async def generate(self, ctx: EventContext) -> EventContext:
+    def _model(self, ctx: EventContext):
         model_name = ctx.model if ctx.model != "default" else self.default_model
         
         model = genai.GenerativeModel(model_name)
@@ -29,19 +34,15 @@ class GoogleGeminiProvider(BaseProvider):
             {"role": "user" if m.role == "user" else "model", "parts": [m.content]}
             for m in ctx.messages[:-1]
         ])
-        
-        last_msg = ctx.messages[-1].content
-        
-        # run_in_executor if the SDK is blocking, but genai has async support usually
-        # Actually genai.GenerativeModel.generate_content_async exists
-        response = await model.generate_content_async(
-            last_msg,
-            generation_config=genai.types.GenerationConfig(
-                temperature=ctx.temperature,
-                max_output_tokens=ctx.max_tokens
-            )
+        return model
+
+    def _generation_config(self, ctx: EventContext):
+        return genai.types.GenerationConfig(
+            temperature=ctx.temperature,
+            max_output_tokens=ctx.max_tokens
         )
-        
+
+    def _usage(self, response) -> UsageMetrics:
         # Usage metrics
         # Gemini 1.5 usage is slightly different
         try:
@@ -57,14 +58,49 @@ class GoogleGeminiProvider(BaseProvider):
         # Cost estimation (Gemini 1.5 Pro is free within limits or cheap)
         cost = (prompt_tokens * 3.5 / 1_000_000) + (completion_tokens * 10.5 / 1_000_000)
 
+        return UsageMetrics(
+            total_tokens=total_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=cost
+        )
+
+    async def generate(self, ctx: EventContext) -> EventContext:
+        model = self._model(ctx)
+        last_msg = ctx.messages[-1].content
+        
+        # run_in_executor if the SDK is blocking, but genai has async support usually
+        # Actually genai.GenerativeModel.generate_content_async exists
+        response = await model.generate_content_async(
+            last_msg,
+            generation_config=self._generation_config(ctx)
+        )
+
         ctx.set_response(
             content=response.text,
-            usage=UsageMetrics(
-                total_tokens=total_tokens,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                cost_usd=cost
-            )
+            usage=self._usage(response)
         )
         
         return ctx
+
+    async def stream(self, ctx: EventContext) -> AsyncIterator[str]:
+        model = self._model(ctx)
+        last_msg = ctx.messages[-1].content
+
+        response = await model.generate_content_async(
+            last_msg,
+            generation_config=self._generation_config(ctx),
+            stream=True
+        )
+
+        parts = []
+        last_chunk = None
+        async for chunk in response:
+            # usage_metadata is cumulative; the last chunk holds the totals
+            last_chunk = chunk
+            text = chunk.text
+            if text:
+                parts.append(text)
+                yield text
+
+        ctx.set_response(content="".join(parts), usage=self._usage(last_chunk))
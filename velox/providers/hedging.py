@@ -0,0 +1,206 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+from velox.core.context import EventContext
+from velox.providers.base import BaseProvider
+
+class LatencyTracker:
+    """
+    Sliding window of recent latencies for one model.
+    The quantile is recomputed every `refresh` samples to keep it cheap.
+    """
+    def __init__(self, quantile: float = 0.95, window: int = 500, refresh: int = 20):
+        self.quantile = quantile
+        self.refresh = refresh
+        self.samples: Deque[float] = deque(maxlen=window)
+        self._value: Optional[float] = None
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self._pending += 1
+        if self._value is None or self._pending >= self.refresh:
+            ordered = sorted(self.samples)
+            self._value = ordered[min(int(len(ordered) * self.quantile), len(ordered) - 1)]
+            self._pending = 0
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._value
+
+
+class HedgedProvider(BaseProvider):
+    """
+    Provider wrapper that cuts tail latency with hedged requests.
+
+    If the primary call has not finished within the running `quantile`
+    (p95 by default) latency of that model, a duplicate is sent to
+    `hedge` (the primary itself when omitted). The first successful
+    answer wins and the other call is cancelled. Until `min_samples`
+    latencies are known, `initial_delay` is used as the threshold.
+
+    `budget` caps hedges to that fraction of requests. Hedged requests are
+    flagged in ctx.metadata and the duplicate's estimated cost (the
+    winner's cost) is recorded in metrics.hedge_cost_usd. When streaming,
+    the race is on the first chunk.
+    """
+    def __init__(
+        self,
+        primary: BaseProvider,
+        hedge: Optional[BaseProvider] = None,
+        quantile: float = 0.95,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        budget: float = 0.1
+    ):
+        self.primary = primary
+        self.hedge = hedge or primary
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.budget = budget
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+            "hedge_wins": self.hedge_wins,
+        }
+
+    def _tracker(self, key: str) -> LatencyTracker:
+        tracker = self._trackers.get(key)
+        if tracker is None:
+            tracker = self._trackers[key] = LatencyTracker(self.quantile)
+        return tracker
+
+    def _delay(self, tracker: LatencyTracker) -> float:
+        if len(tracker) < self.min_samples or tracker.value is None:
+            return self.initial_delay
+        return max(tracker.value, self.min_delay)
+
+    def _may_hedge(self) -> bool:
+        return self.hedges < self.budget * self.requests
+
+    def _record_hedge(self, ctx: EventContext, winner: str):
+        ctx.metadata["hedged"] = True
+        ctx.metadata["hedge_winner"] = winner
+        if winner == "hedge":
+            self.hedge_wins += 1
+        # The losing duplicate is cancelled; bill it at the winner's cost as an estimate
+        ctx.metrics.hedge_cost_usd += ctx.metrics.cost_usd
+
+    async def startup(self, warmup: bool = True):
+        await self.primary.startup(warmup=warmup)
+        if self.hedge is not self.primary:
+            await self.hedge.startup(warmup=warmup)
+
+    async def aclose(self):
+        await self.primary.aclose()
+        if self.hedge is not self.primary:
+            await self.hedge.aclose()
+
+    async def generate(self, ctx: EventContext) -> EventContext:
+        self.requests += 1
+        tracker = self._tracker(ctx.model)
+        start = time.perf_counter()
+
+        primary_ctx = ctx.fork()
+        primary = asyncio.create_task(self.primary.generate(primary_ctx))
+        labels = {primary: "primary"}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self._delay(tracker))
+            if done or not self._may_hedge():
+                result = await primary
+                tracker.add(time.perf_counter() - start)
+                return self._adopt(ctx, result)
+
+            self.hedges += 1
+            hedge = asyncio.create_task(self.hedge.generate(ctx.fork()))
+            labels[hedge] = "hedge"
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    tracker.add(time.perf_counter() - start)
+                    ctx = self._adopt(ctx, task.result())
+                    self._record_hedge(ctx, labels[task])
+                    return ctx
+            raise error
+        finally:
+            # On every exit (win, error, caller cancelled) no call keeps running
+            for task in labels:
+                if not task.done():
+                    task.cancel()
+
+    def _adopt(self, ctx: EventContext, result: EventContext) -> EventContext:
+        """Copy the winning fork's response into the caller's context."""
+        ctx.metadata.update(result.metadata)
+        ctx.set_response(content=result.response_content, usage=result.metrics)
+        return ctx
+
+    async def stream(self, ctx: EventContext) -> AsyncIterator[str]:
+        self.requests += 1
+        tracker = self._tracker(f"stream:{ctx.model}")
+        start = time.perf_counter()
+
+        primary_ctx = ctx.fork()
+        streams = {"primary": (self.primary.stream(primary_ctx).__aiter__(), primary_ctx)}
+        first = {"primary": asyncio.ensure_future(streams["primary"][0].__anext__())}
+
+        winner, chunk, error = None, None, None
+        try:
+            done, _ = await asyncio.wait(set(first.values()), timeout=self._delay(tracker))
+            if not done and self._may_hedge():
+                self.hedges += 1
+                hedge_ctx = ctx.fork()
+                streams["hedge"] = (self.hedge.stream(hedge_ctx).__aiter__(), hedge_ctx)
+                first["hedge"] = asyncio.ensure_future(streams["hedge"][0].__anext__())
+
+            # Race for the first chunk
+            pending = set(first.values())
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for label, task in first.items():
+                    if task not in done or winner is not None:
+                        continue
+                    exc = task.exception()
+                    if isinstance(exc, StopAsyncIteration) or exc is None:
+                        winner, chunk = label, (None if exc else task.result())
+                    else:
+                        error = error or exc
+        finally:
+            # Losers, and everything if the caller was cancelled, are stopped here
+            for label, task in first.items():
+                if label != winner:
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    await streams[label][0].aclose()
+        if winner is None:
+            raise error
+
+        tracker.add(time.perf_counter() - start)
+        iterator, winner_ctx = streams[winner]
+        if chunk is not None:
+            yield chunk
+            async for chunk in iterator:
+                yield chunk
+
+        self._adopt(ctx, winner_ctx)
+        if len(streams) > 1:
+            self._record_hedge(ctx, winner)
@@ -0,0 +1,67 @@
+import importlib.util
+import httpx
+from typing import Optional
+from urllib.parse import urlsplit
+from velox.providers.base import BaseProvider
+
+class HTTPProvider(BaseProvider):
+    """
+    Base class for providers that call their API directly with httpx.
+    Each instance owns one long-lived AsyncClient, so DNS lookups, TCP and
+    TLS handshakes are paid once and connections are reused across requests.
+    Pass `client` to share a single pool between several providers.
+    """
+    base_url: str
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout: float = 60.0,
+        connect_timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True
+    ):
+        self._client = client
+        self._owns_client = client is None
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        # HTTP/2 needs the optional `h2` package (httpx[http2])
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared connection pool, created on first use."""
+        if self._client is None or (self._owns_client and self._client.is_closed):
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2
+            )
+        return self._client
+
+    async def startup(self, warmup: bool = True):
+        """
+        Open the connection pool ahead of the first request.
+        A HEAD request to the API origin completes the DNS/TCP/TLS
+        handshake; any HTTP status is fine, only network errors matter.
+        """
+        client = self.client
+        if not warmup:
+            return
+        parts = urlsplit(self.base_url)
+        try:
+            await client.head(f"{parts.scheme}://{parts.netloc}/")
+        except httpx.HTTPError:
+            pass
+
+    async def aclose(self):
+        """Close the connection pool (only if this provider created it)."""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -1,58 +1,85 @@
 import os
-import httpx
-from typing import Optional
-from velox.providers.base import BaseProvider
+from typing import AsyncIterator, Optional
+from velox.providers.base import iter_sse_json, rate_limit_headers
+from velox.providers.http import HTTPProvider
 from velox.core.context import EventContext, UsageMetrics
 
-class MistralProvider(BaseProvider):
+class MistralProvider(HTTPProvider):
     """
     Mistral AI LLM Integration using httpx (OpenAI-compatible).
     """
-    def __init__(self, api_key: str = None, model: str = "mistral-large-latest"):
+    def __init__(self, api_key: str = None, model: str = "mistral-large-latest", **client_options):
         self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
         if not self.api_key:
             raise ValueError("Mistral API Key must be provided or set in MISTRAL_API_KEY env")
         
+        super().__init__(**client_options)
         self.default_model = model
         self.base_url = "https://api.mistral.ai/v1/chat/completions"
 
-    async def generate(self, ctx: EventContext) -> EventContext:
-        model = ctx.model if ctx.model != "default" else self.default_model
-        
-        headers = {
+    def _headers(self) -> dict:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
-        data = {
+
+    def _payload(self, ctx: EventContext) -> dict:
+        model = ctx.model if ctx.model != "default" else self.default_model
+        return {
             "model": model,
             "messages": [{"role": m.role, "content": m.content} for m in ctx.messages],
             "temperature": ctx.temperature,
             "max_tokens": ctx.max_tokens
         }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.base_url, headers=headers, json=data, timeout=60.0)
-            response.raise_for_status()
-            res_json = response.json()
-            
-        content = res_json["choices"][0]["message"]["content"]
-        usage = res_json.get("usage", {})
-        
+
+    def _usage(self, usage: dict) -> UsageMetrics:
         prompt_tokens = usage.get("prompt_tokens", 0)
         completion_tokens = usage.get("completion_tokens", 0)
         
         # Approximate cost for Mistral Large
         cost = (prompt_tokens * 2.0 / 1_000_000) + (completion_tokens * 6.0 / 1_000_000)
 
+        return UsageMetrics(
+            total_tokens=usage.get("total_tokens", 0),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=cost
+        )
+
+    async def generate(self, ctx: EventContext) -> EventContext:
+        response = await self.client.post(self.base_url, headers=self._headers(), json=self._payload(ctx))
+        ctx.metadata["rate_limit_headers"] = rate_limit_headers(response.headers)
+        response.raise_for_status()
+        res_json = response.json()
+            
+        content = res_json["choices"][0]["message"]["content"]
+
         ctx.set_response(
             content=content,
-            usage=UsageMetrics(
-                total_tokens=usage.get("total_tokens", 0),
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                cost_usd=cost
-            )
+            usage=self._usage(res_json.get("usage", {}))
         )
         
         return ctx
+
+    async def stream(self, ctx: EventContext) -> AsyncIterator[str]:
+        data = self._payload(ctx)
+        data["stream"] = True
+
+        parts = []
+        usage = {}
+
+        async with self.client.stream("POST", self.base_url, headers=self._headers(), json=data) as response:
+            ctx.metadata["rate_limit_headers"] = rate_limit_headers(response.headers)
+            response.raise_for_status()
+            async for chunk in iter_sse_json(response):
+                # Usage is reported on the final chunk
+                usage = chunk.get("usage") or usage
+                choices = chunk.get("choices") or []
+                if not choices:
+                    continue
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    parts.append(delta)
+                    yield delta
+
+        ctx.set_response(content="".join(parts), usage=self._usage(usage))
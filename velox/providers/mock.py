@@ -1,28 +1,50 @@
+from typing import AsyncIterator
 from velox.providers.base import BaseProvider
 from velox.core.context import EventContext, UsageMetrics
 import asyncio
+import re
 
 class MockProvider(BaseProvider):
-    def __init__(self, response_text: str = "Mock Response", fail_count: int = 0):
+    def __init__(self, response_text: str = "Mock Response", fail_count: int = 0, chunk_delay: float = 0.02, latency: float = 0.1):
         self.response_text = response_text
         self.fail_count = fail_count
         self.current_fails = 0
+        self.chunk_delay = chunk_delay
+        self.latency = latency
 
-    async def generate(self, ctx: EventContext) -> EventContext:
-        await asyncio.sleep(0.1)
-        
+    def _usage(self) -> UsageMetrics:
+        return UsageMetrics(
+            total_tokens=10,
+            prompt_tokens=5,
+            completion_tokens=5,
+            cost_usd=0.0001
+        )
+
+    def _maybe_fail(self):
         # Simulate Error
         if self.current_fails < self.fail_count:
             self.current_fails += 1
             raise Exception("Simulated Provider Error")
+
+    async def generate(self, ctx: EventContext) -> EventContext:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._maybe_fail()
         
         ctx.set_response(
             content=f"{self.response_text} (Echo: {ctx.messages[-1].content})",
-            usage=UsageMetrics(
-                total_tokens=10,
-                prompt_tokens=5,
-                completion_tokens=5,
-                cost_usd=0.0001
-            )
+            usage=self._usage()
         )
         return ctx
+
+    async def stream(self, ctx: EventContext) -> AsyncIterator[str]:
+        await asyncio.sleep(self.chunk_delay)
+        self._maybe_fail()
+
+        content = f"{self.response_text} (Echo: {ctx.messages[-1].content})"
+        # Emit word by word, keeping the whitespace attached
+        for chunk in re.findall(r"\S+\s*", content):
+            yield chunk
+            await asyncio.sleep(self.chunk_delay)
+
+        ctx.set_response(content=content, usage=self._usage())
@@ -1,53 +1,102 @@
-from velox.providers.base import BaseProvider
+from typing import AsyncIterator
+from velox.providers.base import BaseProvider, rate_limit_headers
 from velox.core.context import EventContext, UsageMetrics
-from openai import AsyncOpenAI
+try:
+    from openai import AsyncOpenAI
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError("OpenAIProvider requires the openai SDK. Install it with `pip install velox-core[openai]`.") from e
 import os
 
 class OpenAIProvider(BaseProvider):
     """
     Production-grade OpenAI integration.
     """
-    def __init__(self, api_key: str = None, model: str = "gpt-4o"):
+    def __init__(self, api_key: str = None, model: str = "gpt-4o", **client_options):
         # Use env var if not provided
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API Key must be provided or set in OPENAI_API_KEY env")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        # client_options (timeout, max_retries, http_client...) go to the SDK,
+        # which keeps a single pooled connection set for the provider lifetime
+        self.client = AsyncOpenAI(api_key=self.api_key, **client_options)
         self.default_model = model
 
+    async def aclose(self):
+        await self.client.close()
+
+    def _usage(self, usage) -> UsageMetrics:
+        # Calculate approximate cost (Rough estimates for Gpt-4o for now)
+        # TODO: Implement a proper CostMap
+        cost = 0.0
+        cached = 0
+        input_price = 5.0 / 1_000_000
+        if usage:
+            # Prompt prefixes served from OpenAI's automatic cache bill at 50%
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached = getattr(details, "cached_tokens", None) or 0
+            # $5.00 / 1M input, $15.00 / 1M output
+            cost = ((usage.prompt_tokens - cached * 0.5) * input_price) + \
+                   (usage.completion_tokens * 15.0 / 1_000_000)
+
+        return UsageMetrics(
+            total_tokens=usage.total_tokens if usage else 0,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            cost_usd=cost,
+            cached_prompt_tokens=cached,
+            cache_savings_usd=cached * 0.5 * input_price
+        )
+
     async def generate(self, ctx: EventContext) -> EventContext:
         # Determine model
         model = ctx.model if ctx.model != "default" else self.default_model
         
-        # Call OpenAI
-        response = await self.client.chat.completions.create(
+        # Call OpenAI (raw response to read the rate-limit headers)
+        raw = await self.client.chat.completions.with_raw_response.create(
             model=model,
             messages=[{"role": m.role, "content": m.content} for m in ctx.messages],
             temperature=ctx.temperature,
             max_tokens=ctx.max_tokens
         )
+        ctx.metadata["rate_limit_headers"] = rate_limit_headers(raw.headers)
+        response = raw.parse()
         
         # Parse Response
         choice = response.choices[0]
-        usage = response.usage
-        
-        # Calculate approximate cost (Rough estimates for Gpt-4o for now)
-        # TODO: Implement a proper CostMap
-        cost = 0.0
-        if usage:
-            # $5.00 / 1M input, $15.00 / 1M output
-            cost = (usage.prompt_tokens * 5.0 / 1_000_000) + \
-                   (usage.completion_tokens * 15.0 / 1_000_000)
 
         ctx.set_response(
             content=choice.message.content,
-            usage=UsageMetrics(
-                total_tokens=usage.total_tokens if usage else 0,
-                prompt_tokens=usage.prompt_tokens if usage else 0,
-                completion_tokens=usage.completion_tokens if usage else 0,
-                cost_usd=cost
-            )
+            usage=self._usage(response.usage)
         )
         
         return ctx
+
+    async def stream(self, ctx: EventContext) -> AsyncIterator[str]:
+        model = ctx.model if ctx.model != "default" else self.default_model
+
+        raw = await self.client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=[{"role": m.role, "content": m.content} for m in ctx.messages],
+            temperature=ctx.temperature,
+            max_tokens=ctx.max_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        ctx.metadata["rate_limit_headers"] = rate_limit_headers(raw.headers)
+        response = raw.parse()
+
+        parts = []
+        usage = None
+        async for chunk in response:
+            # The final chunk carries usage and no choices
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+
+        ctx.set_response(content="".join(parts), usage=self._usage(usage))
@@ -0,0 +1,189 @@
+import asyncio
+import random
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+from velox.core.context import EventContext
+from velox.core.errors import is_retryable
+from velox.providers.base import BaseProvider
+
+class PoolMember:
+    """
+    One backend of a ProviderPool and its live statistics.
+    Latency and error rate are exponentially weighted moving averages; the
+    error rate also decays with a half-life while no requests are observed,
+    so a backend that failed gets probed again once it had time to recover.
+    """
+    def __init__(
+        self,
+        provider: BaseProvider,
+        name: str,
+        weight: float = 1.0,
+        model: Optional[str] = None,
+        half_life: float = 10.0
+    ):
+        self.provider = provider
+        self.name = name
+        self.weight = weight
+        self.model = model
+        self.latency_ms = 0.0
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.half_life = half_life
+        self.updated = time.monotonic()
+
+    def current_error_rate(self) -> float:
+        idle = time.monotonic() - self.updated
+        return self.error_rate * 0.5 ** (idle / self.half_life)
+
+    def score(self) -> float:
+        """Lower is better: expected latency inflated by queueing and errors."""
+        success = max(1.0 - self.current_error_rate(), 0.01)
+        return (self.latency_ms + 1.0) * (self.in_flight + 1) / (self.weight * success)
+
+    def observe(self, latency_ms: float, failed: bool, alpha: float):
+        self.error_rate = self.current_error_rate()
+        self.updated = time.monotonic()
+        self.requests += 1
+        if failed:
+            self.failures += 1
+        else:
+            # First successful sample seeds the average
+            self.latency_ms = latency_ms if self.requests == self.failures + 1 else (1 - alpha) * self.latency_ms + alpha * latency_ms
+        self.error_rate = (1 - alpha) * self.error_rate + alpha * (1.0 if failed else 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "latency_ms": self.latency_ms,
+            "error_rate": self.current_error_rate(),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "weight": self.weight,
+        }
+
+
+class ProviderPool(BaseProvider):
+    """
+    Composite provider that spreads traffic over several backends.
+
+    Each call picks a backend with power-of-two-choices (`strategy="p2c"`,
+    two weighted random candidates, keep the better score) or weighted
+    least-latency (`strategy="least_latency"`), based on EWMA latency,
+    error rate and in-flight count. Retryable failures transparently fail
+    over to the next best backend not yet tried.
+
+    Set `model` on a member to override ctx.model for that backend, e.g.
+    to map one logical request onto each vendor's equivalent model.
+    """
+    def __init__(
+        self,
+        providers: Optional[List[BaseProvider]] = None,
+        strategy: str = "p2c",
+        max_attempts: Optional[int] = None,
+        alpha: float = 0.2
+    ):
+        if strategy not in ("p2c", "least_latency"):
+            raise ValueError(f"Unknown strategy '{strategy}'")
+        self.strategy = strategy
+        self.max_attempts = max_attempts
+        self.alpha = alpha
+        self.members: List[PoolMember] = []
+        for provider in providers or []:
+            self.add(provider)
+
+    def add(self, provider: BaseProvider, name: Optional[str] = None, weight: float = 1.0, model: Optional[str] = None):
+        """Add a backend to the pool."""
+        name = name or f"{type(provider).__name__}#{len(self.members)}"
+        self.members.append(PoolMember(provider, name, weight, model))
+        return self
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {m.name: m.stats() for m in self.members}
+
+    def _pick(self, exclude: List[PoolMember]) -> Optional[PoolMember]:
+        candidates = [m for m in self.members if m not in exclude]
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else None
+        if self.strategy == "least_latency":
+            return min(candidates, key=PoolMember.score)
+
+        weights = [m.weight for m in candidates]
+        first = random.choices(range(len(candidates)), weights)[0]
+        rest = [i for i in range(len(candidates)) if i != first]
+        second = random.choices(rest, [weights[i] for i in rest])[0]
+        a, b = candidates[first], candidates[second]
+        return a if a.score() <= b.score() else b
+
+    def _attempts(self) -> int:
+        return min(self.max_attempts or len(self.members), len(self.members))
+
+    def _enter(self, member: PoolMember, ctx: EventContext) -> str:
+        member.in_flight += 1
+        ctx.metadata["provider"] = member.name
+        original_model = ctx.model
+        if member.model:
+            ctx.model = member.model
+        return original_model
+
+    async def startup(self, warmup: bool = True):
+        await asyncio.gather(*(m.provider.startup(warmup=warmup) for m in self.members))
+
+    async def aclose(self):
+        await asyncio.gather(*(m.provider.aclose() for m in self.members))
+
+    async def generate(self, ctx: EventContext) -> EventContext:
+        if not self.members:
+            raise ValueError("ProviderPool has no providers")
+
+        tried: List[PoolMember] = []
+        for attempt in range(self._attempts()):
+            member = self._pick(tried)
+            tried.append(member)
+            original_model = self._enter(member, ctx)
+            start = time.perf_counter()
+            try:
+                result = await member.provider.generate(ctx)
+            except Exception as e:
+                member.observe((time.perf_counter() - start) * 1000, True, self.alpha)
+                ctx.model = original_model
+                if not is_retryable(e) or attempt + 1 >= self._attempts():
+                    raise
+                ctx.metadata["failover_attempts"] = attempt + 1
+                continue
+            finally:
+                member.in_flight -= 1
+
+            member.observe((time.perf_counter() - start) * 1000, False, self.alpha)
+            return result
+
+    async def stream(self, ctx: EventContext) -> AsyncIterator[str]:
+        """Streaming with failover only before the first chunk is yielded."""
+        if not self.members:
+            raise ValueError("ProviderPool has no providers")
+
+        tried: List[PoolMember] = []
+        for attempt in range(self._attempts()):
+            member = self._pick(tried)
+            tried.append(member)
+            original_model = self._enter(member, ctx)
+            start = time.perf_counter()
+            streamed = False
+            try:
+                async for chunk in member.provider.stream(ctx):
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                member.observe((time.perf_counter() - start) * 1000, True, self.alpha)
+                ctx.model = original_model
+                if streamed or not is_retryable(e) or attempt + 1 >= self._attempts():
+                    raise
+                ctx.metadata["failover_attempts"] = attempt + 1
+                continue
+            finally:
+                member.in_flight -= 1
+
+            member.observe((time.perf_counter() - start) * 1000, False, self.alpha)
+            return